@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-import simpy
+from scipy.stats import norm
 from iteration_utilities import deepflatten
 from ..components.photon import Photon
 from ..components.laser import Laser
@@ -31,12 +31,13 @@ class EntangledPhotonsSourceSPDC(Laser):
         lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
         SPDC_type (int) = Type of SPDC (1 or 2) which determines the Final Bell/Bell-like State of the emitted Photons
         bell_like_state (str)  = Form of the Entangled Quantum State of the SPDC Photons specified in terms of a Bell State 
-        envt_list (list[simpy.Environment]) = List of Simpy Environments to be respectively assigned to each Photon in an emitted Photon Pair
         efficiency (float) = Pair Production Efficiency of the SPDC process (in generated pairs per incident photons)
         chi (float) = Angle of the Pump Laser's Polarization w.r.t. the Vertical Axis
+        pair_sampling (str) = Mode of Generation of the Photon Pairs ('pump': Down Conversion of every emitted Pump Photon; 'direct': Direct Sampling of the Number of generated Photon Pairs without emitting the Pump Photons)
+        p_down_conversion (float) = Probability of a Pump Photon being successfully down converted
     """
 
-    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,SPDC_type,envt_list,efficiency,chi = 45):
+    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,SPDC_type,efficiency,chi = 45,pair_sampling = 'pump'):
         
         """
         Constructor for the EntangledPhotonsSourceSPDC class
@@ -54,19 +55,22 @@ class EntangledPhotonsSourceSPDC(Laser):
             gamma (float) = Probability of losing a Photon
             lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
             SPDC_type (int) = Type of SPDC (1 or 2) which determines the Final Bell/Bell-like State of the emitted Photons
-            envt_list (list[simpy.Environment]) = List of Simpy Environments to be respectively assigned to each Photon in an emitted Photon Pair
             efficiency (float) = Pair Production Efficiency of the SPDC process (in generated pairs per incident photons)
             chi (float) = Angle of the Pump Laser's Polarization w.r.t. the Vertical Axis
+            pair_sampling (str) = Mode of Generation of the Photon Pairs ('pump' or 'direct') (Default: 'pump')
         """
         
         Laser.__init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda)
         self.uID = uID                   # Unique ID of the Entangled Photons Source based on SPDC
         self.SPDC_type = SPDC_type 
-        self.envt_list = envt_list
         self.efficiency = efficiency     
         self.chi = chi                   
         self.mean_transmission_time = 1/PRR
         self.p_twidth = twidth
+        assert pair_sampling in ['pump','direct'],"The pair sampling mode must either be 'pump' or 'direct'"
+        self.pair_sampling = pair_sampling
+        # A pump photon is down converted when |N(efficiency,5*efficiency)| < efficiency (see 'generate_pairs')
+        self.p_down_conversion = norm.cdf(self.efficiency,loc = self.efficiency,scale = 5*self.efficiency) - norm.cdf(-1*self.efficiency,loc = self.efficiency,scale = 5*self.efficiency)
         if self.SPDC_type == 2:
             self.bell_like_state = 'psi+'
             self.chi = 45 #To ensure entanglement is always maximal
@@ -131,6 +135,8 @@ class EntangledPhotonsSourceSPDC(Laser):
         Details:
             The number of pump photons that can successfully undergo SPDC to give rise to pairs of photons is decided by the pair production efficiency of the SPDC process
             Additionally, pump photons are randomly successfully down converted to give rise to pairs of photons
+            In the 'direct' pair sampling mode, only the number of pump photons is drawn and the pairs are sampled from the same (thinned and capped) distribution (see 'sample_pairs')
+            The photons of the pairs are timestamped with their emission time and handed over to the receivers in one batch scheduled on the (shared) Simpy Environment of the source (see 'deliver_pairs')
         
         Arguments:
             qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons emitted by the Laser
@@ -138,47 +144,269 @@ class EntangledPhotonsSourceSPDC(Laser):
             PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
             
         Returned Value:
-            ephotons_net (list[list[list[Photon]]]) = List of Entangled Photons born out of the SPDC Process
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs born out of the SPDC Process (timestamped with their Emission Time)
         """
 
-        ephotons_net = []
+        if self.pair_sampling == 'direct':
+            num_of_pump_photons = 0
+            for qs in qs_list:
+                num_of_photons,pulse_duration = self.sample_pump_pulse()
+                num_of_pump_photons += num_of_photons
+                self.env.timeout(pulse_duration)
+                self.env.run()
+            ephotons_net = self.sample_pairs(num_of_pump_photons,qs_list[-1],basis,'0')
+        else:
+            laser_photons_net = list(deepflatten(Laser.emit(self,qs_list,basis,PER)))
+            ephotons_net = self.generate_pairs(laser_photons_net)
+        
+        for epp in ephotons_net:
+            for ep in epp:
+                ep.set_environment(self.env)
+                ep.set_emission_time(self.env.now)
+        
+        self.schedule_delivery(ephotons_net)
+        
+        return ephotons_net
+    
+    def schedule_delivery(self,ephotons_net):
+        
+        """
+        Instance method for scheduling the hand over of a batch of (timestamped) entangled photon pairs to the receivers as a single event on the Simpy Environment of the source
         
-        laser_photons_net = list(deepflatten(Laser.emit(self,qs_list,basis,PER)))
+        Arguments:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs
+        """
+        
+        if len(ephotons_net) != 0:
+            delivery = self.env.timeout(0,value = ephotons_net)
+            delivery.callbacks.append(self.deliver_pairs)
+            self.env.run()
+    
+    def deliver_pairs(self,event):
+        
+        """
+        Instance method (callback of a Simpy Event) for handing over a batch of entangled photon pairs to the receivers
+        
+        Details:
+            The photons of each pair are handed over to the receivers one by one (in the order of the pairs), i.e., the 1st photon of a pair to the 1st receiver and so on 
+        
+        Arguments:
+            event (simpy.Event) = Delivery Event whose Value is the List of Entangled Photon Pairs to be handed over
+        """
+        
+        for epp in event.value:
+            for ep,receiver in zip(epp,self.receivers):
+                receiver.receive([ep])
+        
+    def generate_pairs(self,laser_photons_net):
+        
+        """
+        Instance method for down converting the pump photons into entangled photon pairs
+        
+        Arguments:
+            laser_photons_net (list[Photon]) = List of the Pump Photons emitted by the Laser
+            
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs born out of the SPDC Process
+        """
         
         max_no_of_photon_pairs_gen = int(round(self.efficiency*len(laser_photons_net)))
-        flag = 1
-
-        for i,ph in enumerate(laser_photons_net):
-            rnum = np.abs(self.gen.normal(loc = self.efficiency,scale = 5*self.efficiency))
-            no_of_photon_pairs_gen = int(0.5*len(list(deepflatten(ephotons_net))))
-            if no_of_photon_pairs_gen <= max_no_of_photon_pairs_gen:
-                if rnum < self.efficiency:
-                    epp = []
-                    ep1 = Photon(str(ph.uID) + '_E0',ph.wl*2,0,ph.enc_type,ph.qs.coeffs,ph.qs.basis)
-                    ep1.set_source_linewidth(self.lwidth)
-                    ep2 = Photon(str(ph.uID) + '_E1',ph.wl*2,0,ph.enc_type,ph.qs.coeffs,ph.qs.basis)
-                    ep2.set_source_linewidth(self.lwidth)
-                    self.SPDC_entangled_states(ep1,ep2)
-                    if self.gen.random() < self.noise_level:
-                        ep1.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
-                        ep2.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
-                    epp = [ep1,ep2]
-                    ephotons_net.append(epp)
-                no_of_photon_pairs_gen = int(0.5*len(list(deepflatten(ephotons_net))))
-                if no_of_photon_pairs_gen > max_no_of_photon_pairs_gen:
-                    flag = 0
-                    break
-            else:
-                break   
-        if flag == 0:
-            ephotons_net.remove(epp)
+        
+        # Decide for all the pump photons at once whether they are down converted, and keep (at most) the first max_no_of_photon_pairs_gen successfully down converted ones
+        rnum = np.abs(self.gen.normal(loc = self.efficiency,scale = 5*self.efficiency,size = len(laser_photons_net)))
+        pair_idx_net = np.flatnonzero(rnum < self.efficiency)[:max_no_of_photon_pairs_gen]
+        
+        return self.build_pairs([laser_photons_net[idx].uID for idx in pair_idx_net],[laser_photons_net[idx].wl for idx in pair_idx_net],[laser_photons_net[idx].qs.coeffs for idx in pair_idx_net],[laser_photons_net[idx].qs.basis for idx in pair_idx_net])
+    
+    def build_pairs(self,pump_uID_net,pump_wl_net,pump_coeffs_net,pump_basis_net):
+        
+        """
+        Instance method for creating the entangled photon pairs born out of the successfully down converted pump photons
+        
+        Arguments:
+            pump_uID_net (list[str]) = Unique IDs of the down converted Pump Photons
+            pump_wl_net (list[float]) = Wavelengths of the down converted Pump Photons
+            pump_coeffs_net (list[numpy.array([complex])]) = Quantum State Coefficients of the down converted Pump Photons
+            pump_basis_net (list[numpy.array(list[list[complex]])]) = Bases of the Quantum States of the down converted Pump Photons
+            
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs
+        """
+        
+        noise_flag_net = self.gen.random(len(pump_uID_net)) < self.noise_level
+        
+        ephotons_net = []
+        
+        for ph_uID,ph_wl,ph_coeffs,ph_basis,noise_flag in zip(pump_uID_net,pump_wl_net,pump_coeffs_net,pump_basis_net,noise_flag_net):
+            ep1 = Photon(str(ph_uID) + '_E0',ph_wl*2,0,self.enc_type,ph_coeffs,ph_basis)
+            ep1.set_source_linewidth(self.lwidth)
+            ep2 = Photon(str(ph_uID) + '_E1',ph_wl*2,0,self.enc_type,ph_coeffs,ph_basis)
+            ep2.set_source_linewidth(self.lwidth)
+            self.SPDC_entangled_states(ep1,ep2)
+            if noise_flag:
+                ep1.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
+                ep2.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
+            ephotons_net.append([ep1,ep2])
+            
+        return ephotons_net
+    
+    def emit_pp_pulse(self,i,qs,basis,PER):
+        
+        """
+        Instance method for generating the entangled photon pairs born out of a single pump pulse (without advancing the simulation time)
+        
+        Arguments:
+            i (int) = Index of the Pump Pulse
+            qs (list[complex]) = Set of Quantum State Coefficients of the Photons emitted by the Laser
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs born out of the SPDC Process
+            pulse_duration (float) = Time Period taken up by the Pump Pulse
+        """
+        
+        if self.pair_sampling == 'direct':
+            num_of_pump_photons,pulse_duration = self.sample_pump_pulse()
+            return self.sample_pairs(num_of_pump_photons,qs,basis,str(i)),pulse_duration
+        
+        laser_photons_net,pulse_duration = Laser.emit_pulse(self,i,qs,basis,PER)
+        
+        return self.generate_pairs(laser_photons_net),pulse_duration
+    
+    def sample_pump_pulse(self):
+        
+        """
+        Instance method for sampling the number of photons in a pump pulse and the time period taken up by it, without generating the pump photons
+        
+        Details:
+            The time period of a pulse factors in the maximal temporal width out of all of its photons (see 'Laser.emit_pulse'), which is sampled directly via the inverse of the distribution function of the maximum of a number of standard normal variates
+            
+        Returned Value:
+            num_of_pump_photons (int) = Number of Pump Photons
+            pulse_duration (float) = Time Period taken up by the Pump Pulse
+        """
+        
+        num_of_pump_photons = self.gen.poisson(lam = self.mu_photons)
+        
+        return num_of_pump_photons,self.sample_pulse_duration(num_of_pump_photons)
+    
+    def sample_pulse_duration(self,num_of_pump_photons):
+        
+        """
+        Instance method for sampling the time period taken up by a pump pulse with a given number of photons (see 'sample_pump_pulse')
+        
+        Arguments:
+            num_of_pump_photons (int) = Number of Pump Photons
+            
+        Returned Value:
+            pulse_duration (float) = Time Period taken up by the Pump Pulse
+        """
+        
+        time_pd = 1/self.PRR
+        
+        if num_of_pump_photons == 0:
+            return time_pd
+        
+        # P(max <= x) = Phi(x)^n, i.e., max = Phi^-1(u^(1/n)) (evaluated via the survival function for accuracy when n is large)
+        max_std_normal = norm.isf(-1*np.expm1(np.log(self.gen.random())/num_of_pump_photons))
+        
+        return time_pd + self.twidth*max_std_normal
+    
+    def sample_pairs(self,num_of_pump_photons,qs,basis,pulse_label):
+        
+        """
+        Instance method for directly sampling the entangled photon pairs born out of a given number of pump photons
+        
+        Details:
+            Every pump photon is independently down converted with the probability p_down_conversion (which is the probability of the acceptance test in 'generate_pairs'), i.e., the number of successfully down converted pump photons follows a binomial distribution
+            As in 'generate_pairs', the number of pairs is capped at the (rounded) product of the pair production efficiency and the number of pump photons
+            
+        Arguments:
+            num_of_pump_photons (int) = Number of Pump Photons
+            qs (list[complex]) = Set of Quantum State Coefficients of the Pump Photons
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Pump Photons
+            pulse_label (str) = Label of the Pump Pulse (used for labelling the Photons)
+            
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs
+        """
+        
+        max_no_of_photon_pairs_gen = int(round(self.efficiency*num_of_pump_photons))
+        no_of_photon_pairs_gen = min(self.gen.binomial(num_of_pump_photons,self.p_down_conversion),max_no_of_photon_pairs_gen)
+        
+        return self.make_pairs(no_of_photon_pairs_gen,qs,basis,pulse_label)
+    
+    def make_pairs(self,no_of_photon_pairs_gen,qs,basis,pulse_label):
+        
+        """
+        Instance method for creating a given number of entangled photon pairs from pump photons with a common quantum state (and randomly drawn wavelengths)
+        
+        Arguments:
+            no_of_photon_pairs_gen (int) = Number of Entangled Photon Pairs
+            qs (list[complex]) = Set of Quantum State Coefficients of the Pump Photons
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Pump Photons
+            pulse_label (str) = Label of the Pump Pulse (used for labelling the Photons)
+            
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs
+        """
+        
+        pump_wl_net = self.wl + self.lwidth*self.gen.standard_normal(no_of_photon_pairs_gen)
+        pump_uID_net = [str(self.uID) + '_' + pulse_label + '_' + str(j) for j in range(no_of_photon_pairs_gen)]
+        qs = np.reshape(np.array(qs),(len(qs),1))
+        
+        return self.build_pairs(pump_uID_net,pump_wl_net,[qs]*no_of_photon_pairs_gen,[basis]*no_of_photon_pairs_gen)
+    
+    def emit_pp_process(self,qs_list,basis,PER):
+        
+        """
+        Instance method for emitting entangled photon pairs as a Simpy process in the event-driven operation (see 'Laser.emission_process')
+        
+        Arguments:
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons emitted by the Laser (one per Pump Pulse)
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            
+        Returned Value:
+            process (simpy.Process) = Simpy Process emitting the Pump Pulses
+        """
+        
+        return self.env.process(self.emission_process(self.emit_pp_pulse,qs_list,basis,PER,self.deliver_pulse))
+    
+    def deliver_pulse(self,ephotons_net):
+        
+        """
+        Instance method for timestamping the entangled photon pairs of a pump pulse and handing them over to the receivers
+        
+        Arguments:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs
+        """
         
         for epp in ephotons_net:
-            for ep,receiver,envt in zip(epp,self.receivers,self.envt_list):
-                envt.timeout(self.env.now)
-                envt.run()
-                ep.set_environment(envt)
+            for ep,receiver in zip(epp,self.receivers):
+                if ep is not None:
+                    ep.set_environment(self.env)
+                    ep.set_emission_time(self.env.now)
                 receiver.receive([ep])
+    
+    def emit_stream(self,states,bases,PER,chunk_size = 1024):
+        
+        """
+        Generator method for emitting entangled photon pairs for a (possibly very long) train of pump pulses chunk by chunk (see 'Laser.emit_stream')
+        
+        Details:
+            Unlike 'emit_pp', the pairs are not handed over to the receivers, so that the downstream components can consume them chunk by chunk
+        
+        Arguments:
+            states (iterable[list[complex]]) = Sets of Quantum State Coefficients of the Photons emitted by the Laser (one per Pump Pulse)
+            bases (iterable[numpy.array(list[list[complex]])] or numpy.array(list[list[complex]])) = Bases of the Quantum States of the Photons emitted by the Laser (one per Pump Pulse or a single Basis for all the Pump Pulses)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            chunk_size (int) = Number of Pump Pulses per Chunk
+            
+        Yielded Value:
+            ephotons_chunk (list[list[list[Photon]]]) = List of Entangled Photon Pairs (one List per Pump Pulse)
+            timestamps (numpy.array[float]) = Emission Times of the Pump Pulses
+        """
         
-        E = simpy.Environment()
-        self.env = E
+        return self._stream(self.emit_pp_pulse,states,bases,PER,chunk_size)
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+
+import time
+import numpy as np
+
+"""
+This file defines the Wegman-Carter authentication of classical messages with a polynomial universal hash over GF(2^64)
+
+Field:
+    GF(2^64) = GF(2)[x]/(x^64 + x^4 + x^3 + x + 1), with the Elements represented as numpy.uint64
+"""
+
+ONE = np.uint64(1)
+
+def gf64_clmul(a,b):
+
+    """
+    Computes the carry-less (polynomial) products of elements of GF(2)[x] of degree < 64 in vectorized form
+
+    Arguments:
+        a (numpy.array[numpy.uint64]) = 1st Factors
+        b (numpy.array[numpy.uint64] or numpy.uint64) = 2nd Factors (broadcast against the 1st Factors)
+
+    Returned Value:
+        hi (numpy.array[numpy.uint64]) = Coefficients of x^64 to x^127 of the Products
+        lo (numpy.array[numpy.uint64]) = Coefficients of x^0 to x^63 of the Products
+    """
+
+    a,b = np.broadcast_arrays(np.asarray(a,dtype = np.uint64),np.asarray(b,dtype = np.uint64))
+    lo = np.zeros(a.shape,dtype = np.uint64)
+    hi = np.zeros(a.shape,dtype = np.uint64)
+
+    for j in range(64):
+        # All ones wherever the jth bit of b is set
+        mask = np.uint64(0) - ((b >> np.uint64(j)) & ONE)
+        lo ^= (a << np.uint64(j)) & mask
+        if j != 0:
+            hi ^= (a >> np.uint64(64 - j)) & mask
+
+    return hi,lo
+
+def gf64_reduce(hi,lo):
+
+    """
+    Reduces polynomials of degree < 128 modulo x^64 + x^4 + x^3 + x + 1 in vectorized form
+
+    Arguments:
+        hi (numpy.array[numpy.uint64]) = Coefficients of x^64 to x^127
+        lo (numpy.array[numpy.uint64]) = Coefficients of x^0 to x^63
+
+    Returned Value:
+        r (numpy.array[numpy.uint64]) = Elements of GF(2^64)
+    """
+
+    # hi*x^64 = hi*(x^4 + x^3 + x + 1), whose coefficients beyond x^63 (over) are folded once more
+    over = (hi >> np.uint64(60)) ^ (hi >> np.uint64(61)) ^ (hi >> np.uint64(63))
+    r = lo ^ hi ^ (hi << ONE) ^ (hi << np.uint64(3)) ^ (hi << np.uint64(4))
+    r ^= over ^ (over << ONE) ^ (over << np.uint64(3)) ^ (over << np.uint64(4))
+
+    return r
+
+def gf64_mul(a,b):
+
+    """
+    Multiplies elements of GF(2^64) in vectorized form
+
+    Arguments:
+        a (numpy.array[numpy.uint64]) = 1st Factors
+        b (numpy.array[numpy.uint64] or numpy.uint64) = 2nd Factors
+
+    Returned Value:
+        r (numpy.array[numpy.uint64]) = Products
+    """
+
+    return gf64_reduce(*gf64_clmul(a,b))
+
+class KeyPool():
+
+    """
+    Models the Store of pre-shared (or QKD generated) Key Material of a Node, with one Stream per Direction of a Link
+
+    Attributes:
+        streams (Dict{(str,str):bytearray}) = Key Material, such that, for any Dictionary Item, Key = (Sender uID, Receiver uID) and Value = Key Material
+        cursors (Dict{(str,str):int}) = Number of Bytes consumed from each Stream by the Sender
+        used_offsets (Dict{(str,str):set}) = Offsets of the Key Material consumed from each Stream by the Receiver (to reject a Reuse)
+    """
+
+    def __init__(self):
+
+        """
+        Constructor for the KeyPool class
+        """
+
+        self.streams = {}
+        self.cursors = {}
+        self.used_offsets = {}
+
+    def add_key_material(self,stream,material):
+
+        """
+        Instance method to append key material to a stream
+
+        Arguments:
+            stream (tuple[str,str]) = (Sender uID, Receiver uID)
+            material (bytes or numpy.array[numpy.uint8]) = Key Material
+        """
+
+        self.streams.setdefault(stream,bytearray()).extend(bytes(material))
+        self.cursors.setdefault(stream,0)
+        self.used_offsets.setdefault(stream,set())
+
+    def available(self,stream):
+
+        """
+        Instance method to get the number of bytes of a stream which have not been consumed by the sender
+
+        Arguments:
+            stream (tuple[str,str]) = (Sender uID, Receiver uID)
+
+        Returned Value:
+            num_of_bytes (int) = Number of available Bytes
+        """
+
+        return len(self.streams.get(stream,b'')) - self.cursors.get(stream,0)
+
+    def consume(self,stream,num_of_bytes):
+
+        """
+        Instance method for the sender to consume key material from a stream
+
+        Arguments:
+            stream (tuple[str,str]) = (Sender uID, Receiver uID)
+            num_of_bytes (int) = Number of Bytes
+
+        Returned Value:
+            offset (int) = Offset of the consumed Key Material in the Stream
+            material (bytes) = Key Material
+        """
+
+        assert self.available(stream) >= num_of_bytes,f'The key pool has run out of key material for the stream {stream}'
+
+        offset = self.cursors[stream]
+        self.cursors[stream] += num_of_bytes
+
+        return offset,bytes(self.streams[stream][offset:offset + num_of_bytes])
+
+    def fetch(self,stream,offset,num_of_bytes,reuse = False):
+
+        """
+        Instance method for the receiver to fetch the key material consumed by the sender from a stream
+
+        Arguments:
+            stream (tuple[str,str]) = (Sender uID, Receiver uID)
+            offset (int) = Offset of the Key Material in the Stream
+            num_of_bytes (int) = Number of Bytes
+            reuse (bool) = Boolean indicating whether the Key Material may be fetched repeatedly (e.g., a Hash Key, as opposed to a One-Time Pad)
+
+        Returned Value:
+            material (bytes) = Key Material
+        """
+
+        assert offset + num_of_bytes <= len(self.streams.get(stream,b'')),f'The key pool does NOT hold the key material at offset {offset} of the stream {stream}'
+        if not reuse:
+            assert offset not in self.used_offsets[stream],f'The key material at offset {offset} of the stream {stream} has been used already'
+            self.used_offsets[stream].add(offset)
+
+        return bytes(self.streams[stream][offset:offset + num_of_bytes])
+
+    def is_fresh(self,stream,offset,num_of_bytes):
+
+        """
+        Instance method to check whether the key pool holds key material at an offset of a stream which has not been used by the receiver before
+
+        Arguments:
+            stream (tuple[str,str]) = (Sender uID, Receiver uID)
+            offset (int) = Offset of the Key Material in the Stream
+            num_of_bytes (int) = Number of Bytes
+
+        Returned Value:
+            fresh (bool) = Boolean indicating whether the Key Material is held and unused
+        """
+
+        return (0 <= offset) and (offset + num_of_bytes <= len(self.streams.get(stream,b''))) and (offset not in self.used_offsets.get(stream,set()))
+
+    @staticmethod
+    def preshare(node1,node2,num_of_bytes,gen):
+
+        """
+        Static method to distribute (the same) random key material for both directions of a link to the key pools of its end point nodes
+
+        Arguments:
+            node1 (Node) = 1st End Point Node
+            node2 (Node) = 2nd End Point Node
+            num_of_bytes (int) = Number of Bytes per Direction
+            gen (numpy.random.Generator) = Random Number Generator
+        """
+
+        for stream in [(node1.uID,node2.uID),(node2.uID,node1.uID)]:
+            material = gen.integers(0,256,size = num_of_bytes,dtype = np.uint8).tobytes()
+            node1.key_pool.add_key_material(stream,material)
+            node2.key_pool.add_key_material(stream,material)
+
+class WegmanCarterAuthenticator():
+
+    """
+    Authenticates the Transmissions over a Classical Channel with Wegman-Carter Tags, i.e., a Polynomial Universal Hash over GF(2^64) (keyed once per Session) encrypted with a One-Time Pad (consumed per Tag)
+
+    Attributes:
+        tag_size (int) = Size of a Tag (in Bytes)
+        hash_keys (Dict{(str,str):tuple[int,numpy.uint64]}) = Offsets and Values of the Hash Keys of the current Session (one per Stream)
+        powers (Dict{numpy.uint64:numpy.array[numpy.uint64]}) = Cached Powers (k^1, k^2, ...) of the Hash Keys
+        key_bytes (int) = Number of Bytes of Key Material consumed (by the Senders) in the current Session
+        cpu_time (float) = CPU Time spent in computing and verifying Tags in the current Session (in s)
+        num_of_tags (int) = Number of Tags computed in the current Session
+    """
+
+    tag_size = 8
+
+    def __init__(self):
+
+        """
+        Constructor for the WegmanCarterAuthenticator class
+        """
+
+        self.new_session()
+
+    def new_session(self):
+
+        """
+        Instance method to start a new session, i.e., to draw fresh hash keys for the subsequent tags and reset the statistics
+        """
+
+        self.hash_keys = {}
+        self.powers = {}
+        self.key_bytes = 0
+        self.cpu_time = 0.0
+        self.num_of_tags = 0
+
+    def key_powers(self,k,n):
+
+        """
+        Instance method to get the powers k^1 to k^n of a hash key (computed by repeated doubling in vectorized form and cached)
+
+        Arguments:
+            k (numpy.uint64) = Hash Key
+            n (int) = Number of Powers
+
+        Returned Value:
+            powers (numpy.array[numpy.uint64]) = Powers k^1 to k^n
+        """
+
+        powers = self.powers.get(k)
+        if powers is None:
+            powers = np.array([k],dtype = np.uint64)
+        while len(powers) < n:
+            powers = np.concatenate((powers,gf64_mul(powers,powers[-1])))
+        self.powers[k] = powers
+
+        return powers[:n]
+
+    def poly_hash(self,k,data):
+
+        """
+        Instance method to compute the polynomial hash of a byte string, i.e., m_1*k^n + m_2*k^(n-1) + ... + m_n*k over GF(2^64), where m_1 to m_n are the 64-bit blocks of the (zero-padded) data followed by its length
+
+        Details:
+            As the reduction is linear, the carry-less products of all the blocks are XOR-ed before a single reduction
+
+        Arguments:
+            k (numpy.uint64) = Hash Key
+            data (bytes) = Data
+
+        Returned Value:
+            h (numpy.uint64) = Hash
+        """
+
+        pad = (-len(data))%8
+        blocks = np.frombuffer(data + bytes(pad),dtype = '<u8').astype(np.uint64)
+        blocks = np.append(blocks,np.uint64(len(data)))
+
+        hi,lo = gf64_clmul(blocks,self.key_powers(k,len(blocks))[::-1])
+
+        return gf64_reduce(np.bitwise_xor.reduce(hi),np.bitwise_xor.reduce(lo))
+
+    @staticmethod
+    def serialize(msg_net):
+
+        """
+        Static method to serialize (the metadata and the payloads of) messages for authentication
+
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages
+
+        Returned Value:
+            data (bytes) = Serialized Messages
+        """
+
+        parts = []
+        for msg in msg_net:
+            header = '|'.join([msg.kind,'' if msg.dtype is None else msg.dtype.str,str(msg.shape),str(msg.session),str(msg.nbytes)])
+            parts += [header.encode('utf-8'),msg.payload]
+
+        return b''.join(parts)
+
+    def tag(self,msg_net,sender,receiver):
+
+        """
+        Instance method to compute the tag of a transmission (a message or a batch of messages, i.e., a single tag is computed over the whole batch) with key material of the sender's key pool
+
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages
+            sender (Node) = Sender Node
+            receiver (Node) = Receiver Node
+        """
+
+        start_time = time.process_time()
+        stream = (sender.uID,receiver.uID)
+
+        if stream not in self.hash_keys:
+            offset,material = sender.key_pool.consume(stream,8)
+            self.hash_keys[stream] = (offset,np.frombuffer(material,dtype = '<u8').astype(np.uint64)[0])
+            self.key_bytes += 8
+        hash_key_offset,k = self.hash_keys[stream]
+
+        otp_offset,otp = sender.key_pool.consume(stream,self.tag_size)
+        self.key_bytes += self.tag_size
+
+        tag = int(self.poly_hash(k,self.serialize(msg_net)) ^ np.frombuffer(otp,dtype = '<u8').astype(np.uint64)[0])
+
+        for msg in msg_net:
+            msg.auth = (hash_key_offset,otp_offset,tag)
+
+        self.num_of_tags += 1
+        self.cpu_time += time.process_time() - start_time
+
+    def verify(self,msg_net,receiver):
+
+        """
+        Instance method to verify the tag of a transmission with key material of the receiver's key pool
+
+        Details:
+            A transmission without a (common) tag, or whose one-time pad is not held by the receiver or has been used before (i.e., a replay), is invalid
+
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages
+            receiver (Node) = Receiver Node
+
+        Returned Value:
+            valid (bool) = Boolean indicating whether the Tag is valid
+        """
+
+        start_time = time.process_time()
+        try:
+            auth = getattr(msg_net[0],'auth',None)
+            if (auth is None) or (msg_net[0].sender is None) or any(getattr(msg,'auth',None) != auth for msg in msg_net):
+                return False
+
+            hash_key_offset,otp_offset,tag = auth
+            stream = (msg_net[0].sender.uID,receiver.uID)
+            # The hash key is reused within a session, whereas a one-time pad may only be used once
+            if (otp_offset == hash_key_offset) or not (receiver.key_pool.is_fresh(stream,hash_key_offset,8) and receiver.key_pool.is_fresh(stream,otp_offset,self.tag_size)):
+                return False
+
+            k = np.frombuffer(receiver.key_pool.fetch(stream,hash_key_offset,8,reuse = True),dtype = '<u8').astype(np.uint64)[0]
+            otp = np.frombuffer(receiver.key_pool.fetch(stream,otp_offset,self.tag_size),dtype = '<u8').astype(np.uint64)[0]
+
+            return int(self.poly_hash(k,self.serialize(msg_net)) ^ otp) == tag
+        finally:
+            self.cpu_time += time.process_time() - start_time
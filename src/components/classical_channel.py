@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import simpy
 from ..components.component import Component
+from ..components.classical_message import ClassicalMessage
+from ..components.authentication import WegmanCarterAuthenticator
 
 class ClassicalChannel(Component):
     
@@ -17,9 +20,26 @@ class ClassicalChannel(Component):
         endpt2 (Node) = Node at the 2nd End Point of the Channel
         sender (Node) = Sender Node 
         receiver (Node) = Receiver Node
+        num_of_messages (int) = Number of Messages transmitted in the current Session
+        num_of_bytes (int) = Number of Bytes (of serialized Payloads) transmitted in the current Session
+        num_of_rounds (int) = Number of (One Way) Propagation Delays spent in the current Session
+        num_of_round_trips (int) = Number of completed Round Trips in the current Session, i.e., Number of Times the Transmissions have returned to the Initiator of the Session (a Transmission towards the Initiator following one by the Initiator)
+        last_sender (Node) = Sender of the previous Transmission in the current Session
+        initiator (Node) = Sender of the first Transmission in the current Session
+        num_of_rejected (int) = Number of Transmissions rejected (i.e., NOT handed over to the Receiver) owing to an invalid Tag in the current Session
+        bandwidth (float) = Bandwidth (in bits/s) of each Direction of the Channel (None for an infinite Bandwidth, i.e., only the Propagation Delay is accounted for)
+        overhead (int) = Overhead (Headers, Framing, etc.) per Message (in Bytes)
+        queue_discipline (str) = Order in which the queued Messages are serialized onto the Channel ('FIFO' or 'SJF', i.e., Shortest Job First)
+        busy_until (Dict{Node:float}) = Time until which each Direction (identified by its Sender) of the Channel is busy serializing Messages
+        links (Dict{Node:simpy.PriorityResource}) = Directions of the Channel as Simpy Resources (used in the Event-Driven Operation)
+        busy_time (float) = Time spent in serializing Messages (summed over both Directions) in the current Session
+        queueing_time (float) = Time spent by the Messages waiting for the Channel in the current Session
+        session_start_time (float) = Time at which the current Session has started
+        recorder (TrafficRecorder) = Recorder of the transmitted Messages (None if the Traffic is not recorded)
+        authenticator (WegmanCarterAuthenticator) = Authenticator of the Transmissions (None if the Messages are not authenticated)
     """
 
-    def __init__(self,uID,env,length,n_core):
+    def __init__(self,uID,env,length,n_core,bandwidth = None,overhead = 0,queue_discipline = 'FIFO'):
         
         """
         Constructor for the Classical Channel class
@@ -29,12 +49,121 @@ class ClassicalChannel(Component):
             env (simpy.Environment) = Simpy Environment for Simulation
             length (float) = Length
             n_core (float) = Refractive Index of the Core
+            bandwidth (float) = Bandwidth (in bits/s) of each Direction of the Channel (Default: None, i.e., infinite)
+            overhead (int) = Overhead per Message (in Bytes)
+            queue_discipline (str) = Order in which the queued Messages are serialized onto the Channel ('FIFO' or 'SJF')
         """
         
+        assert (bandwidth is None) or (bandwidth > 0),"The bandwidth of a classical channel must be positive"
+        assert overhead >= 0,"The overhead per message can NOT be negative"
+        assert queue_discipline in ['FIFO','SJF'],"The supported queue disciplines are 'FIFO' and 'SJF'"
+        
         Component.__init__(self,uID,env)
         self.length = length
         self.n_core = n_core   
+        self.bandwidth = bandwidth
+        self.overhead = overhead
+        self.queue_discipline = queue_discipline
+        self.busy_until = {}
+        self.links = {}
+        self.recorder = None
+        self.authenticator = None
+        self.reset_counters()
 
+    def reset_counters(self):
+        
+        """
+        Instance method to start a new session, i.e., to reset the counters of the messages, bytes, rounds and round trips (and the utilization and authentication statistics)
+        """
+        
+        self.num_of_messages = 0
+        self.num_of_bytes = 0
+        self.num_of_rounds = 0
+        self.num_of_round_trips = 0
+        self.last_sender = None
+        self.initiator = None
+        self.num_of_rejected = 0
+        self.busy_time = 0
+        self.queueing_time = 0
+        self.session_start_time = self.env.now
+        if self.authenticator is not None:
+            self.authenticator.new_session()
+        
+    def get_counters(self):
+        
+        """
+        Instance method to get the counters of the current session
+        
+        Returned Value:
+            counters (Dict{str:int or float}) = Numbers of Messages, Bytes, Rounds and (completed) Round Trips, Time spent in Propagation ('propagation_time'), Serialization ('busy_time') and Queueing ('queueing_time'), Utilization of the Channel (see 'get_utilization'), Key Material consumed ('auth_key_bytes') and CPU Time spent ('auth_cpu_time') for the Authentication, and Number of rejected Transmissions ('rejected')
+        """
+        
+        c = 3e8
+        auth_key_bytes = 0 if self.authenticator is None else self.authenticator.key_bytes
+        auth_cpu_time = 0.0 if self.authenticator is None else self.authenticator.cpu_time
+        
+        return {'messages':self.num_of_messages,'bytes':self.num_of_bytes,'rounds':self.num_of_rounds,'round_trips':self.num_of_round_trips,'propagation_time':self.num_of_rounds*self.length/(c/self.n_core),'busy_time':self.busy_time,'queueing_time':self.queueing_time,'utilization':self.get_utilization(),'auth_key_bytes':auth_key_bytes,'auth_cpu_time':auth_cpu_time,'rejected':self.num_of_rejected}
+        
+    def get_utilization(self):
+        
+        """
+        Instance method to compute the utilization of the channel in the current session
+        
+        Details:
+            The utilization is the fraction of the time elapsed in the session (up to the end of the last serialization) for which a direction of the channel has been busy, averaged over both directions
+        
+        Returned Value:
+            utilization (float) = Utilization (between 0 and 1)
+        """
+        
+        end_time = max([self.env.now] + list(self.busy_until.values()))
+        elapsed_time = end_time - self.session_start_time
+        
+        return self.busy_time/(2*elapsed_time) if elapsed_time > 0 else 0.0
+        
+    def serialization_time(self,msg):
+        
+        """
+        Instance method to compute the time taken to serialize a message onto the channel
+        
+        Arguments:
+            msg (ClassicalMessage) = Message
+            
+        Returned Value:
+            serialization_time (float) = Serialization Time (0 for an infinite Bandwidth)
+        """
+        
+        if self.bandwidth is None:
+            return 0.0
+        
+        return 8*(msg.nbytes + self.overhead)/self.bandwidth
+        
+    def set_recorder(self,recorder):
+        
+        """
+        Instance method to record every message transmitted via the classical channel (with its time of transmission, sender, receiver and payload)
+        
+        Arguments:
+            recorder (TrafficRecorder) = Recorder (None to stop recording)
+        """
+        
+        self.recorder = recorder
+        
+    def enable_authentication(self,authenticator = None):
+        
+        """
+        Instance method to authenticate every transmission via the classical channel with a Wegman-Carter tag
+        
+        Details:
+            The tag of a transmission is computed over all of its messages at once, i.e., a batch of messages (see 'transmit_batch') consumes the key material of a single tag
+            The sender and the receiver must hold the same key material in their key pools (see 'KeyPool.preshare'), and a transmission with an invalid tag is NOT handed over to the receiver
+        
+        Arguments:
+            authenticator (WegmanCarterAuthenticator) = Authenticator (Default: None, i.e., a new Authenticator)
+        """
+        
+        self.authenticator = WegmanCarterAuthenticator() if authenticator is None else authenticator
+        
     def set_environment(self,env):
         
         """
@@ -91,13 +220,150 @@ class ClassicalChannel(Component):
         
         Details:
             Transmission of information via a classical channel is assumed to be a lossless process
+            The information is carried as a typed binary payload (see 'ClassicalMessage'), i.e., NumPy arrays are handed over without being copied or converted to strings
+            With a finite bandwidth, the message is serialized onto the channel (after the messages queued before it in the same direction) before it propagates, i.e., its transmission time includes its size (plus the overhead) divided by the bandwidth
+            In the event-driven operation (see 'Component.enable_event_driven'), the hand over of the information to the receiver is scheduled at its arrival time and the corresponding Simpy Process is returned
         
         Arguments:
-            info (str) = Classical Information to be transmitted
+            info (str or bytes or numpy.array or ClassicalMessage) = Classical Information to be transmitted
         """
         
-        c = 3e8
-        transmission_time = self.length/(c/self.n_core)
-        self.env.timeout(transmission_time)
+        if not isinstance(info,ClassicalMessage):
+            info = ClassicalMessage(info)
+        
+        return self.send([info],self.receiver.receive_classical_information,info)
+        
+    def transmit_batch(self,info_net):
+        
+        """
+        Instance method to transmit a list of messages in a single (pipelined) propagation delay
+        
+        Details:
+            All the messages are in flight together, i.e., the simulation time is advanced once and the messages are handed over to the receiver at once (see 'Node.receive_classical_information_batch')
+            With a finite bandwidth, the messages are serialized back to back (in the order set by the queue discipline) and handed over once the last of them has arrived
+            In the event-driven operation (see 'Component.enable_event_driven'), the hand over is scheduled at the arrival time and the corresponding Simpy Process is returned
+        
+        Arguments:
+            info_net (list[str or bytes or numpy.array or ClassicalMessage]) = Classical Information to be transmitted (one Item per Message)
+        """
+        
+        msg_net = [info if isinstance(info,ClassicalMessage) else ClassicalMessage(info) for info in info_net]
+        
+        if self.queue_discipline == 'SJF':
+            msg_net = sorted(msg_net,key = lambda msg:msg.nbytes)
+        
+        return self.send(msg_net,self.receiver.receive_classical_information_batch,msg_net)
+        
+    def send(self,msg_net,deliver,payload):
+        
+        """
+        Instance method to serialize messages onto the channel, let them propagate and hand them over to the receiver
+        
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages (in the Order of Serialization)
+            deliver (function) = Hand Over to the Receiver
+            payload (ClassicalMessage or list[ClassicalMessage]) = Argument of the Hand Over
+            
+        Returned Value:
+            process (simpy.Process) = Simpy Process which completes once the Messages have been handed over (only in the Event-Driven Operation)
+        """
+        
+        sender = getattr(self,'sender',None)
+        propagation_time = self.count(msg_net)
+        serialization_time = sum(self.serialization_time(msg) for msg in msg_net)
+        
+        if self.authenticator is not None:
+            self.authenticator.tag(msg_net,sender,self.receiver)
+            if self.bandwidth is not None:
+                serialization_time += 8*self.authenticator.tag_size/self.bandwidth
+        
+        if self.event_driven:
+            if self.bandwidth is None:
+                return self.schedule(propagation_time,self.hand_over,msg_net,deliver,payload)
+            return self.env.process(self.send_process(sender,msg_net,serialization_time,propagation_time,deliver,payload))
+        
+        # The direction of the channel is busy until the messages queued before have been serialized
+        start_time = max(self.env.now,self.busy_until.get(sender,self.env.now))
+        self.busy_until[sender] = start_time + serialization_time
+        self.busy_time += serialization_time
+        self.queueing_time += (start_time - self.env.now)*len(msg_net)
+        
+        self.env.timeout((start_time - self.env.now) + serialization_time + propagation_time)
         self.env.run()
-        self.receiver.receive_classical_information(self.uID,info)
+        self.hand_over(msg_net,deliver,payload)
+        
+    def send_process(self,sender,msg_net,serialization_time,propagation_time,deliver,payload):
+        
+        """
+        Generator method (Simpy process) which serializes messages onto a direction of the channel (a Simpy Resource shared by the concurrently sent messages) and hands them over to the receiver after they have propagated (see 'send')
+        """
+        
+        if sender not in self.links:
+            self.links[sender] = simpy.PriorityResource(self.env,capacity = 1)
+        
+        priority = sum(msg.nbytes for msg in msg_net) if self.queue_discipline == 'SJF' else 0
+        request_time = self.env.now
+        
+        with self.links[sender].request(priority = priority) as req:
+            yield req
+            self.queueing_time += (self.env.now - request_time)*len(msg_net)
+            self.busy_until[sender] = self.env.now + serialization_time
+            yield self.env.timeout(serialization_time)
+            self.busy_time += serialization_time
+        
+        yield self.env.timeout(propagation_time)
+        return self.hand_over(msg_net,deliver,payload)
+        
+    def hand_over(self,msg_net,deliver,payload):
+        
+        """
+        Instance method to hand over the messages of a transmission to the receiver (after verifying their tag, if the channel is authenticated)
+        
+        Details:
+            A transmission with an invalid tag is dropped, i.e., NOT handed over to the receiver, and accounted for in 'num_of_rejected'
+        
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages
+            deliver (function) = Hand Over to the Receiver
+            payload (ClassicalMessage or list[ClassicalMessage]) = Argument of the Hand Over
+        """
+        
+        if self.authenticator is not None:
+            valid = self.authenticator.verify(msg_net,msg_net[0].receiver)
+            if not valid:
+                self.num_of_rejected += 1
+                return None
+        
+        return deliver(self.uID,payload)
+        
+    def count(self,msg_net):
+        
+        """
+        Instance method to address the messages transmitted in one propagation delay (to the current receiver), record them (see 'set_recorder') and account for them in the counters of the current session
+        
+        Arguments:
+            msg_net (list[ClassicalMessage]) = Messages
+            
+        Returned Value:
+            transmission_time (float) = Time taken by the Messages to cross the Length of the Classical Channel
+        """
+        
+        for msg in msg_net:
+            msg.sender = getattr(self,'sender',None)
+            msg.receiver = getattr(self,'receiver',None)
+            if self.recorder is not None:
+                self.recorder.record(self.env.now,msg)
+        
+        self.num_of_messages += len(msg_net)
+        self.num_of_bytes += sum(msg.nbytes for msg in msg_net)
+        self.num_of_rounds += 1
+        sender = getattr(self,'sender',None)
+        if self.initiator is None:
+            self.initiator = sender
+        # A round trip is completed when a transmission returns to the initiator of the session (e.g., A->B->A->B completes 1 round trip)
+        if (self.last_sender is self.initiator) and (sender is not self.initiator):
+            self.num_of_round_trips += 1
+        self.last_sender = sender
+        
+        c = 3e8
+        return self.length/(c/self.n_core)
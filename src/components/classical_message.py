@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+class ClassicalMessage():
+
+    """
+    Models a Message carrying Classical Information as a typed Binary Payload
+
+    Attributes:
+        kind (str) = Type of the Payload ('str', 'bytes' or 'array')
+        payload (memoryview) = Binary Payload (a NumPy Array is NOT copied, i.e., the Payload is a View of its Buffer)
+        dtype (numpy.dtype) = Data Type of the Elements of an Array Payload (None otherwise)
+        shape (tuple[int]) = Shape of an Array Payload (None otherwise)
+        nbytes (int) = Exact Number of Bytes of the serialized Payload
+        session (str) = Session (e.g., a QKD Session or a Post-Processing Phase) to which the Message belongs (None if the Message does not belong to a Session)
+        sender (Node) = Node which has sent the Message (None until the Message is transmitted)
+        receiver (Node) = Node to which the Message is addressed (None until the Message is transmitted)
+    """
+
+    def __init__(self,info,session = None):
+
+        """
+        Constructor for the ClassicalMessage class
+
+        Details:
+            A string is encoded as UTF-8 and raw bytes are carried as they are
+            Any other information (a NumPy array, a list of numbers or a number) is carried as the buffer of a (C-contiguous) NumPy array, which is only copied if the array is not C-contiguous already
+            A number (or a 0-d array) keeps its shape (), i.e., it is decoded as a 0-d array rather than a 1-element array
+
+        Arguments:
+            info (str or bytes or numpy.array or list or int or float) = Classical Information to be carried
+            session (str) = Session to which the Message belongs (Default: None)
+        """
+
+        self.dtype = None
+        self.shape = None
+        self.session = session
+        self.sender = None
+        self.receiver = None
+
+        if isinstance(info,str):
+            self.kind = 'str'
+            self.payload = memoryview(info.encode('utf-8'))
+        elif isinstance(info,(bytes,bytearray,memoryview)):
+            self.kind = 'bytes'
+            self.payload = memoryview(info).cast('B')
+        else:
+            # Unlike 'numpy.ascontiguousarray', 'numpy.require' does not promote a 0-d array to a 1-element array
+            arr = np.require(info,requirements = 'C')
+            assert arr.dtype != object,"Only strings, bytes and (non-ragged) numeric arrays can be carried as classical information"
+            self.kind = 'array'
+            self.dtype = arr.dtype
+            self.shape = arr.shape
+            self.payload = memoryview(arr.reshape(-1)).cast('B')
+
+        self.nbytes = self.payload.nbytes
+
+    def decode(self):
+
+        """
+        Instance method to recover the classical information carried by the message
+
+        Returned Value:
+            info (str or bytes or numpy.array) = Classical Information (an Array is a read-only View of the Payload)
+        """
+
+        if self.kind == 'str':
+            return str(self.payload,'utf-8')
+        if self.kind == 'bytes':
+            return self.payload.tobytes()
+
+        arr = np.frombuffer(self.payload,dtype = self.dtype).reshape(self.shape)
+        arr.flags.writeable = False
+        return arr
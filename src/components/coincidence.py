@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from ..components.time_tagger import TAG_DTYPE
+
+class CoincidenceCounter():
+
+    """
+    Counts Coincidences between the Clicks of Detectors (as Time Tags, see 'TimeTagger') in vectorized form, and computes Coincidence Histograms and Second-Order Correlation (g2) Functions
+
+    Details:
+        All the queries are binary searches (numpy.searchsorted) of the tags of one channel in the sorted tags of another, hence their cost is O(n log n) in the number of tags
+        Times, windows and delays are in the units of the tags (ps for the tags of a TimeTagger)
+
+    Attributes:
+        channels (Dict{int:numpy.array[numpy.int64]}) = Sorted Timestamps of each Channel, such that, for any Dictionary Item, Key = Channel and Value = Timestamps
+        chunk_size (int) = Number of Tags of the 1st Channel processed at once while expanding Pairs of Tags (to bound the Memory)
+    """
+
+    def __init__(self,channels,chunk_size = 1 << 20):
+
+        """
+        Constructor for the CoincidenceCounter class
+
+        Arguments:
+            channels (Dict{int:numpy.array}) = Timestamps of each Channel (sorted, if they are not sorted already)
+            chunk_size (int) = Number of Tags of the 1st Channel processed at once while expanding Pairs of Tags
+        """
+
+        assert chunk_size > 0,"The chunk size of the coincidence counter must be positive"
+
+        self.channels = {}
+        for channel,times in channels.items():
+            times = np.asarray(times)
+            if len(times) > 1 and np.any(times[1:] < times[:-1]):
+                times = np.sort(times,kind = 'stable')
+            self.channels[channel] = times
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_tags(cls,tags,chunk_size = 1 << 20):
+
+        """
+        Class method to create a coincidence counter from a stream of time tags (e.g., of a TimeTagger or a file loaded with 'TimeTagger.load')
+
+        Arguments:
+            tags (numpy.array[TAG_DTYPE]) = Time Tags (in any Order)
+            chunk_size (int) = Number of Tags of the 1st Channel processed at once while expanding Pairs of Tags
+
+        Returned Value:
+            counter (CoincidenceCounter) = Coincidence Counter with the Tags split by Channel
+        """
+
+        assert tags.dtype == TAG_DTYPE,"The time tags must be records of (int64 timestamp, uint16 channel)"
+
+        order = np.lexsort((tags['time'],tags['channel']))
+        channel_net = tags['channel'][order]
+        time_net = tags['time'][order]
+        bounds = np.flatnonzero(np.diff(channel_net)) + 1
+        starts = np.concatenate(([0],bounds))
+        ends = np.concatenate((bounds,[len(order)]))
+
+        return cls({int(channel_net[s]):time_net[s:e] for s,e in zip(starts,ends) if e > s},chunk_size)
+
+    def window_bounds(self,ch1,ch2,lower,upper):
+
+        """
+        Instance method to find, for every tag of a channel, the range of the tags of another channel whose time differences (t2 - t1) lie in [lower, upper]
+
+        Arguments:
+            ch1 (int) = 1st Channel
+            ch2 (int) = 2nd Channel
+            lower (int or float) = Lower Bound of the Time Difference
+            upper (int or float) = Upper Bound of the Time Difference
+
+        Returned Value:
+            lo (numpy.array[int]) = Index of the first matching Tag of the 2nd Channel (for each Tag of the 1st Channel)
+            hi (numpy.array[int]) = Index beyond the last matching Tag of the 2nd Channel (for each Tag of the 1st Channel)
+        """
+
+        t1 = self.channels[ch1]
+        t2 = self.channels[ch2]
+
+        return np.searchsorted(t2,t1 + lower,side = 'left'),np.searchsorted(t2,t1 + upper,side = 'right')
+
+    def coincidences(self,ch1,ch2,window,delay = 0):
+
+        """
+        Instance method to count the coincidences between two channels, i.e., the pairs of tags with |t2 - t1 - delay| <= window
+
+        Arguments:
+            ch1 (int) = 1st Channel
+            ch2 (int) = 2nd Channel
+            window (int or float) = Coincidence Window (Half Width)
+            delay (int or float) = Delay of the 2nd Channel relative to the 1st Channel
+
+        Returned Value:
+            num_of_coincidences (int) = Number of Coincidences
+        """
+
+        lo,hi = self.window_bounds(ch1,ch2,delay - window,delay + window)
+
+        return int(np.sum(hi - lo))
+
+    def coincidence_pairs(self,ch1,ch2,window,delay = 0):
+
+        """
+        Instance method to find the coincidences between two channels as pairs of tag indices
+
+        Arguments:
+            ch1 (int) = 1st Channel
+            ch2 (int) = 2nd Channel
+            window (int or float) = Coincidence Window (Half Width)
+            delay (int or float) = Delay of the 2nd Channel relative to the 1st Channel
+
+        Returned Value:
+            idx1 (numpy.array[int]) = Indices of the Tags of the 1st Channel
+            idx2 (numpy.array[int]) = Indices of the coincident Tags of the 2nd Channel
+        """
+
+        lo,hi = self.window_bounds(ch1,ch2,delay - window,delay + window)
+
+        return self.expand(lo,hi,0,len(lo))
+
+    @staticmethod
+    def expand(lo,hi,start,end):
+
+        """
+        Static method to expand ranges of matching tags into pairs of tag indices in vectorized form
+
+        Arguments:
+            lo (numpy.array[int]) = Index of the first matching Tag of the 2nd Channel (for each Tag of the 1st Channel)
+            hi (numpy.array[int]) = Index beyond the last matching Tag of the 2nd Channel (for each Tag of the 1st Channel)
+            start (int) = First Tag of the 1st Channel to be expanded
+            end (int) = Tag of the 1st Channel beyond the last one to be expanded
+
+        Returned Value:
+            idx1 (numpy.array[int]) = Indices of the Tags of the 1st Channel
+            idx2 (numpy.array[int]) = Indices of the matching Tags of the 2nd Channel
+        """
+
+        counts = hi[start:end] - lo[start:end]
+        idx1 = np.repeat(np.arange(start,end),counts)
+        # Position of every pair within the range of its tag of the 1st channel
+        offsets = np.arange(len(idx1)) - np.repeat(np.cumsum(counts) - counts,counts)
+
+        return idx1,lo[idx1] + offsets
+
+    def multi_coincidences(self,channels,window,delays = None):
+
+        """
+        Instance method to count the n-fold coincidences between channels, i.e., the tags of the 1st channel for which every other channel has a tag within the coincidence window
+
+        Arguments:
+            channels (list[int]) = Channels (the 1st Channel is the Reference)
+            window (int or float) = Coincidence Window (Half Width)
+            delays (list[int or float]) = Delays of the Channels relative to the 1st Channel (Default: None, i.e., no Delays)
+
+        Returned Value:
+            num_of_coincidences (int) = Number of n-fold Coincidences
+        """
+
+        delays = [0]*len(channels) if delays is None else delays
+        hit = np.ones(len(self.channels[channels[0]]),dtype = bool)
+
+        for ch,delay in zip(channels[1:],delays[1:]):
+            lo,hi = self.window_bounds(channels[0],ch,delay - window,delay + window)
+            hit &= hi > lo
+
+        return int(np.count_nonzero(hit))
+
+    def histogram(self,ch1,ch2,bin_width,max_delay):
+
+        """
+        Instance method to compute the histogram of the time differences (t2 - t1) between the tags of two channels up to a maximum delay
+
+        Details:
+            The pairs of tags are expanded in chunks of the 1st channel, and binned by integer division and 'numpy.bincount'
+
+        Arguments:
+            ch1 (int) = 1st Channel
+            ch2 (int) = 2nd Channel
+            bin_width (int or float) = Bin Width
+            max_delay (int or float) = Maximum (absolute) Time Difference
+
+        Returned Value:
+            tau (numpy.array[float]) = Centres of the Bins
+            counts (numpy.array[int]) = Numbers of Pairs of Tags in the Bins
+        """
+
+        num_of_bins = int(np.ceil(max_delay/bin_width))
+        lo,hi = self.window_bounds(ch1,ch2,-num_of_bins*bin_width,num_of_bins*bin_width)
+        t1 = self.channels[ch1]
+        t2 = self.channels[ch2]
+        counts = np.zeros(2*num_of_bins,dtype = np.int64)
+
+        for start in range(0,len(t1),self.chunk_size):
+            idx1,idx2 = self.expand(lo,hi,start,min(start + self.chunk_size,len(t1)))
+            bins = np.floor_divide(t2[idx2] - t1[idx1],bin_width).astype(np.int64) + num_of_bins
+            # A difference of exactly +num_of_bins*bin_width falls into the last bin
+            np.clip(bins,0,2*num_of_bins - 1,out = bins)
+            counts += np.bincount(bins,minlength = 2*num_of_bins)
+
+        tau = (np.arange(2*num_of_bins) - num_of_bins + 0.5)*bin_width
+
+        return tau,counts
+
+    def g2(self,ch1,ch2,bin_width,max_delay,duration = None):
+
+        """
+        Instance method to compute the (cross-)second-order correlation function g2(tau) between two channels, i.e., the coincidence histogram normalized by the number of accidental coincidences expected for uncorrelated clicks
+
+        Arguments:
+            ch1 (int) = 1st Channel
+            ch2 (int) = 2nd Channel
+            bin_width (int or float) = Bin Width
+            max_delay (int or float) = Maximum (absolute) Time Difference
+            duration (int or float) = Duration of the Measurement (Default: None, i.e., the Time spanned by the Tags)
+
+        Returned Value:
+            tau (numpy.array[float]) = Centres of the Bins
+            g2 (numpy.array[float]) = g2(tau)
+        """
+
+        tau,counts = self.histogram(ch1,ch2,bin_width,max_delay)
+        t1 = self.channels[ch1]
+        t2 = self.channels[ch2]
+
+        if duration is None:
+            duration = max(t1[-1],t2[-1]) - min(t1[0],t2[0]) if len(t1) and len(t2) else 0
+        accidentals = len(t1)*len(t2)*bin_width/duration if duration > 0 else 0
+
+        return tau,(counts/accidentals if accidentals > 0 else np.zeros(len(counts)))
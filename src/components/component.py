@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import simpy
 
 #TODO: Define SEED
 SEED = 0
@@ -14,6 +15,8 @@ class Component():
         uID (str) = Unique ID
         env (simpy.Environment) = Simpy Environment for Simulation
         gen (numpy.random.Generator) = Random Number Generator 
+        event_driven (bool) = Boolean to control the Event-Driven Operation of the Component (see 'enable_event_driven')
+        input_port (simpy.Store) = Input Port from which the Component consumes its Inputs in the Event-Driven Operation (only for the Components which define 'handle')
     """
     
     def __init__(self,uID,env):
@@ -30,4 +33,66 @@ class Component():
         self.uID = uID
         self.env = env
         self.gen = np.random.default_rng(seed = SEED)
-        
\ No newline at end of file
+        self.event_driven = False
+        
+    def enable_event_driven(self):
+        
+        """
+        Instance method to switch a component to the event-driven operation
+        
+        Details:
+            In the event-driven operation, the outputs of the component are scheduled as events at their arrival times (see 'schedule') instead of advancing the Simpy Environment synchronously with nested calls of 'env.run()'
+            A component which models a delay on its inputs defines an instance method 'handle(item)', in which case its inputs are put into its input port and consumed by a Simpy process (see 'serve'); no input port is created for any other component
+            Consequently, many photons (pulses and messages) may be in flight at once and the simulation can be stepped, paused or bounded via 'env.run(until = ...)'
+        """
+        
+        self.event_driven = True
+        if callable(getattr(self,'handle',None)):
+            self.input_port = simpy.Store(self.env)
+            self.env.process(self.serve())
+        
+    def disable_event_driven(self):
+        
+        """
+        Instance method to switch a component back to the synchronous operation
+        
+        Details:
+            The outputs scheduled before are still handed over at their arrival times, whereas the Simpy process serving the input port (if any) stays idle, since no more inputs are put into it
+        """
+        
+        self.event_driven = False
+        
+    def serve(self):
+        
+        """
+        Generator method (Simpy process) which consumes the inputs put into the input port of a component in the event-driven operation and passes them to its 'handle' method
+        """
+        
+        while True:
+            item = yield self.input_port.get()
+            self.handle(item)
+        
+    def schedule(self,delay,callback,*args):
+        
+        """
+        Instance method to schedule a callback (typically the hand over of an output to a receiver) after a delay on the Simpy Environment of a component
+        
+        Arguments:
+            delay (float) = Delay after which the Callback is invoked
+            callback (function) = Callback
+            args (tuple) = Arguments of the Callback
+            
+        Returned Value:
+            process (simpy.Process) = Simpy Process which completes once the Callback has been invoked (and whose Value is the Value returned by the Callback)
+        """
+        
+        return self.env.process(self._fire(delay,callback,args))
+    
+    def _fire(self,delay,callback,args):
+        
+        """
+        Generator method (Simpy process) which invokes a callback after a delay (see 'schedule')
+        """
+        
+        yield self.env.timeout(delay)
+        return callback(*args)
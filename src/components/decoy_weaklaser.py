@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import itertools as it
+from ..components.laser import Laser
+from ..components.weaklaser import Weaklaser
+
+class DecoyWeaklaser(Weaklaser):
+
+    """
+    Models a Decoy-State Weak Laser [Laser + ND Filter(s) switched between several Intensity Settings]
+
+    References:
+        1. H.-K. Lo, X. Ma, and K. Chen, "Decoy state quantum key distribution," Phys. Rev. Lett., vol. 94, no. 23, p. 230504, 2005
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        PRR (float) = Pulse Repetition Rate, i.e., the Frequency with which the Photon Pulses are emitted by the Laser
+        wl (float) = Wavelength of the Laser
+        lwidth (float) = Linewidth of the Laser
+        twidth (float) = Temporal Width of the Laser
+        mu_photons (int) = Mean Number of Photons emitted by the Laser
+        enc_type (str) = Type of Quantum Information Encoding (see 'photon_enc.py') of the Photons emitted by the Laser
+        noise_level (float) = Probability of the Quantum State of the Photons emitted by the Laser being altered because of Noise
+        gamma (float) = Probability of losing a Photon
+        lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
+        min_OD (float) = Minimum Value of the Optical Density (OD) that the ND Filter can be set to
+        max_OD (float) = Maximum Value of the Optical Density (OD) that the ND Filter can be set to
+        max_num_of_ND_filters (int) = Maximum Number of ND Filters which can be used for attentuation of the Laser's Output
+        intensities (numpy.array[float]) = Target Mean Numbers of Photons emitted by the Weak Laser for each Intensity Class (e.g., Signal, Decoy and Vacuum)
+        intensity_probs (numpy.array[float]) = Probabilities with which each Intensity Class is selected for a Pulse
+        ND_Filter_Stack_net (list[list[float]]) = OD(s) of the ND Filter(s) to be used for each Intensity Class (None for a Vacuum Class)
+        mu_photons_net (numpy.array[float]) = Mean Numbers of Photons emitted by the Weak Laser for each Intensity Class (as set by the ND Filter Stacks)
+        mu_photons_after_attenuation (float) = Mean Number of Photons emitted by the Weak Laser averaged over all the Intensity Classes
+        intensity_classes (numpy.array[int]) = Intensity Classes of the Pulses emitted in the last Emission
+    """
+
+    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters,intensities,intensity_probs):
+
+        """
+        Constructor for the DecoyWeaklaser class
+
+        Details:
+            The ND Filter Stack for each Intensity Class is determined once (here) rather than per pulse
+            An Intensity Class with a Target Mean Number of Photons of 0 is a Vacuum Class (the Laser's Output is blocked)
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+            PRR (float) = Pulse Repetition Rate, i.e., the Frequency with which the Photon Pulses are emitted by the Laser
+            wl (float) = Wavelength of the Laser
+            lwidth (float) = Linewidth of the Laser
+            twidth (float) = Temporal Width of the Laser
+            mu_photons (int) = Mean Number of Photons emitted by the Laser
+            enc_type (str) = Type of Quantum Information Encoding (see 'photon_enc.py') of the Photons emitted by the Laser
+            noise_level (float) = Probability of the Quantum State of the Photons emitted by the Laser being altered because of Noise
+            gamma (float) = Probability of losing a Photon
+            lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
+            min_OD (float) = Minimum Value of the Optical Density (OD) that the ND Filter can be set to
+            max_OD (float) = Maximum Value of the Optical Density (OD) that the ND Filter can be set to
+            max_num_of_ND_filters (int) = Maximum Number of ND Filters which can be used for attentuation of the Laser's Output
+            intensities (list[float]) = Target Mean Numbers of Photons emitted by the Weak Laser for each Intensity Class
+            intensity_probs (list[float]) = Probabilities with which each Intensity Class is selected for a Pulse
+        """
+
+        Weaklaser.__init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters,calc_mu_photons_after_attenuation = False)
+
+        assert len(intensities) == len(intensity_probs),"Each intensity class must have a selection probability"
+        assert np.isclose(sum(intensity_probs),1),"The selection probabilities of the intensity classes must add up to 1"
+
+        self.intensities = np.array(intensities,dtype = float)
+        self.intensity_probs = np.array(intensity_probs,dtype = float)
+        self.ND_Filter_Stack_net = []
+        self.mu_photons_net = np.zeros(len(self.intensities))
+
+        for k,mu_k in enumerate(self.intensities):
+            if mu_k == 0:
+                self.ND_Filter_Stack_net.append(None)
+            else:
+                ND_Filter_Stack = self.find_ND_Filter_stack(mu_k/self.mu_photons)
+                assert (len(ND_Filter_Stack) != 0) or (np.round(np.log10(self.mu_photons/mu_k),decimals = 1) == 0),f'The intensity {mu_k} can NOT be set using the ND Filter(s) of the weak laser [{self.uID}]'
+                self.ND_Filter_Stack_net.append(ND_Filter_Stack)
+                self.mu_photons_net[k] = self.mu_photons*10**(-1*sum(ND_Filter_Stack))
+
+        self.mu_photons_after_attenuation = float(np.dot(self.intensity_probs,self.mu_photons_net))
+        self.intensity_classes = np.array([],dtype = int)
+
+    def draw_intensity_classes(self,num_of_pulses):
+
+        """
+        Instance method to randomly select the intensity classes of a number of pulses (in one vectorized draw)
+
+        Arguments:
+            num_of_pulses (int) = Number of Pulses
+
+        Returned Value:
+            intensity_classes (numpy.array[int]) = Intensity Classes of the Pulses
+        """
+
+        return self.gen.choice(len(self.intensities),size = num_of_pulses,p = self.intensity_probs)
+
+    def emit_decoy_pulses(self,qs_list,basis,PER,intensity_classes,first_pulse_idx = 0):
+
+        """
+        Instance method for generating the (attenuated) photons of a number of pulses with given intensity classes (without advancing the simulation time)
+
+        Details:
+            The number of photons of every pulse is directly drawn from a Poisson distribution with its mean as the mean number of photons of its intensity class, i.e., the unattenuated output of the laser is never generated
+
+        Arguments:
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons (one per Pulse)
+            basis (numpy.array(list[list[complex]]) or list[numpy.array(list[list[complex]])]) = Basis of the Quantum States of the Photons (a single Basis for all the Pulses or one per Pulse)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            intensity_classes (numpy.array[int]) = Intensity Classes of the Pulses
+            first_pulse_idx (int) = Index of the first Pulse (used for labelling the Photons)
+
+        Returned Value:
+            photons_net (list[list[Photon]]) = List of the Photons emitted by the Weak Laser (one List per Pulse)
+            pulse_durations (numpy.array[float]) = Time Periods taken up by the Pulses
+        """
+
+        if isinstance(basis,np.ndarray) and basis.ndim == 2:
+            basis = it.repeat(basis)
+
+        num_of_photons_net = self.gen.poisson(lam = self.mu_photons_net[intensity_classes])
+
+        photons_net = []
+        pulse_durations = np.empty(len(qs_list))
+
+        for i,(qs,b,num_of_photons) in enumerate(zip(qs_list,basis,num_of_photons_net)):
+            photons,pulse_durations[i] = Laser.emit_pulse(self,first_pulse_idx + i,qs,b,PER,num_of_photons = num_of_photons)
+            photons_net.append(photons)
+
+        return photons_net,pulse_durations
+
+    def emit_and_attenuate(self,qs_list,basis,PER,intensity_classes = None):
+
+        """
+        Instance method for emitting (attenuated) pulses with randomly selected (or given) intensity classes and transmitting them to the receiver
+
+        Arguments:
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons (one per Pulse)
+            basis (numpy.array(list[list[complex]]) or list[numpy.array(list[list[complex]])]) = Basis of the Quantum States of the Photons (a single Basis for all the Pulses or one per Pulse)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            intensity_classes (numpy.array[int]) = Intensity Classes of the Pulses (Default: None, i.e., drawn via 'draw_intensity_classes')
+
+        Returned Value:
+            intensity_classes (numpy.array[int]) = Intensity Classes of the emitted Pulses
+        """
+
+        if intensity_classes is None:
+            intensity_classes = self.draw_intensity_classes(len(qs_list))
+        intensity_classes = np.asarray(intensity_classes)
+
+        photons_net,pulse_durations = self.emit_decoy_pulses(qs_list,basis,PER,intensity_classes)
+
+        for photons,pulse_duration in zip(photons_net,pulse_durations):
+            self.env.timeout(pulse_duration)
+            self.env.run()
+            if len(photons) != 0:
+                for p in photons:
+                    p.set_environment(self.env)
+                    self.receiver.receive([p])
+            else:
+                self.receiver.receive([None])
+
+        self.intensity_classes = intensity_classes
+
+        return intensity_classes
+
+    def emit_stream(self,states,bases,PER,chunk_size = 1024):
+
+        """
+        Generator method for emitting a (possibly very long) train of decoy-state pulses chunk by chunk (see 'Laser.emit_stream')
+
+        Arguments:
+            states (iterable[list[complex]]) = Sets of Quantum State Coefficients of the Photons (one per Pulse)
+            bases (iterable[numpy.array(list[list[complex]])] or numpy.array(list[list[complex]])) = Bases of the Quantum States of the Photons (one per Pulse or a single Basis for all the Pulses)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            chunk_size (int) = Number of Pulses per Chunk
+
+        Yielded Value:
+            photons_chunk (list[list[Photon]]) = List of the Photons emitted by the Weak Laser (one List per Pulse)
+            timestamps (numpy.array[float]) = Emission Times of the Pulses
+            intensity_classes (numpy.array[int]) = Intensity Classes of the Pulses
+        """
+
+        assert chunk_size > 0,"The chunk size must be a positive integer"
+
+        if isinstance(bases,np.ndarray) and bases.ndim == 2:
+            bases = it.repeat(bases)
+
+        pulse_net = zip(states,bases)
+        i = 0
+
+        while True:
+            chunk = list(it.islice(pulse_net,chunk_size))
+            if len(chunk) == 0:
+                return
+            qs_list,basis_list = zip(*chunk)
+            intensity_classes = self.draw_intensity_classes(len(chunk))
+            photons_chunk,pulse_durations = self.emit_decoy_pulses(qs_list,basis_list,PER,intensity_classes,i)
+            i += len(chunk)
+            timestamps = self.env.now + np.cumsum(pulse_durations)
+            self.env.timeout(timestamps[-1] - self.env.now)
+            self.env.run()
+            for photons in photons_chunk:
+                for p in photons:
+                    p.set_environment(self.env)
+            yield photons_chunk,timestamps,intensity_classes
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
 from ..components.component import Component
 
 class Detector(Component):
@@ -24,22 +25,42 @@ class Detector(Component):
         measured_qs_coeffs (numpy.array) = Measured Quantum State Coefficients of a detected Photon
         set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
         next_detection_time (float) = Time at which the Next Detection Event may take place
-        next_dark_count_time (float) = Time at which the Next Dark Count is to be registered 
+        next_dark_count_time (float) = Time at which the latest Dark Count has been registered
         detect_dark (bool) = True when a Dark Count is to be registered; False otherwise
         photon_count (int) = Number of Photons which have been successfully detected
         sender (Quantum Channel) = Sender of Photons encoded with Quantum Information
         num_net (list[int]) = List of Numbers returned upon the Successful Detection of Photons in a given run
         measured_qs_coeffs_net (List[numpy.array]) = List of Measured Quantum State Coefficients of Photons which have been successfully detected in a given run
         detection_time_net = (list[float]) = List of Time Instants at which Photons have been successfully detected in a given run
-        dark_count_time_instants (list[float]) = List of Time Instants at which Dark Counts have been registered in a given run
-        dark_count_check_idx (int) = Index from which the Dark Count List 'dark_count_time_instants' is to be checked while performing the detection analysis (see 'node.py')
+        dark_count_buffer (numpy.array[float]) = Buffer of the (pre-generated) Time Instants of Dark Counts in ascending Order, which only retains the Dark Counts which may still fall in a future Analysis Window (see 'compact_dark_counts')
+        num_of_generated_dark_counts (int) = Number of Dark Counts generated into the Buffer
+        num_of_registered_dark_counts (int) = Number of Dark Counts in the Buffer registered so far, i.e., up to the end of the latest Analysis Window (see 'register_dark_counts')
+        num_of_tagged_dark_counts (int) = Number of Dark Counts in the Buffer emitted to the Time Tagger so far, i.e., strictly before the end of the latest Analysis Window
+        num_of_discarded_dark_counts (int) = Number of registered Dark Counts which have been discarded from the Buffer
+        num_of_window_dark_counts (int) = Number of Dark Counts sampled in Analysis Windows (in the 'window' Dark Count Mode)
+        num_of_outside_dark_counts (int) = Number of Dark Counts sampled for the Time outside the Analysis Windows (in the 'window' Dark Count Mode, see 'sample_outside_dark_counts')
+        dark_count_start_time (float) = Time from which Dark Counts are generated
+        dark_count_horizon (float) = Latest End of the Analysis Windows in which Dark Counts have been sampled (in the 'window' Dark Count Mode)
+        dark_count_window_time (float) = Total Duration of the Analysis Windows in which Dark Counts have been sampled (in the 'window' Dark Count Mode)
+        dark_count_outside_time (float) = Total Duration outside the Analysis Windows for which Dark Counts have been sampled (in the 'window' Dark Count Mode)
+        num_of_dark_counts (int) = Total Number of registered Dark Counts (including the discarded ones and the ones sampled in Analysis Windows)
+        dark_count_mode (str) = Mode of Generation of Dark Counts ('timeline', i.e., an absolute Timeline of Dark Counts, or 'window', i.e., sampled per Analysis Window)
+        time_tagger (TimeTagger) = Time Tagger to which the Clicks (Detections and Dark Counts) are emitted (None if the Clicks are not tagged)
+        channel (int) = Channel of the Detector at the Time Tagger
+        dark_count_block_size (int) = Number of Dark Counts generated at once
+        dark_count_time_instants (numpy.array[float]) = Time Instants of the registered Dark Counts retained in the Buffer (a View of the Buffer)
+        dark_count_check_idx (int) = Index from which the Dark Counts are to be checked while performing the detection analysis (see 'dark_count_in_window')
     """
 
-    def __init__(self,uID,env,dead_time,i_det_eff,dark_count_rate,jitter,num,set_adaptive_env = False): 
+    def __init__(self,uID,env,dead_time,i_det_eff,dark_count_rate,jitter,num,set_adaptive_env = False,dark_count_mode = 'timeline'): 
         
         """
         Constructor for the Detector class
         
+        Details:
+            In the 'timeline' dark count mode, the dark counts are generated as an absolute timeline (see 'register_dark_counts'), whereas in the 'window' dark count mode, only the dark counts falling in the analysis windows are sampled (see 'sample_window_dark_counts')
+            In both modes, the total number of dark counts (see 'num_of_dark_counts') covers the whole time up to the latest analysis window, since in the 'window' dark count mode, the dark counts outside the analysis windows are drawn in bulk (see 'sample_outside_dark_counts')
+        
         Arguments:
             uID (str) = Unique ID
             env (simpy.Environment) = Simpy Environment for Simulation
@@ -49,8 +70,11 @@ class Detector(Component):
             jitter (float) = Standard Deviation in the Time Interval between the Absorption of a Photon and the Generation of an Output Electrical Signal from the Detector
             num (int) = Number to be returned upon the Successful Detection of a Photon
             set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+            dark_count_mode (str) = Mode of Generation of Dark Counts ('timeline' or 'window', for non-overlapping Analysis Windows only)
         """
         
+        assert dark_count_mode in ['timeline','window'],"The supported dark count modes are 'timeline' and 'window'"
+        
         Component.__init__(self,uID,env)
         self.dead_time = dead_time
         self.det_eff = i_det_eff
@@ -65,7 +89,21 @@ class Detector(Component):
         self.num_net = []
         self.measured_qs_coeffs_net = []
         self.dark_count_check_idx = 0
-        self.dark_count_time_instants = []
+        self.dark_count_block_size = 1024
+        self.dark_count_buffer = np.empty(self.dark_count_block_size)
+        self.num_of_generated_dark_counts = 0
+        self.num_of_registered_dark_counts = 0
+        self.num_of_tagged_dark_counts = 0
+        self.num_of_discarded_dark_counts = 0
+        self.num_of_window_dark_counts = 0
+        self.num_of_outside_dark_counts = 0
+        self.dark_count_start_time = self.env.now
+        self.dark_count_horizon = self.env.now
+        self.dark_count_window_time = 0.0
+        self.dark_count_outside_time = 0.0
+        self.dark_count_mode = dark_count_mode
+        self.time_tagger = None
+        self.channel = None
         self.detection_time_net = []
         
     def connect(self,sender):
@@ -112,6 +150,21 @@ class Detector(Component):
         
         self.env = env
         
+    def set_time_tagger(self,time_tagger,channel):
+        
+        """
+        Instance method to emit every click of the detector (a detection or a registered dark count) as a time tag to a (shared) time tagger
+        
+        Arguments:
+            time_tagger (TimeTagger) = Time Tagger (None to stop tagging)
+            channel (int) = Channel of the Detector at the Time Tagger
+        """
+        
+        assert (time_tagger is None) or (0 <= channel < 2**16),"The channel of a detector at a time tagger must fit into 16 bits"
+        
+        self.time_tagger = time_tagger
+        self.channel = channel
+        
     def clear_measurements(self):
         
         """
@@ -122,29 +175,182 @@ class Detector(Component):
         self.measured_qs_coeffs_net = []
         self.detection_time_net = []
         
-    def schedule_dark_count(self):
+    @property
+    def dark_count_time_instants(self):
         
         """
-        Instance method for scheduling a dark count
+        Time Instants at which Dark Counts have been registered (a View of the Buffer)
+        """
+        
+        return self.dark_count_buffer[:self.num_of_registered_dark_counts]
+        
+    @property
+    def num_of_dark_counts(self):
+        
+        """
+        Total Number of registered Dark Counts (including the discarded ones and the ones sampled in and outside Analysis Windows)
+        """
+        
+        return self.num_of_discarded_dark_counts + self.num_of_registered_dark_counts + self.num_of_window_dark_counts + self.num_of_outside_dark_counts
+        
+    def compact_dark_counts(self):
+        
+        """
+        Instance method to discard the dark counts which can no longer fall in an analysis window, i.e., the ones before the next dark count to be checked (see 'dark_count_in_window'), by moving the retained ones to the front of the buffer
         
         Details:
-            The time interval between dark counts follows an exponential distribution
+            The discarded dark counts are only accounted for in 'num_of_discarded_dark_counts', hence the size of the buffer stays bounded (by a few blocks) regardless of the simulated time
         """
-
-        dark_count_time_interval = self.gen.exponential(1/self.dark_count_rate)
-        self.next_dark_count_time = self.next_dark_count_time + dark_count_time_interval
         
-    def register_dark_counts(self):
+        base = self.dark_count_check_idx
+        if base > 0:
+            n = self.num_of_generated_dark_counts
+            self.dark_count_buffer[:n - base] = self.dark_count_buffer[base:n]
+            self.num_of_generated_dark_counts -= base
+            self.num_of_registered_dark_counts -= base
+            self.num_of_tagged_dark_counts = max(self.num_of_tagged_dark_counts - base,0)
+            self.num_of_discarded_dark_counts += base
+            self.dark_count_check_idx = 0
+        
+    def schedule_dark_counts(self):
+        
+        """
+        Instance method for generating a block of dark counts into the buffer (which is compacted, or doubled in size if compacting does not make room for the block, when full)
+        
+        Details:
+            The time interval between dark counts follows an exponential distribution, i.e., the time instants of a block are the cumulative sum of exponential samples
+        """
+        
+        if self.num_of_generated_dark_counts + self.dark_count_block_size > len(self.dark_count_buffer):
+            self.compact_dark_counts()
+        
+        n = self.num_of_generated_dark_counts
+        if n + self.dark_count_block_size > len(self.dark_count_buffer):
+            buffer = np.empty(2*len(self.dark_count_buffer) + self.dark_count_block_size)
+            buffer[:n] = self.dark_count_buffer[:n]
+            self.dark_count_buffer = buffer
+        
+        last_time = self.dark_count_buffer[n - 1] if n != 0 else self.next_dark_count_time
+        block = self.dark_count_buffer[n:n + self.dark_count_block_size]
+        np.cumsum(self.gen.exponential(1/self.dark_count_rate,size = self.dark_count_block_size),out = block)
+        block += last_time
+        self.num_of_generated_dark_counts += self.dark_count_block_size
+        
+    def register_dark_counts(self,until):
+        
+        """
+        Instance method for registering the dark counts up to (and including) the first one at or after a given time (only in the 'timeline' dark count mode)
+        
+        Details:
+            Only the dark counts strictly before the given time are emitted to the time tagger, since the first one at or after it may be later than clicks which are yet to be tagged (it is emitted once a later time is reached)
+        
+        Arguments:
+            until (float) = Time (e.g., the End of an Analysis Window)
+        """
+        
+        if self.dark_count_mode == 'timeline' and self.dark_count_rate > 0 and until > self.next_dark_count_time:
+            
+            while self.num_of_generated_dark_counts == 0 or self.dark_count_buffer[self.num_of_generated_dark_counts - 1] < until:
+                self.schedule_dark_counts()
+            
+            idx = int(np.searchsorted(self.dark_count_buffer[:self.num_of_generated_dark_counts],until,side = 'left'))
+            if self.time_tagger is not None and idx > self.num_of_tagged_dark_counts:
+                self.time_tagger.tag_batch(self.dark_count_buffer[self.num_of_tagged_dark_counts:idx],self.channel)
+            self.num_of_tagged_dark_counts = max(self.num_of_tagged_dark_counts,idx)
+            self.num_of_registered_dark_counts = max(self.num_of_registered_dark_counts,idx + 1)
+            self.next_dark_count_time = self.dark_count_buffer[self.num_of_registered_dark_counts - 1]
+            
+    def dark_count_in_window(self,t_min,t_max):
         
         """
-        Instance method for registering dark counts
+        Instance method to find the latest of the registered dark counts which have not been checked before and fall in an analysis window
+        
+        Details:
+            The registered dark counts are sorted, hence a window query is a binary search, i.e., its cost is logarithmic in the number of registered dark counts
+            The last registered dark count (at or after the end of the window) is checked again in the next window
+            In the 'window' dark count mode, the dark counts in the window are sampled instead (see 'sample_window_dark_counts')
+        
+        Arguments:
+            t_min (float) = Start of the Analysis Window
+            t_max (float) = End of the Analysis Window
+            
+        Returned Value:
+            dark_count_time (float) = Time Instant of the Dark Count (None if no Dark Count falls in the Window)
         """
         
-        if self.dark_count_rate > 0:
+        if self.dark_count_mode == 'window':
+            latest = self.sample_window_dark_counts(t_min,t_max)[1]
+            return None if np.isnan(latest[0]) else float(latest[0])
+        
+        dark_count_time_instants = self.dark_count_time_instants
+        check_idx = self.dark_count_check_idx
+        self.dark_count_check_idx = max(len(dark_count_time_instants) - 1,0)
+        
+        idx = int(np.searchsorted(dark_count_time_instants,t_max,side = 'right')) - 1
+        if idx >= check_idx and dark_count_time_instants[idx] >= t_min:
+            return float(dark_count_time_instants[idx])
+        
+        return None
+        
+    def sample_window_dark_counts(self,t_min,t_max,positions = True):
+        
+        """
+        Instance method to sample the dark counts falling in (non-overlapping) analysis windows in vectorized form, i.e., the dark counts of all the windows of a run may be sampled in one call
+        
+        Details:
+            The number of dark counts in a window follows a Poisson distribution with mean dark_count_rate*(t_max - t_min)
+            Given k dark counts in a window, their positions are independent and uniformly distributed, hence the latest of them is sampled directly as t_min + (t_max - t_min)*U^(1/k), where U ~ Uniform(0,1)
+            The sampled dark counts are accounted for in 'num_of_window_dark_counts'
+        
+        Arguments:
+            t_min (float or numpy.array[float]) = Start(s) of the Analysis Window(s)
+            t_max (float or numpy.array[float]) = End(s) of the Analysis Window(s)
+            positions (bool) = Boolean indicating whether the Positions of the latest Dark Counts are to be sampled
             
-            self.schedule_dark_count()
-            self.dark_count_time_instants.append(self.next_dark_count_time)
+        Returned Value:
+            counts (numpy.array[int]) = Numbers of Dark Counts in the Windows
+            latest (numpy.array[float]) = Time Instants of the latest Dark Counts in the Windows (NaN for a Window without any Dark Count; None if the Positions are not sampled)
+        """
+        
+        t_min = np.atleast_1d(np.asarray(t_min,dtype = float))
+        t_max = np.atleast_1d(np.asarray(t_max,dtype = float))
+        window = np.maximum(t_max - t_min,0)
+        
+        counts = self.gen.poisson(self.dark_count_rate*window)
+        self.num_of_window_dark_counts += int(counts.sum())
+        self.dark_count_window_time += float(window.sum())
+        if len(t_max) != 0:
+            self.dark_count_horizon = max(self.dark_count_horizon,float(t_max.max()))
+        
+        if not positions:
+            return counts,None
+        
+        latest = np.full(counts.shape,np.nan)
+        hit = counts > 0
+        latest[hit] = t_min[hit] + window[hit]*self.gen.random(int(hit.sum()))**(1/counts[hit])
+        
+        if self.time_tagger is not None:
+            self.time_tagger.tag_batch(latest[hit],self.channel)
+        
+        return counts,latest
                     
+    def sample_outside_dark_counts(self):
+        
+        """
+        Instance method to sample (in one Poisson draw) the dark counts falling outside the analysis windows up to the latest of them, which have not been sampled before (only in the 'window' dark count mode)
+        
+        Details:
+            The dark counts are only counted (in 'num_of_outside_dark_counts'), i.e., their positions are not sampled, so that the total number of dark counts has the same meaning as in the 'timeline' dark count mode
+        """
+        
+        if self.dark_count_mode != 'window':
+            return
+        
+        outside_time = (self.dark_count_horizon - self.dark_count_start_time) - self.dark_count_window_time - self.dark_count_outside_time
+        if outside_time > 0:
+            self.num_of_outside_dark_counts += int(self.gen.poisson(self.dark_count_rate*outside_time))
+            self.dark_count_outside_time += outside_time
+        
     def receive(self,p_net): 
         
         """
@@ -160,21 +366,26 @@ class Detector(Component):
             
             if p is not None:
                 
-                if self.set_adaptive_env:
+                if self.set_adaptive_env and p.time is None:
                     self.set_environment(p.env)
                 
+                # A timestamped photon (see 'Photon.set_emission_time') carries its own arrival time
+                arrival_time = p.time if p.time is not None else self.env.now
+                
                 # Check if the probability of the photon being coupled into the detector is less than the coupling efficiency and if that is the case, couple it into the detector
                 if self.gen.random() < self.coupling_eff:
                     # Check if the photon arrives at the detector at/after the next detection time. If that is the case, the photon may be detected
-                    if (self.env.now >= self.next_detection_time): 
+                    if (arrival_time >= self.next_detection_time): 
                         # Check if the probability of the photon triggering a detection count is less than the detection efficiency of the detector and if that is the case, register a photon count
                         if self.gen.random() < self.det_eff:
                             self.photon_count += 1
                             # Set the next instant of time at which a photon can possibly be detected (Here, the detector's response function has been assumed to be Gaussian)
-                            self.next_detection_time = self.env.now + self.jitter*self.gen.standard_normal() + self.dead_time   
+                            self.next_detection_time = arrival_time + self.jitter*self.gen.standard_normal() + self.dead_time   
                             self.num_net.append(self.num)
                             self.measured_qs_coeffs_net.append(self.measured_qs_coeffs)
-                            self.detection_time_net.append(p.env.now)
+                            self.detection_time_net.append(p.time if p.time is not None else p.env.now)
+                            if self.time_tagger is not None:
+                                self.time_tagger.tag(self.detection_time_net[-1],self.channel)
                             self.flag = True
 
             
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from ..components.quantum_channel import QuantumChannel
+
+class FreeSpaceChannel(QuantumChannel):
+
+    """
+    Models a Free-Space (e.g., Satellite-to-Ground) Quantum Channel whose Loss and Delay vary continuously with Time (e.g., with the Elevation and the Turbulence during a Pass)
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        trace_times (numpy.array[float] or numpy.memmap) = Sample Times of the Loss Trace (in s, in ascending order)
+        trace_loss (numpy.array[float] or numpy.memmap) = Channel Losses at the Sample Times (in dB)
+        trace_delay (numpy.array[float] or numpy.memmap) = Propagation Delays at the Sample Times (in s)
+        pol_fidelity (float) = Polarization Fidelity (Probability of not undergoing Depolarization)
+        depol_prob (float) = Probability of suffering Depolarization
+        sender (Laser or Weaklaser or EntangledPhotonsSourceSPDC) = Sender of Photons encoded with Quantum Information
+        receiver (NonPolarizingBeamSplitter or PolarizingBeamSplitter or Mirror or WavePlate or Detector) = Receiver of the transmitted Photons
+        coupling_eff (float) = Coupling Efficiency of the Source with the Quantum Channel
+        set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+        length (float) = Length (Slant Range, in m) at the Start of the Trace
+        mean_transmission_time (float) = Propagation Delay at the Entry Time of the last Photon
+        trnmt (float) = Transmittance at the Entry Time of the last Photon
+    """
+
+    def __init__(self,uID,env,trace_times,trace_loss,trace_delay,pol_fidelity,depol_prob,set_adaptive_env = False):
+
+        """
+        Constructor for the FreeSpaceChannel class
+
+        Details:
+            The trace is never copied, i.e., a memory-mapped trace (see 'load') stays on disk and only the samples around the entry times of the photons are read
+            Beyond the ends of the trace, the loss and the delay at the nearest end apply
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+            trace_times (numpy.array[float] or numpy.memmap) = Sample Times of the Loss Trace (in s, in ascending order)
+            trace_loss (numpy.array[float] or numpy.memmap) = Channel Losses at the Sample Times (in dB)
+            trace_delay (numpy.array[float] or numpy.memmap) = Propagation Delays at the Sample Times (in s)
+            pol_fidelity (float) = Polarization Fidelity (Probability of not undergoing Depolarization)
+            depol_prob (float) = Probability of suffering Depolarization
+            set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+        """
+
+        assert len(trace_times) >= 1 and len(trace_times) == len(trace_loss) == len(trace_delay),"The loss trace must have a loss and a delay for every sample time"
+
+        c = 3e8
+        QuantumChannel.__init__(self,uID,env,float(trace_delay[0])*c,0,1,pol_fidelity,0,depol_prob,set_adaptive_env)
+
+        self.trace_times = trace_times
+        self.trace_loss = trace_loss
+        self.trace_delay = trace_delay
+        self.mean_transmission_time = float(trace_delay[0])
+        self.trnmt = 10**(-1*float(trace_loss[0])/10)
+
+    @classmethod
+    def load(cls,uID,env,filename,pol_fidelity,depol_prob,set_adaptive_env = False):
+
+        """
+        Class method to create a free-space quantum channel with a loss trace stored as memory maps
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+            filename (str) = Path Prefix of the '.npy' Files storing the Trace ('_times.npy', '_loss.npy' and '_delay.npy')
+            pol_fidelity (float) = Polarization Fidelity (Probability of not undergoing Depolarization)
+            depol_prob (float) = Probability of suffering Depolarization
+            set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+
+        Returned Value:
+            fsc (FreeSpaceChannel) = Free-Space Quantum Channel with the Memory-Mapped (Read-Only) Trace
+        """
+
+        trace = [np.load(filename + suffix,mmap_mode = 'r') for suffix in ['_times.npy','_loss.npy','_delay.npy']]
+
+        return cls(uID,env,*trace,pol_fidelity,depol_prob,set_adaptive_env)
+
+    def interpolate(self,t):
+
+        """
+        Instance method to (linearly) interpolate the transmittance and the delay of the channel at given times in vectorized form
+
+        Arguments:
+            t (float or numpy.array[float]) = Simulated Time(s)
+
+        Returned Value:
+            trnmt (numpy.array[float]) = Transmittance(s) at the given Time(s)
+            delay (numpy.array[float]) = Propagation Delay(s) at the given Time(s)
+        """
+
+        t = np.atleast_1d(np.asarray(t,dtype = float))
+        n = len(self.trace_times)
+
+        # Binary search for the enclosing samples (only the samples at the given times are read from a memory-mapped trace)
+        hi = np.clip(np.searchsorted(self.trace_times,t,side = 'right'),1,max(n - 1,1))
+        lo = hi - 1
+        hi = np.minimum(hi,n - 1)
+
+        t_lo = np.asarray(self.trace_times[lo],dtype = float)
+        t_hi = np.asarray(self.trace_times[hi],dtype = float)
+        span = t_hi - t_lo
+        w = np.clip(np.divide(t - t_lo,span,out = np.zeros_like(t),where = span > 0),0,1)
+
+        loss = (1 - w)*self.trace_loss[lo] + w*self.trace_loss[hi]
+        delay = (1 - w)*self.trace_delay[lo] + w*self.trace_delay[hi]
+
+        return 10**(-1*loss/10),delay
+
+    def decide(self,p):
+
+        """
+        Instance method to decide whether a photon is coupled into and transmitted by the channel (see 'QuantumChannel.decide') with the transmittance and the delay at its entry time
+
+        Arguments:
+            p (photon) = Photon emitted by the Source
+
+        Returned Value:
+            coupled (bool) = Boolean indicating whether the Photon has been coupled into the Channel
+            transmitted (bool) = Boolean indicating whether the Photon has been transmitted by the Channel
+            transmission_time (float) = Actual Time taken by the Photon to cross the Channel
+        """
+
+        trnmt,delay = self.interpolate(p.time if p.time is not None else self.env.now)
+        self.trnmt = float(trnmt[0])
+        self.mean_transmission_time = float(delay[0])
+
+        return QuantumChannel.decide(self,p)
+
+    def receive_batch(self,p_net):
+
+        """
+        Instance method to receive and consequently, transmit a batch of photons emitted by the source (see 'QuantumChannel.receive_batch') with the transmittances and the delays interpolated at their entry times in one vectorized step
+
+        Arguments:
+            p_net (list[photon]) = Photons emitted by the Source
+        """
+
+        idx_net = [idx for idx,p in enumerate(p_net) if p is not None]
+        photons = [p_net[idx] for idx in idx_net]
+
+        trnmt_net,delay_net = self.interpolate(self.entry_times(photons))
+
+        coupled,transmitted,transmission_time_net = self.decide_batch(photons,np.zeros(len(photons)),trnmt_net,delay_net)
+        self.propagate_batch(photons,coupled,transmission_time_net)
+
+        for k in np.flatnonzero(~transmitted):
+            p_net[idx_net[k]] = None
+
+        self.receiver.receive(p_net)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from ..components.quantum_channel import QuantumChannel
+
+class FusedQuantumChannel(QuantumChannel):
+
+    """
+    Models a Chain of consecutive Quantum Channels (e.g., Patch Cords) as one effective Quantum Channel
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        qc_chain (list[QuantumChannel]) = Chain of consecutive Quantum Channels which have been fused
+        length (float) = Net Length (in m)
+        alpha (float) = Effective Attenuation Coefficient (in dB/m)
+        n_core (float) = Effective Refractive Index of the Core
+        pol_fidelity (float) = Net Polarization Fidelity (Probability of not undergoing Depolarization in any of the Quantum Channels)
+        chr_dispersion (float) = Effective Chromatic Dispersion (in s/m-m)
+        depol_prob (float) = Net Probability of suffering Depolarization
+        sender (Laser or Weaklaser or EntangledPhotonsSourceSPDC) = Sender of Photons encoded with Quantum Information
+        receiver (NonPolarizingBeamSplitter or PolarizingBeamSplitter or Mirror or WavePlate or Detector) = Receiver of the transmitted Photons
+        coupling_eff (float) = Net Coupling Efficiency (Product of the Coupling Efficiencies of the Quantum Channels)
+        set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+        mean_transmission_time (float) = Net Mean Time taken by a Photon to cross the Lengths of the Quantum Channels
+        trnmt (float) = Net Transmittance (Product of the Transmittances of the Quantum Channels)
+    """
+
+    def __init__(self,uID,qc_chain):
+
+        """
+        Constructor for the FusedQuantumChannel class
+
+        Details:
+            The coupling efficiencies and transmittances are multiplied, the mean transmission times and the dispersions (chr_dispersion*length) are summed, and the polarization fidelity (depolarization probability) is the probability of the polarization remaining unchanged by (being depolarized in) at least one of the quantum channels
+            The coupling efficiencies of the quantum channels must be set before fusing them
+
+        Arguments:
+            uID (str) = Unique ID
+            qc_chain (list[QuantumChannel]) = Chain of consecutive Quantum Channels (in the order of propagation)
+        """
+
+        assert len(qc_chain) >= 2,"At least 2 consecutive quantum channels are required for fusion"
+        for qc_prev,qc_next in zip(qc_chain[:-1],qc_chain[1:]):
+            assert qc_prev.receiver is qc_next,f'The quantum channels [{qc_prev.uID}] and [{qc_next.uID}] are NOT consecutive'
+
+        length = sum(qc.length for qc in qc_chain)
+        alpha = sum(qc.alpha*qc.length for qc in qc_chain)/length
+        n_core = sum(qc.n_core*qc.length for qc in qc_chain)/length
+        pol_fidelity = float(np.prod([qc.pol_fidelity for qc in qc_chain]))
+        chr_dispersion = sum(qc.chr_dispersion*qc.length for qc in qc_chain)/length
+        depol_prob = 1 - float(np.prod([1 - qc.depol_prob for qc in qc_chain]))
+
+        QuantumChannel.__init__(self,uID,qc_chain[0].env,length,alpha,n_core,pol_fidelity,chr_dispersion,depol_prob,qc_chain[0].set_adaptive_env)
+
+        self.qc_chain = qc_chain
+        self.mean_transmission_time = sum(qc.mean_transmission_time for qc in qc_chain)
+        self.trnmt = float(np.prod([qc.trnmt for qc in qc_chain]))
+        self.set_coupling_efficiency(float(np.prod([qc.coupling_eff for qc in qc_chain])))
+        self.connect(qc_chain[0].sender,qc_chain[-1].receiver)
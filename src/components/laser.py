@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import itertools as it
 from ..components.photon import Photon
 from ..components.component import Component
 
@@ -73,36 +74,129 @@ class Laser(Component):
             photons_net (list[list[Photon]]) = List of the Emitted Photons 
         """
         
-        time_pd = 1/self.PRR
-
         photons_net = []
 
         for i,qs in enumerate(qs_list):
-            qs_orig = np.reshape(np.array(qs),(len(qs),1))
-            num_of_photons = self.gen.poisson(lam = self.mu_photons)
-            qs_photons = []
-            t_width_net_qs = []
-            for j in range(num_of_photons):
-                wl_p = self.wl + self.lwidth*self.gen.standard_normal()
-                twidth_p = self.twidth*self.gen.standard_normal()
-                t_width_net_qs.append(twidth_p)
-                if self.gen.random() < (1/PER):
-                    qs = np.ones(qs_orig.shape) - qs_orig
-                else:
-                    qs = qs_orig
-                p = Photon(str(self.uID) + '_' + str(i) + '_' + str(j),wl_p,twidth_p,self.enc_type,qs,basis)
-                p.set_source_linewidth(self.lwidth)
-                if self.gen.random() < self.noise_level:
-                    p.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
-                qs_photons.append(p)
+            qs_photons,pulse_duration = self.emit_pulse(i,qs,basis,PER)
             photons_net.append(qs_photons)
-            if len(t_width_net_qs) != 0:
-                self.env.timeout(time_pd + max(t_width_net_qs))
-            else:
-                self.env.timeout(time_pd)
+            self.env.timeout(pulse_duration)
             self.env.run()
        
         return photons_net
-
-
-
+    
+    def emit_pulse(self,i,qs,basis,PER,num_of_photons = None):
+        
+        """
+        Instance method for generating the photons of a single pulse (without advancing the simulation time)
+        
+        Arguments:
+            i (int) = Index of the Pulse
+            qs (list[complex]) = Set of Quantum State Coefficients
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted component(s) of Polarization
+            num_of_photons (int) = Number of Photons in the Pulse (Default: None, i.e., drawn from a Poisson distribution with its mean as mu_photons)
+            
+        Returned Value:
+            qs_photons (list[Photon]) = List of the Photons in the Pulse
+            pulse_duration (float) = Time Period taken up by the Pulse (including the maximal Temporal Width of its Photons)
+        """
+        
+        time_pd = 1/self.PRR
+        
+        qs_orig = np.reshape(np.array(qs),(len(qs),1))
+        if num_of_photons is None:
+            num_of_photons = self.gen.poisson(lam = self.mu_photons)
+        qs_photons = []
+        t_width_net_qs = []
+        for j in range(num_of_photons):
+            wl_p = self.wl + self.lwidth*self.gen.standard_normal()
+            twidth_p = self.twidth*self.gen.standard_normal()
+            t_width_net_qs.append(twidth_p)
+            if self.gen.random() < (1/PER):
+                qs = np.ones(qs_orig.shape) - qs_orig
+            else:
+                qs = qs_orig
+            p = Photon(str(self.uID) + '_' + str(i) + '_' + str(j),wl_p,twidth_p,self.enc_type,qs,basis)
+            p.set_source_linewidth(self.lwidth)
+            if self.gen.random() < self.noise_level:
+                p.qs.dampen_phase_and_amplitude(self.gamma,self.lmda)
+            qs_photons.append(p)
+        if len(t_width_net_qs) != 0:
+            pulse_duration = time_pd + max(t_width_net_qs)
+        else:
+            pulse_duration = time_pd
+            
+        return qs_photons,pulse_duration
+    
+    def emission_process(self,emit_pulse,qs_list,basis,PER,deliver):
+        
+        """
+        Generator method (Simpy process) for emitting a train of pulses in the event-driven operation (see 'Component.enable_event_driven')
+        
+        Details:
+            Each pulse is handed over (via the deliver callback) once it has been completely emitted, by yielding a Simpy Timeout instead of advancing the Simpy Environment synchronously
+        
+        Arguments:
+            emit_pulse (function) = Pulse-Level Emission Method (e.g., 'emit_pulse')
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients (one per Pulse)
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted component(s) of Polarization
+            deliver (function) = Callback which hands over the Photons of a Pulse to the Receiver(s)
+        """
+        
+        for i,qs in enumerate(qs_list):
+            pulse,pulse_duration = emit_pulse(i,qs,basis,PER)
+            yield self.env.timeout(pulse_duration)
+            deliver(pulse)
+        
+    def emit_stream(self,states,bases,PER,chunk_size = 1024):
+        
+        """
+        Generator method for emitting a (possibly very long) train of photon pulses chunk by chunk
+        
+        Details:
+            The quantum state coefficients and bases are consumed lazily, so that only one chunk of pulses is held in memory at any given time
+            The simulation time is advanced once per chunk (by the net duration of all of its pulses) instead of once per pulse
+            The timestamp of a pulse is the time at which it has been completely emitted, i.e., the time at which 'emit' would have left the simulation clock for that pulse
+        
+        Arguments:
+            states (iterable[list[complex]]) = Sets of Quantum State Coefficients (one per Pulse)
+            bases (iterable[numpy.array(list[list[complex]])] or numpy.array(list[list[complex]])) = Bases of the Quantum States (one per Pulse or a single Basis for all the Pulses)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted component(s) of Polarization
+            chunk_size (int) = Number of Pulses per Chunk
+            
+        Yielded Value:
+            photons_chunk (list[list[Photon]]) = List of the Emitted Photons (one List per Pulse)
+            timestamps (numpy.array[float]) = Emission Times of the Pulses
+        """
+        
+        return self._stream(self.emit_pulse,states,bases,PER,chunk_size)
+        
+    def _stream(self,emit_pulse,states,bases,PER,chunk_size):
+        
+        """
+        Instance method which drives a pulse-level emission method over a train of pulses chunk by chunk (see 'emit_stream')
+        """
+        
+        assert chunk_size > 0,"The chunk size must be a positive integer"
+        
+        if isinstance(bases,np.ndarray) and bases.ndim == 2:
+            bases = it.repeat(bases)
+            
+        pulse_net = zip(states,bases)
+        i = 0
+        
+        while True:
+            chunk = list(it.islice(pulse_net,chunk_size))
+            if len(chunk) == 0:
+                return
+            pulses_chunk = []
+            durations = np.empty(len(chunk))
+            for k,(qs,basis) in enumerate(chunk):
+                pulse,durations[k] = emit_pulse(i,qs,basis,PER)
+                pulses_chunk.append(pulse)
+                i += 1
+            timestamps = self.env.now + np.cumsum(durations)
+            self.env.timeout(timestamps[-1] - self.env.now)
+            self.env.run()
+            yield pulses_chunk,timestamps
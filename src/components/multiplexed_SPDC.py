@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from ..components.SPDC import EntangledPhotonsSourceSPDC
+
+class MultiplexedEntangledPhotonsSourceSPDC(EntangledPhotonsSourceSPDC):
+
+    """
+    Models a Bank of (spatially or temporally) Multiplexed SPDC based Sources which emits the entangled photons of the mode that fired (switched to the output via an optical switch)
+
+    References:
+        1. A. L. Migdall, D. Branning, and S. Castelletto, "Tailoring single-photon and multiphoton probabilities of a single-photon on-demand source," Phys. Rev. A, vol. 66, no. 5, p. 053805, 2002
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        PRR (float) = Pulse Repetition Rate, i.e., the Frequency with which the Photon Pulses are emitted by the Laser
+        wl (float) = Wavelength of the Laser
+        lwidth (float) = Linewidth of the Laser
+        twidth (float) = Temporal Width of the Laser
+        mu_photons (int) = Mean Number of Photons emitted by the Laser (per Mode)
+        enc_type (str) = Type of Quantum Information Encoding (see 'photon_enc.py') of the Photons emitted by the Laser
+        noise_level (float) = Probability of the Quantum State of the Photons emitted by the Laser being altered because of Noise
+        gamma (float) = Probability of losing a Photon
+        lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
+        SPDC_type (int) = Type of SPDC (1 or 2) which determines the Final Bell/Bell-like State of the emitted Photons
+        bell_like_state (str)  = Form of the Entangled Quantum State of the SPDC Photons specified in terms of a Bell State
+        efficiency (float) = Pair Production Efficiency of the SPDC process (in generated pairs per incident photons)
+        chi (float) = Angle of the Pump Laser's Polarization w.r.t. the Vertical Axis
+        p_down_conversion (float) = Probability of a Pump Photon being successfully down converted
+        num_of_modes (int) = Number of Multiplexed Modes (SPDC Sources)
+        switch_loss (float) = Insertion Loss of the Optical Switch (in dB)
+        switch_trnmt (float) = Transmittance of the Optical Switch
+        heralded_modes (numpy.array[int]) = Modes selected in the Pulses of the last Emission (-1 if no Mode fired)
+    """
+
+    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,SPDC_type,efficiency,num_of_modes,switch_loss,chi = 45):
+
+        """
+        Constructor for the MultiplexedEntangledPhotonsSourceSPDC class
+
+        Details:
+            The pairs of every mode are sampled directly (see 'EntangledPhotonsSourceSPDC.sample_pairs'), i.e., the pump photons are never generated
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+            PRR (float) = Pulse Repetition Rate, i.e., the Frequency with which the Photon Pulses are emitted by the Laser
+            wl (float) = Wavelength of the Laser
+            lwidth (float) = Linewidth of the Laser
+            twidth (float) = Temporal Width of the Laser
+            mu_photons (int) = Mean Number of Photons emitted by the Laser (per Mode)
+            enc_type (str) = Type of Quantum Information Encoding (see 'photon_enc.py') of the Photons emitted by the Laser
+            noise_level (float) = Probability of the Quantum State of the Photons emitted by the Laser being altered because of Noise
+            gamma (float) = Probability of losing a Photon
+            lmda (float) =  Probability of a Photon getting scattered from the System (Without any Loss of Energy)
+            SPDC_type (int) = Type of SPDC (1 or 2) which determines the Final Bell/Bell-like State of the emitted Photons
+            efficiency (float) = Pair Production Efficiency of the SPDC process (in generated pairs per incident photons)
+            num_of_modes (int) = Number of Multiplexed Modes (SPDC Sources)
+            switch_loss (float) = Insertion Loss of the Optical Switch (in dB)
+            chi (float) = Angle of the Pump Laser's Polarization w.r.t. the Vertical Axis
+        """
+
+        EntangledPhotonsSourceSPDC.__init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,SPDC_type,efficiency,chi,pair_sampling = 'direct')
+
+        assert num_of_modes >= 1,"The number of multiplexed modes must be a positive integer"
+        assert switch_loss >= 0,"The insertion loss of the optical switch can NOT be negative"
+
+        self.num_of_modes = int(num_of_modes)
+        self.switch_loss = switch_loss
+        self.switch_trnmt = 10**(-1*switch_loss/10)
+        self.heralded_modes = np.array([],dtype = int)
+
+    def herald(self):
+
+        """
+        Instance method for drawing the pair generation events of all the modes for a single pump pulse (in one vectorized draw) and selecting the heralded mode
+
+        Details:
+            The number of pairs of every mode follows the same (thinned and capped) distribution as in 'EntangledPhotonsSourceSPDC.sample_pairs'
+            The switch is set to the first mode that fired
+
+        Returned Value:
+            mode (int) = Heralded Mode (-1 if no Mode fired)
+            num_of_pairs (int) = Number of Entangled Photon Pairs generated in the Heralded Mode
+            num_of_pump_photons (int) = Total Number of Pump Photons (over all the Modes)
+        """
+
+        num_of_pump_photons_net = self.gen.poisson(lam = self.mu_photons,size = self.num_of_modes)
+        max_no_of_photon_pairs_gen_net = np.rint(self.efficiency*num_of_pump_photons_net).astype(int)
+        num_of_pairs_net = np.minimum(self.gen.binomial(num_of_pump_photons_net,self.p_down_conversion),max_no_of_photon_pairs_gen_net)
+
+        fired_modes = np.flatnonzero(num_of_pairs_net)
+
+        if len(fired_modes) == 0:
+            return -1,0,int(num_of_pump_photons_net.sum())
+
+        return int(fired_modes[0]),int(num_of_pairs_net[fired_modes[0]]),int(num_of_pump_photons_net.sum())
+
+    def emit_mux_pulse(self,i,qs,basis):
+
+        """
+        Instance method for generating the entangled photon pairs of the heralded mode for a single pump pulse (without advancing the simulation time)
+
+        Details:
+            Only the pairs of the heralded mode are created, i.e., the cost per pulse is (nearly) independent of the number of modes
+            Every photon of the selected pair(s) is lost in the optical switch with a probability of 1 - switch_trnmt (a lost photon is replaced by None)
+
+        Arguments:
+            i (int) = Index of the Pump Pulse
+            qs (list[complex]) = Set of Quantum State Coefficients of the Pump Photons
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Pump Photons
+
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs emitted by the Heralded Mode
+            pulse_duration (float) = Time Period taken up by the Pump Pulse
+            mode (int) = Heralded Mode (-1 if no Mode fired)
+        """
+
+        mode,num_of_pairs,num_of_pump_photons = self.herald()
+        pulse_duration = self.sample_pulse_duration(num_of_pump_photons)
+
+        if mode == -1:
+            return [],pulse_duration,mode
+
+        ephotons_net = self.make_pairs(num_of_pairs,qs,basis,str(i) + '_M' + str(mode))
+
+        lost_net = self.gen.random((num_of_pairs,2)) >= self.switch_trnmt
+        for epp,lost in zip(ephotons_net,lost_net):
+            for k in np.flatnonzero(lost):
+                epp[k] = None
+
+        return ephotons_net,pulse_duration,mode
+
+    def emit_pp_pulse(self,i,qs,basis,PER):
+
+        """
+        Instance method for generating the entangled photon pairs of the heralded mode for a single pump pulse (see 'emit_mux_pulse')
+
+        Arguments:
+            i (int) = Index of the Pump Pulse
+            qs (list[complex]) = Set of Quantum State Coefficients of the Photons emitted by the Laser
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs emitted by the Heralded Mode
+            pulse_duration (float) = Time Period taken up by the Pump Pulse
+        """
+
+        ephotons_net,pulse_duration,mode = self.emit_mux_pulse(i,qs,basis)
+
+        return ephotons_net,pulse_duration
+
+    def emit_pp(self,qs_list,basis,PER):
+
+        """
+        Instance method for emitting the entangled photon pairs of the heralded modes of a number of pump pulses
+
+        Details:
+            The photons are timestamped with the emission time of their pump pulse and handed over to the receivers in one batch (see 'EntangledPhotonsSourceSPDC.schedule_delivery')
+
+        Arguments:
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons emitted by the Laser (one per Pump Pulse)
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+
+        Returned Value:
+            ephotons_net (list[list[Photon]]) = List of Entangled Photon Pairs emitted by the Heralded Modes
+        """
+
+        ephotons_net = []
+        heralded_modes = np.empty(len(qs_list),dtype = int)
+
+        for i,qs in enumerate(qs_list):
+            epp_net,pulse_duration,heralded_modes[i] = self.emit_mux_pulse(i,qs,basis)
+            self.env.timeout(pulse_duration)
+            self.env.run()
+            for epp in epp_net:
+                for ep in epp:
+                    if ep is not None:
+                        ep.set_environment(self.env)
+                        ep.set_emission_time(self.env.now)
+            ephotons_net += epp_net
+
+        self.heralded_modes = heralded_modes
+        self.schedule_delivery(ephotons_net)
+
+        return ephotons_net
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import copy
 import numpy as np
+import simpy
 from ..components.component import Component
 from ..components.quantum_channel import QuantumChannel
+from ..components.fused_quantum_channel import FusedQuantumChannel
+from ..components.wdm_quantum_channel import WDMQuantumChannel
+from ..components.classical_message import ClassicalMessage
+from ..components.authentication import KeyPool
 from ..components.detector import Detector
 
 class Node(Component):
@@ -15,6 +21,8 @@ class Node(Component):
         env (simpy.Environment) = Simpy Environment for Simulation
         gen (numpy.random.Generator) = Random Number Generator
         all_components(Dict[str:str]) = Dictionary of all the Components belonging to the Node, such that, for any Dictionary Item, Key = component.uID and Value = component
+        inboxes (Dict{(str,str):simpy.Store}) = Open Inboxes for Classical Messages, such that, for any Dictionary Item, Key = (Classical Channel uID, Session) and Value = Inbox
+        key_pool (KeyPool) = Store of the Key Material shared with other Nodes (e.g., for the Authentication of Classical Messages)
     """
 
     def __init__(self,uID,env):
@@ -29,6 +37,8 @@ class Node(Component):
         
         Component.__init__(self,uID,env)
         self.all_components = {}
+        self.inboxes = {}
+        self.key_pool = KeyPool()
         
     def add_components(self,comp_net):
         
@@ -143,33 +153,162 @@ class Node(Component):
                 elif len(s_d_uids[0]) == 2:
                     self.all_components[comp_uid].connect([self.all_components[s_d_uids[0][0]],self.all_components[s_d_uids[0][1]]],[self.all_components[s_d_uids[1][0]],self.all_components[s_d_uids[1][1]]])
              
-    def send_classical_information(self,cch_uid,info,rec_node):
+    def send_classical_information(self,cch_uid,info,rec_node,session = None):
         
         """
         Instance method to send classical information to the receiver node
         
         Arguments:
             cch_uid (str) = Unique ID of the Classical Channel via which the Information is to be transmitted
-            info (str) = Information to be transmitted via the Classical Channel
+            info (str or bytes or numpy.array or ClassicalMessage) = Information to be transmitted via the Classical Channel (see 'ClassicalMessage')
             rec_node (Node) = Receiver Node 
+            session (str) = Session to which the Information belongs (Default: None)
+            
+        Returned Value:
+            process (simpy.Process) = Simpy Process which completes once the Information has been received (only in the Event-Driven Operation of the Classical Channel)
+        """
+        
+        self.all_components[cch_uid].set_sender_and_receiver(self,rec_node)
+        assert self.all_components[cch_uid].sender == self,"Can't send information since you are NOT connected to the channel as a sender node"
+        return self.all_components[cch_uid].transmit(self.make_message(info,session))
+    
+    def send_classical_information_batch(self,cch_uid,info_net,rec_node,session = None):
+        
+        """
+        Instance method to send a list of messages to the receiver node in a single propagation delay (see 'ClassicalChannel.transmit_batch')
+        
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel via which the Information is to be transmitted
+            info_net (list[str or bytes or numpy.array or ClassicalMessage]) = Information to be transmitted via the Classical Channel (one Item per Message)
+            rec_node (Node) = Receiver Node 
+            session (str) = Session to which the Information belongs (Default: None)
+            
+        Returned Value:
+            process (simpy.Process) = Simpy Process which completes once the Information has been received (only in the Event-Driven Operation of the Classical Channel)
         """
         
         self.all_components[cch_uid].set_sender_and_receiver(self,rec_node)
         assert self.all_components[cch_uid].sender == self,"Can't send information since you are NOT connected to the channel as a sender node"
-        self.all_components[cch_uid].transmit(info)
+        return self.all_components[cch_uid].transmit_batch([self.make_message(info,session) for info in info_net])
+    
+    @staticmethod
+    def make_message(info,session = None):
+        
+        """
+        Static method to wrap classical information in a message (see 'ClassicalMessage')
+        
+        Arguments:
+            info (str or bytes or numpy.array or ClassicalMessage) = Classical Information
+            session (str) = Session to which the Information belongs (Default: None, i.e., the Session of a given Message is retained)
+            
+        Returned Value:
+            msg (ClassicalMessage) = Message (a given Message of another Session is copied, i.e., the given Message is never modified)
+        """
+        
+        if not isinstance(info,ClassicalMessage):
+            return ClassicalMessage(info,session)
+        if session is not None and session != info.session:
+            # A shallow copy shares the (read-only) payload with the given message
+            info = copy.copy(info)
+            info.session = session
+        return info
     
     def receive_classical_information(self,cch_uid,info):
         
         """
         Instance method to receive classical information from the sender node
         
+        Details:
+            The received message is retained as classical_message and its decoded information (a string, bytes or a read-only NumPy array) as classical_info
+            If an inbox is open for the classical channel and the session of the message (see 'open_inbox'), the message is put into it as well
+        
         Arguments:
             cch_uid (str) = Unique ID of the Classical Channel via which the Information has been transmitted
-            info (str) = Information transmitted via the Classical Channel
+            info (ClassicalMessage or str or bytes or numpy.array) = Information transmitted via the Classical Channel
+        """
+        
+        info = self.make_message(info)
+        # A message in flight is addressed to the receiver at the time of its transmission (the channel may be used in the opposite direction meanwhile)
+        receiver = info.receiver if info.receiver is not None else self.all_components[cch_uid].receiver
+        assert receiver == self,"Can't receive information since you are NOT connected to the channel as a receiver node"
+        self.classical_message = info
+        self.classical_info = info.decode()
+        if (cch_uid,info.session) in self.inboxes:
+            self.inboxes[(cch_uid,info.session)].put(info)
+        
+    def receive_classical_information_batch(self,cch_uid,info_net):
+        
+        """
+        Instance method to receive a list of messages (sent in a single propagation delay) from the sender node
+        
+        Details:
+            The received messages are retained as classical_message_net and their decoded information as classical_info_net, and every message is received as in 'receive_classical_information' (in order)
+        
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel via which the Information has been transmitted
+            info_net (list[ClassicalMessage or str or bytes or numpy.array]) = Information transmitted via the Classical Channel (one Item per Message)
+        """
+        
+        self.classical_message_net = [self.make_message(info) for info in info_net]
+        for msg in self.classical_message_net:
+            self.receive_classical_information(cch_uid,msg)
+        self.classical_info_net = [msg.decode() for msg in self.classical_message_net]
+        
+    def open_inbox(self,cch_uid,session = None):
+        
+        """
+        Instance method to open an inbox for the classical messages (of a session) received via a classical channel
+        
+        Details:
+            The messages are queued in the order of their arrival, i.e., protocols need not be in lockstep and several sessions can share a classical channel without overwriting each other's messages
+            Only the messages received after the inbox has been opened are queued
+        
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            session (str) = Session (Default: None, i.e., the Messages which do not belong to any Session)
+            
+        Returned Value:
+            inbox (simpy.Store) = Inbox
+        """
+        
+        if (cch_uid,session) not in self.inboxes:
+            self.inboxes[(cch_uid,session)] = simpy.Store(self.env)
+        return self.inboxes[(cch_uid,session)]
+    
+    def recv(self,cch_uid,session = None):
+        
+        """
+        Instance method for a blocking receive of the next classical message (of a session) from an inbox (see 'open_inbox')
+        
+        Details:
+            The returned Simpy Event is to be yielded by a Simpy Process, which resumes with the message once it is available
+        
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            session (str) = Session (Default: None)
+            
+        Returned Value:
+            event (simpy.resources.store.StoreGet) = Simpy Event whose Value is the next Message (ClassicalMessage)
         """
         
-        assert self.all_components[cch_uid].receiver == self,"Can't receive information since you are NOT connected to the channel as a receiver node"
-        self.classical_info = info
+        return self.open_inbox(cch_uid,session).get()
+    
+    def recv_nowait(self,cch_uid,session = None):
+        
+        """
+        Instance method for a non-blocking receive of the next classical message (of a session) from an inbox (see 'open_inbox')
+        
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            session (str) = Session (Default: None)
+            
+        Returned Value:
+            msg (ClassicalMessage) = Next Message (None if the Inbox is empty)
+        """
+        
+        inbox = self.open_inbox(cch_uid,session)
+        
+        return inbox.items.pop(0) if len(inbox.items) != 0 else None
         
     def set_key(self,key):
         
@@ -184,6 +323,68 @@ class Node(Component):
         self.key_int = int(key,2)
         self.key_len = len(key)
         
+    def compile_links(self):
+        
+        """
+        Instance method to compile the wired quantum network by fusing every run of consecutive quantum channels (starting at a quantum channel of the node) into one effective quantum channel (see 'FusedQuantumChannel')
+        
+        Details:
+            The sender of a run (and its receiver, which keeps track of its sender(s)) is rewired to the fused quantum channel, i.e., photons bypass the individual quantum channels of the run
+            The individual quantum channels are retained in all_components (e.g., for 'calc_net_transmission_time') and the fused quantum channels are added to it
+            The links must be compiled after all the connections and coupling efficiencies have been set
+            
+        Returned Value:
+            fused_qc_net (list[FusedQuantumChannel]) = Fused Quantum Channels
+        """
+        
+        fused_qc_net = []
+        
+        for comp in list(self.all_components.values()):
+            
+            if (not isinstance(comp,QuantumChannel)) or isinstance(comp,(FusedQuantumChannel,WDMQuantumChannel)):
+                continue
+            
+            sender = getattr(comp,'sender',None)
+            # Only the heads of the runs (which have not been bypassed yet) are considered
+            if isinstance(sender,QuantumChannel) or not ((getattr(sender,'receiver',None) is comp) or (comp in getattr(sender,'receivers',[]))):
+                continue
+            
+            qc_chain = [comp]
+            # A WDM quantum channel (see 'WDMQuantumChannel') ends a run as it has several receivers
+            while isinstance(qc_chain[-1].receiver,QuantumChannel) and not isinstance(qc_chain[-1].receiver,WDMQuantumChannel):
+                qc_chain.append(qc_chain[-1].receiver)
+            
+            if len(qc_chain) < 2:
+                continue
+            
+            fused_qc = FusedQuantumChannel('+'.join([qc.uID for qc in qc_chain]),qc_chain)
+            self.rewire(sender,'receiver',qc_chain[0],fused_qc)
+            self.rewire(qc_chain[-1].receiver,'sender',qc_chain[-1],fused_qc)
+            self.all_components[fused_qc.uID] = fused_qc
+            fused_qc_net.append(fused_qc)
+            
+        return fused_qc_net
+    
+    @staticmethod
+    def rewire(comp,attr,old_comp,new_comp):
+        
+        """
+        Static method to replace a component referenced by another component as its receiver(s) or sender(s)
+        
+        Arguments:
+            comp (Component) = Component holding the Reference
+            attr (str) = Name of the Reference ('receiver' or 'sender'; the plural form is checked as well)
+            old_comp (Component) = Component to be replaced
+            new_comp (Component) = Replacement Component
+        """
+        
+        for name in [attr,attr + 's']:
+            ref = getattr(comp,name,None)
+            if ref is old_comp:
+                setattr(comp,name,new_comp)
+            elif isinstance(ref,list):
+                ref[:] = [new_comp if r is old_comp else r for r in ref]
+            
     def calc_net_transmission_time(self,component_list,lwidth,threshold = 3):
         
         """
@@ -238,16 +439,14 @@ class Node(Component):
         
         for det in self.detectors.values():
             det.clear_measurements()
-            while start_time + max_tr_time > det.next_dark_count_time:
-                det.register_dark_counts()
+            det.register_dark_counts(start_time + max_tr_time)
                 
         potential_false_triggers = {}
                 
         for det_uID,det in self.detectors.items():
-            for i in range(det.dark_count_check_idx,len(det.dark_count_time_instants)):
-                if det.dark_count_time_instants[i] >= start_time + min_tr_time and det.dark_count_time_instants[i] <= start_time + max_tr_time:
-                    potential_false_triggers[det_uID] = det.dark_count_time_instants[i]
-            det.dark_count_check_idx = len(det.dark_count_time_instants) - 1      
+            dark_count_time = det.dark_count_in_window(start_time + min_tr_time,start_time + max_tr_time)
+            if dark_count_time is not None:
+                potential_false_triggers[det_uID] = dark_count_time
        
         potential_false_triggers = dict(sorted(potential_false_triggers.items(),key = lambda i:i[1]))
         
@@ -269,10 +468,14 @@ class Node(Component):
         
         """
         Instance method to compute the total number of photons successfully detected by each of the detectors associated with the Node
+        
+        Details:
+            The dark counts over the whole run are added, i.e., for a detector in the 'window' dark count mode, the dark counts outside the analysis windows are sampled as well (see 'Detector.sample_outside_dark_counts')
         """
         
         for det in self.detectors.values():
-            det.photon_count += len(det.dark_count_time_instants)
+            det.sample_outside_dark_counts()
+            det.photon_count += det.num_of_dark_counts
             
     def bell_state_detection_analysis(self,min_tr_time,max_tr_time,start_time):
         
@@ -316,16 +519,14 @@ class Node(Component):
                     
         for det in self.detectors.values():
             det.clear_measurements()
-            while start_time + max_tr_time > det.next_dark_count_time:
-                det.register_dark_counts()
+            det.register_dark_counts(start_time + max_tr_time)
                 
         potential_false_triggers = {}
                 
         for det_uID,det in self.detectors.items():
-            for i in range(det.dark_count_check_idx,len(det.dark_count_time_instants)):
-                if det.dark_count_time_instants[i] >= start_time + min_tr_time and det.dark_count_time_instants[i] <= start_time + max_tr_time:
-                    potential_false_triggers[det_uID] = det.dark_count_time_instants[i]
-            det.dark_count_check_idx = len(det.dark_count_time_instants) - 1  
+            dark_count_time = det.dark_count_in_window(start_time + min_tr_time,start_time + max_tr_time)
+            if dark_count_time is not None:
+                potential_false_triggers[det_uID] = dark_count_time
             
         potential_false_triggers = sorted(potential_false_triggers.items(),key = lambda i:i[1])
         
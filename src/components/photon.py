@@ -16,6 +16,8 @@ class Photon():
         enc_type (str) = Type of Quantum Information Encoding (see 'photon_enc.py') 
         qs (QuantumState) = Quantum State 
         source_lwidth (float) = Linewidth of the Source that generated the Photon
+        emission_time (float) = Time at which the Photon was emitted by its Source (None if the Photon is not timestamped)
+        time (float) = Time at which the Photon arrives at the Component currently handling it (None if the Photon is not timestamped)
     """
 
     def __init__(self,uID,wl,twidth,enc_type,coeffs,basis):
@@ -37,6 +39,8 @@ class Photon():
         self.twidth = twidth          
         self.enc_type = enc_type       
         self.qs = QuantumState(coeffs,basis) 
+        self.emission_time = None
+        self.time = None
         
     def set_source_linewidth(self,s_lwidth):
         
@@ -59,3 +63,18 @@ class Photon():
         """
         
         self.env = env
+        
+    def set_emission_time(self,t):
+        
+        """
+        Instance method to timestamp a photon with the time at which it was emitted by its source
+        
+        Details:
+            A timestamped photon carries its own (arrival) time through the quantum network, i.e., the components which handle it advance its timestamp instead of a Simpy Environment
+        
+        Arguments:
+            t (float) = Time at which the Photon was emitted by its Source
+        """
+        
+        self.emission_time = t
+        self.time = t
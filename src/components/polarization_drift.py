@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+class PolarizationDrift():
+
+    """
+    Models the slow (time-correlated) Drift of the Polarization in a Fiber as a precomputed Random Walk Trace of Rotation Angles
+
+    Attributes:
+        time_step (float) = Time Step of the Trace (in s)
+        drift_rate (float) = Diffusion Coefficient of the Random Walk (in rad/sqrt(s)), i.e., Standard Deviation of the Change in the Rotation Angle over 1 s
+        times (numpy.array[float] or numpy.memmap) = Simulated Times at which the Rotation Angles of the Trace start to apply
+        angles (numpy.array[float] or numpy.memmap) = Rotation Angles of the Trace
+        duration (float) = Duration of the Trace (the Trace repeats itself beyond it)
+    """
+
+    def __init__(self,duration,time_step,drift_rate,gen,initial_angle = 0,filename = None,block_size = 1 << 20):
+
+        """
+        Constructor for the PolarizationDrift class
+
+        Details:
+            The trace is generated block by block, so that a memory-mapped trace (for long runs) never needs to be held in memory completely
+
+        Arguments:
+            duration (float) = Duration of the Trace (in s)
+            time_step (float) = Time Step of the Trace (in s)
+            drift_rate (float) = Diffusion Coefficient of the Random Walk (in rad/sqrt(s))
+            gen (numpy.random.Generator) = Random Number Generator
+            initial_angle (float) = Rotation Angle at the Start of the Trace (Default: 0)
+            filename (str) = Path Prefix of the '.npy' Files storing the Trace as Memory Maps (Default: None, i.e., the Trace is held in memory)
+            block_size (int) = Number of Time Steps generated at once
+        """
+
+        assert duration > 0 and time_step > 0,"The duration and the time step of the trace must be positive"
+
+        num_of_steps = int(np.ceil(duration/time_step))
+
+        if filename is None:
+            self.times = np.empty(num_of_steps)
+            self.angles = np.empty(num_of_steps)
+        else:
+            self.times = np.lib.format.open_memmap(filename + '_times.npy',mode = 'w+',dtype = np.float64,shape = (num_of_steps,))
+            self.angles = np.lib.format.open_memmap(filename + '_angles.npy',mode = 'w+',dtype = np.float64,shape = (num_of_steps,))
+
+        angle = initial_angle
+        for start in range(0,num_of_steps,block_size):
+            stop = min(start + block_size,num_of_steps)
+            steps = gen.normal(loc = 0,scale = drift_rate*np.sqrt(time_step),size = stop - start)
+            steps[0] = 0 if start == 0 else steps[0]
+            self.angles[start:stop] = angle + np.cumsum(steps)
+            self.times[start:stop] = np.arange(start,stop)*time_step
+            angle = self.angles[stop - 1]
+
+        if filename is not None:
+            self.times.flush()
+            self.angles.flush()
+
+        self.time_step = time_step
+        self.drift_rate = drift_rate
+        self.duration = num_of_steps*time_step
+
+    @classmethod
+    def load(cls,filename):
+
+        """
+        Class method to load a trace stored as memory maps (see the 'filename' argument of the constructor)
+
+        Arguments:
+            filename (str) = Path Prefix of the '.npy' Files storing the Trace
+
+        Returned Value:
+            drift (PolarizationDrift) = Polarization Drift with the Memory-Mapped (Read-Only) Trace
+        """
+
+        drift = cls.__new__(cls)
+        drift.times = np.load(filename + '_times.npy',mmap_mode = 'r')
+        drift.angles = np.load(filename + '_angles.npy',mmap_mode = 'r')
+        drift.time_step = float(drift.times[1] - drift.times[0]) if len(drift.times) > 1 else float('inf')
+        drift.drift_rate = None
+        drift.duration = len(drift.times)*drift.time_step
+        return drift
+
+    def angles_at(self,t):
+
+        """
+        Instance method to look up the rotation angles of the trace at given (arrival) times
+
+        Arguments:
+            t (float or numpy.array[float]) = Simulated Time(s)
+
+        Returned Value:
+            angles (numpy.array[float]) = Rotation Angle(s) at the given Time(s)
+        """
+
+        t = np.mod(np.asarray(t,dtype = float),self.duration)
+        idx = np.searchsorted(self.times,t,side = 'right') - 1
+
+        return np.asarray(self.angles[np.clip(idx,0,len(self.angles) - 1)])
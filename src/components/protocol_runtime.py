@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+
+import simpy
+from ..components.component import Component
+from ..components.classical_channel import ClassicalChannel
+
+class SimEvent():
+
+    """
+    Makes a Simpy Event awaitable from a Protocol Coroutine ('async def'), i.e., the Coroutine resumes (in Simulated Time) once the Event has been processed
+
+    Attributes:
+        event (simpy.Event) = Simpy Event
+    """
+
+    def __init__(self,event):
+
+        """
+        Constructor for the SimEvent class
+
+        Arguments:
+            event (simpy.Event) = Simpy Event
+        """
+
+        self.event = event
+
+    def __await__(self):
+
+        value = yield self.event
+        return value
+
+class PhotonPort(Component):
+
+    """
+    Models a Port at which a Party collects the Photons handed over to it (e.g., by a Quantum Channel in the Event-Driven Operation) as Batches
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        buffer (simpy.Store) = Batches of Photons (one per Input) in the Order of their Arrival
+    """
+
+    def __init__(self,uID,env):
+
+        """
+        Constructor for the PhotonPort class
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+        """
+
+        Component.__init__(self,uID,env)
+        self.buffer = simpy.Store(env)
+
+    def receive(self,p_net):
+
+        """
+        Instance method to receive a batch of photons (lost photons are retained as None)
+
+        Arguments:
+            p_net (list[photon]) = Incoming Photons
+        """
+
+        self.buffer.put(list(p_net))
+
+class Party():
+
+    """
+    Models the Role of a Node in a Protocol as seen by its Protocol Coroutine, i.e., the Interface through which the Coroutine sends and awaits Classical Messages and Photon Batches
+
+    Attributes:
+        runtime (ProtocolRuntime) = Protocol Runtime
+        node (Node) = Node playing the Role
+        env (simpy.Environment) = Simpy Environment for Simulation
+    """
+
+    def __init__(self,runtime,node):
+
+        """
+        Constructor for the Party class
+
+        Arguments:
+            runtime (ProtocolRuntime) = Protocol Runtime
+            node (Node) = Node playing the Role
+        """
+
+        self.runtime = runtime
+        self.node = node
+        self.env = runtime.env
+
+    @property
+    def now(self):
+
+        """
+        Current Simulated Time
+        """
+
+        return self.env.now
+
+    def send(self,cch_uid,info,rec_node,session = None):
+
+        """
+        Instance method to send classical information without waiting for its arrival (see 'Node.send_classical_information')
+
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            info (str or bytes or numpy.array or ClassicalMessage) = Information to be transmitted
+            rec_node (Node) = Receiver Node
+            session (str) = Session to which the Information belongs (Default: None)
+
+        Returned Value:
+            delivery (SimEvent) = Awaitable which completes once the Information has been received
+        """
+
+        return SimEvent(self.node.send_classical_information(cch_uid,info,rec_node,session))
+
+    def send_batch(self,cch_uid,info_net,rec_node,session = None):
+
+        """
+        Instance method to send a list of messages in a single propagation delay without waiting for their arrival (see 'Node.send_classical_information_batch')
+
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            info_net (list[str or bytes or numpy.array or ClassicalMessage]) = Information to be transmitted (one Item per Message)
+            rec_node (Node) = Receiver Node
+            session (str) = Session to which the Information belongs (Default: None)
+
+        Returned Value:
+            delivery (SimEvent) = Awaitable which completes once the Messages have been received
+        """
+
+        return SimEvent(self.node.send_classical_information_batch(cch_uid,info_net,rec_node,session))
+
+    def listen(self,cch_uid,session = None):
+
+        """
+        Instance method to start queueing the classical messages (of a session) received via a classical channel (see 'Node.open_inbox')
+
+        Details:
+            A party must listen before its peer can send to it, since the messages received before the inbox is opened are not queued
+
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            session (str) = Session (Default: None)
+        """
+
+        self.node.open_inbox(cch_uid,session)
+
+    def recv(self,cch_uid,session = None):
+
+        """
+        Instance method to await the next classical message (of a session) received via a classical channel (see 'Node.recv')
+
+        Arguments:
+            cch_uid (str) = Unique ID of the Classical Channel
+            session (str) = Session (Default: None)
+
+        Returned Value:
+            msg (SimEvent) = Awaitable whose Value is the next Message (ClassicalMessage)
+        """
+
+        return SimEvent(self.node.recv(cch_uid,session))
+
+    def recv_photons(self,port):
+
+        """
+        Instance method to await the next batch of photons collected at a photon port
+
+        Arguments:
+            port (PhotonPort) = Photon Port
+
+        Returned Value:
+            p_net (SimEvent) = Awaitable whose Value is the next Batch of Photons (list[photon])
+        """
+
+        return SimEvent(port.buffer.get())
+
+    def sleep(self,delay):
+
+        """
+        Instance method to await the passage of simulated time
+
+        Arguments:
+            delay (float) = Delay
+
+        Returned Value:
+            timeout (SimEvent) = Awaitable which completes after the Delay
+        """
+
+        return SimEvent(self.env.timeout(delay))
+
+    def wait(self,event):
+
+        """
+        Instance method to await any Simpy event (e.g., the Simpy Process of an event-driven source)
+
+        Arguments:
+            event (simpy.Event) = Simpy Event
+
+        Returned Value:
+            event (SimEvent) = Awaitable whose Value is the Value of the Event
+        """
+
+        return SimEvent(event)
+
+class ProtocolRuntime():
+
+    """
+    Runs Protocol Coroutines ('async def', one per Party) as Simpy Processes, i.e., an Event Loop tied to the Simulated Time
+
+    Details:
+        A coroutine awaits the awaitables of its party (see 'Party'), which wrap Simpy events, and is resumed when they have been processed
+        Coroutines must never advance the Simpy Environment synchronously (via 'env.run()'), hence the classical channels of the parties are switched to the event-driven operation while the coroutines run
+        Once the coroutines have completed (see 'run'), the classical channels are switched back to their previous operation (see 'release'), so that synchronous protocols (e.g., 'Cascade.run') may use them again
+
+    Attributes:
+        env (simpy.Environment) = Simpy Environment for Simulation
+        parties (Dict{str:Party}) = Parties, such that, for any Dictionary Item, Key = node.uID and Value = Party
+        modes (Dict{ClassicalChannel:tuple(bool,simpy.Environment)}) = Operation (Event-Driven or not) and Simpy Environment of the Classical Channels of the Parties before the Runtime has switched them (see 'acquire')
+    """
+
+    def __init__(self,env):
+
+        """
+        Constructor for the ProtocolRuntime class
+
+        Arguments:
+            env (simpy.Environment) = Simpy Environment for Simulation
+        """
+
+        self.env = env
+        self.parties = {}
+        self.modes = {}
+
+    def party(self,node):
+
+        """
+        Instance method to get the party of a node (switching its classical channels to the event-driven operation, see 'acquire')
+
+        Arguments:
+            node (Node) = Node
+
+        Returned Value:
+            party (Party) = Party of the Node
+        """
+
+        if node.uID not in self.parties:
+            self.parties[node.uID] = Party(self,node)
+        self.acquire(node)
+
+        return self.parties[node.uID]
+
+    def acquire(self,node):
+
+        """
+        Instance method to switch the classical channels of a node to the event-driven operation (on the Simpy Environment of the runtime), recording their previous operation
+
+        Arguments:
+            node (Node) = Node
+        """
+
+        for comp in node.all_components.values():
+            if isinstance(comp,ClassicalChannel) and comp not in self.modes:
+                self.modes[comp] = (comp.event_driven,comp.env)
+                if not comp.event_driven:
+                    comp.set_environment(self.env)
+                    comp.enable_event_driven()
+
+    def release(self):
+
+        """
+        Instance method to switch the classical channels of the parties back to their previous operation (the channels are switched again by the next 'run')
+
+        Details:
+            The messages still in flight are handed over at their arrival times
+        """
+
+        for comp,(event_driven,env) in self.modes.items():
+            if not event_driven:
+                comp.disable_event_driven()
+                comp.set_environment(env)
+        self.modes = {}
+
+    def spawn(self,coro):
+
+        """
+        Instance method to start a protocol coroutine
+
+        Arguments:
+            coro (coroutine) = Protocol Coroutine (e.g., role(party, ...) for an 'async def role')
+
+        Returned Value:
+            process (simpy.Process) = Simpy Process whose Value is the Value returned by the Coroutine
+        """
+
+        return self.env.process(self.drive(coro))
+
+    def drive(self,coro):
+
+        """
+        Generator method (Simpy process) which steps a coroutine through the Simpy events it awaits
+        """
+
+        value = None
+        exc = None
+        while True:
+            try:
+                event = coro.send(value) if exc is None else coro.throw(exc)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value = yield event
+                exc = None
+            except Exception as e:
+                value = None
+                exc = e
+
+    async def gather(self,*coros):
+
+        """
+        Instance method (Coroutine) to run several coroutines concurrently and await all of them (and any awaitables of the parties)
+
+        Arguments:
+            coros (tuple[coroutine or SimEvent]) = Protocol Coroutines (or Awaitables)
+
+        Returned Value:
+            results (list) = Values returned by the Coroutines (or of the Awaitables)
+        """
+
+        processes = [coro.event if isinstance(coro,SimEvent) else self.spawn(coro) for coro in coros]
+        await SimEvent(self.env.all_of(processes))
+
+        return [process.value for process in processes]
+
+    def run(self,*coros,until = None):
+
+        """
+        Instance method to start coroutines and run the simulation until all of them have completed (or until a given time)
+
+        Details:
+            The classical channels of the parties are switched back to their previous operation (see 'release') once all the coroutines have completed (or one of them has failed)
+
+        Arguments:
+            coros (tuple[coroutine]) = Protocol Coroutines
+            until (float) = Time until which the Simulation is run (Default: None, i.e., until the Coroutines have completed)
+
+        Returned Value:
+            results (list) = Values returned by the Coroutines (None for the Coroutines which have not completed)
+        """
+
+        for party in self.parties.values():
+            self.acquire(party.node)
+
+        processes = [self.spawn(coro) for coro in coros]
+        try:
+            self.env.run(until = self.env.all_of(processes) if until is None else until)
+        except Exception:
+            self.release()
+            raise
+        if all(process.processed for process in processes):
+            self.release()
+
+        return [process.value if process.processed and process.ok else None for process in processes]
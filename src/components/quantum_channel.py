@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
 from ..components.component import Component
+from ..components.quantum_state import QuantumState
 
 class QuantumChannel(Component):
     
@@ -23,6 +25,7 @@ class QuantumChannel(Component):
         set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
         mean_transmission_time (float) = Mean Time taken by a Photon to cross the Length of the Quantum Channel
         trnmt (float) = Transmittance
+        pol_drift (PolarizationDrift) = Polarization Drift Trace by whose Angles every transmitted Photon is rotated (None if the Polarization of a corrupted Photon is rotated by an independent Random Angle instead)
     """
 
     def __init__(self,uID,env,length,alpha,n_core,pol_fidelity,chr_dispersion,depol_prob,set_adaptive_env = False):
@@ -53,6 +56,7 @@ class QuantumChannel(Component):
         c = 3e8
         self.mean_transmission_time = self.length/(c/self.n_core)
         self.trnmt = 10**((-self.alpha*self.length)/10)   
+        self.pol_drift = None
         
     def connect(self,sender,receiver):
         
@@ -89,6 +93,20 @@ class QuantumChannel(Component):
         
         self.env = env
         
+    def set_polarization_drift(self,pol_drift):
+        
+        """
+        Instance method to set the (time-correlated) polarization drift of a quantum channel
+        
+        Details:
+            With a polarization drift, the polarization of every transmitted photon is rotated by the rotation angle of the drift trace at its arrival time, and the polarization fidelity only governs the depolarization of a photon (instead of an independent random rotation or a depolarization)
+        
+        Arguments:
+            pol_drift (PolarizationDrift) = Polarization Drift Trace (None to restore the independent Random Rotations)
+        """
+        
+        self.pol_drift = pol_drift
+        
     def calc_p_twidth(self,lwidth):
         
         """
@@ -98,6 +116,28 @@ class QuantumChannel(Component):
         self.main_source_lwidth = lwidth
         self.p_twidth = self.chr_dispersion*self.main_source_lwidth*self.length 
         
+    def propagate(self,p,transmission_time):
+        
+        """
+        Instance method to account for the time taken by a photon to cross the length of the quantum channel
+        
+        Details:
+            The timestamp of a timestamped photon (see 'Photon.set_emission_time') is advanced by the transmission time
+            With the adaptive environment setting, the Simpy Environment is not advanced for a timestamped photon as the photon carries its own time
+        
+        Arguments:
+            p (photon) = Photon crossing the Quantum Channel
+            transmission_time (float) = Actual Time taken by the Photon to cross the Length of the Quantum Channel
+        """
+        
+        if p.time is not None:
+            p.time += transmission_time
+            if self.set_adaptive_env:
+                return
+        
+        self.env.timeout(transmission_time)
+        self.env.run()
+        
     def receive(self,p_net):
         
         """
@@ -107,50 +147,221 @@ class QuantumChannel(Component):
             p (photon) = Photon emitted by the Source
         """
         
+        if self.event_driven:
+            self.input_port.put(p_net)
+            return
+        
         for idx,p in enumerate(p_net):
             
             self.flag = False
             
             if p is not None:
                 
-                if self.set_adaptive_env:
+                if self.set_adaptive_env and p.time is None:
                     self.set_environment(p.env)
                 
+                coupled,self.flag,transmission_time = self.decide(p)
                 
-                # Calculation of the temporal width of a transmitted photon
-                self.p_twidth_qch = self.chr_dispersion*p.source_lwidth*self.length
-                
-                p.twidth += self.p_twidth_qch
-                
-                # Actual time taken by a photon to cross the length of the quantum channel (considering the effect of chromatic dispersion)
-                transmission_time = self.mean_transmission_time + self.p_twidth_qch*self.gen.standard_normal()
-               
+                if coupled:
+                    self.propagate(p,transmission_time)
                 
-                # Check if the probability of the photon being coupled into the fiber is less than the coupling efficiency and if that is the case, couple it into the fiber
-                if self.gen.random() < self.coupling_eff:
-                    # Check if the probability of the photon being transmitted by the fiber is less than the transmittance and if that is the case, transmit it
-                    if self.gen.random() < self.trnmt:
-                        # Check if the photon uses the polarization encoding scheme of quantum information and if the probability of the photon's polarization remaining unchanged due to noise is less than the polarization fidelity and if that is the case, return it without corrupting it with noise
-                        if (p.enc_type != 'Polarization') or ((p.enc_type == 'Polarization') and (self.gen.random() < self.pol_fidelity)):
-                            self.env.timeout(transmission_time)
-                            self.env.run()
-                            self.flag = True
-                        else:
-                            if self.gen.random() < 0.5:
-                                # Rotate the polarization of the photon before transmitting it
-                                p.qs.rotate_polarization()
-                            else:
-                                # Depolarize the photon before transmitting it
-                                p.qs.depolarize(self.depol_prob)
-                            self.env.timeout(transmission_time)
-                            self.env.run()
-                            self.flag = True
+            if not self.flag:
+                p_net[idx] = None
+        
+        self.receiver.receive(p_net)
+        
+    def decide(self,p):
+        
+        """
+        Instance method to decide whether a photon is coupled into and transmitted by the quantum channel (corrupting its polarization with noise if required), without accounting for the time taken by it
+        
+        Arguments:
+            p (photon) = Photon emitted by the Source
+            
+        Returned Value:
+            coupled (bool) = Boolean indicating whether the Photon has been coupled into the Quantum Channel
+            transmitted (bool) = Boolean indicating whether the Photon has been transmitted by the Quantum Channel
+            transmission_time (float) = Actual Time taken by the Photon to cross the Length of the Quantum Channel
+        """
+        
+        coupled = False
+        transmitted = False
+        
+        # Calculation of the temporal width of a transmitted photon
+        self.p_twidth_qch = self.chr_dispersion*p.source_lwidth*self.length
+        
+        p.twidth += self.p_twidth_qch
+        
+        # Actual time taken by a photon to cross the length of the quantum channel (considering the effect of chromatic dispersion)
+        transmission_time = self.mean_transmission_time + self.p_twidth_qch*self.gen.standard_normal()
+        
+        # Check if the probability of the photon being coupled into the fiber is less than the coupling efficiency and if that is the case, couple it into the fiber
+        if self.gen.random() < self.coupling_eff:
+            coupled = True
+            # Check if the probability of the photon being transmitted by the fiber is less than the transmittance and if that is the case, transmit it
+            if self.gen.random() < self.trnmt:
+                transmitted = True
+                if (p.enc_type == 'Polarization') and (self.pol_drift is not None):
+                    # With a polarization drift, every photon is rotated by the (time-correlated) angle of the drift at its arrival time, and a photon corrupted with noise is depolarized
+                    arrival_time = (p.time if p.time is not None else self.env.now) + transmission_time
+                    QuantumState.rotate_polarization_batch([p.qs],self.pol_drift.angles_at([arrival_time]))
+                    if self.gen.random() >= self.pol_fidelity:
+                        p.qs.depolarize(self.depol_prob)
+                # Check if the photon uses the polarization encoding scheme of quantum information and if the probability of the photon's polarization remaining unchanged due to noise is less than the polarization fidelity and if that is not the case, corrupt it with noise
+                elif not ((p.enc_type != 'Polarization') or ((p.enc_type == 'Polarization') and (self.gen.random() < self.pol_fidelity))):
+                    if self.gen.random() < 0.5:
+                        # Rotate the polarization of the photon before transmitting it
+                        p.qs.rotate_polarization()
                     else:
-                        self.env.timeout(transmission_time)
-                        self.env.run()
-                
-                
-                if not self.flag:
-                    p_net[idx] = None
+                        # Depolarize the photon before transmitting it
+                        p.qs.depolarize(self.depol_prob)
+                        
+        return coupled,transmitted,transmission_time
+        
+    def handle(self,p_net):
+        
+        """
+        Instance method to transmit the photons consumed from the input port of the quantum channel in the event-driven operation (see 'Component.enable_event_driven')
+        
+        Details:
+            Every photon is handed over to the receiver (as a separate input) at its own arrival time, i.e., the photons are in flight concurrently and the Simpy Environment is never advanced synchronously
+            A lost photon is handed over as None (at the time at which it would have arrived)
+        
+        Arguments:
+            p_net (list[photon]) = Photons emitted by the Source
+        """
+        
+        for p in p_net:
+            
+            if p is None:
+                self.schedule(0,self.receiver.receive,[None])
+                continue
+            
+            coupled,transmitted,transmission_time = self.decide(p)
+            
+            if not coupled:
+                self.schedule(0,self.receiver.receive,[None])
+                continue
+            
+            if p.time is not None:
+                p.time += transmission_time
+            
+            self.schedule(transmission_time,self.receiver.receive,[p if transmitted else None])
+        
+    def receive_batch(self,p_net):
+        
+        """
+        Instance method to receive and consequently, transmit a batch of photons emitted by the source (see 'receive') with vectorized decisions
+        
+        Details:
+            The coupling, transmittance, polarization fidelity and noise type decisions (and the transmission times) of all the photons are drawn as arrays, and the polarization of the corrupted photons is rotated or depolarized in one vectorized call (see 'QuantumState.rotate_polarization_batch' and 'QuantumState.depolarize_batch')
+            With a polarization drift, the rotation angles of all the rotated photons are looked up in the drift trace at once (at their arrival times)
+            The photons of a batch cross the quantum channel simultaneously, i.e., every Simpy Environment is advanced (once) by the longest transmission time of the coupled photons relying on it, whereas timestamped photons are advanced by their own transmission times
+        
+        Arguments:
+            p_net (list[photon]) = Photons emitted by the Source
+        """
+        
+        idx_net = [idx for idx,p in enumerate(p_net) if p is not None]
+        photons = [p_net[idx] for idx in idx_net]
+        
+        # Calculation of the temporal widths of the transmitted photons
+        p_twidth_qch_net = self.chr_dispersion*np.array([p.source_lwidth for p in photons],dtype = float)*self.length
+        
+        coupled,transmitted,transmission_time_net = self.decide_batch(photons,p_twidth_qch_net,self.trnmt)
+        self.propagate_batch(photons,coupled,transmission_time_net)
+        
+        for k in np.flatnonzero(~transmitted):
+            p_net[idx_net[k]] = None
+        
+        self.receiver.receive(p_net)
+        
+    def decide_batch(self,photons,p_twidth_qch_net,trnmt,mean_transmission_time = None):
+        
+        """
+        Instance method to decide (in vectorized draws) whether the photons of a batch are coupled into and transmitted by the quantum channel (corrupting their polarization with noise if required), without accounting for the time taken by them
+        
+        Arguments:
+            photons (list[photon]) = Photons emitted by the Source (None excluded)
+            p_twidth_qch_net (numpy.array[float]) = Increases in the Temporal Widths of the Photons due to Chromatic Dispersion
+            trnmt (float or numpy.array[float]) = Transmittance (common to or specific to each of the Photons)
+            mean_transmission_time (float or numpy.array[float]) = Mean Time(s) taken to cross the Length of the Quantum Channel, common to or specific to each of the Photons (Default: None, i.e., mean_transmission_time of the Quantum Channel)
+            
+        Returned Value:
+            coupled (numpy.array[bool]) = Booleans indicating whether the Photons have been coupled into the Quantum Channel
+            transmitted (numpy.array[bool]) = Booleans indicating whether the Photons have been transmitted by the Quantum Channel
+            transmission_time_net (numpy.array[float]) = Actual Times taken by the Photons to cross the Length of the Quantum Channel
+        """
+        
+        n = len(photons)
+        
+        if mean_transmission_time is None:
+            mean_transmission_time = self.mean_transmission_time
+        
+        # Actual times taken by the photons to cross the length of the quantum channel (considering the effect of chromatic dispersion)
+        transmission_time_net = mean_transmission_time + p_twidth_qch_net*self.gen.standard_normal(n)
+        
+        coupled = self.gen.random(n) < self.coupling_eff
+        transmitted = coupled & (self.gen.random(n) < trnmt)
+        is_pol = np.array([p.enc_type == 'Polarization' for p in photons],dtype = bool)
+        corrupted = transmitted & is_pol & (self.gen.random(n) >= self.pol_fidelity)
+        
+        rand_angles = None
+        if self.pol_drift is None:
+            rotated = corrupted & (self.gen.random(n) < 0.5)
+            depolarized = corrupted & ~rotated
+        else:
+            # Every transmitted photon is rotated by the (time-correlated) angle of the drift at its arrival time, and a photon corrupted with noise is depolarized
+            rotated = transmitted & is_pol
+            depolarized = corrupted
+            start_time_net = self.entry_times(photons)
+            rand_angles = self.pol_drift.angles_at((start_time_net + transmission_time_net)[rotated])
+        
+        QuantumState.rotate_polarization_batch([photons[k].qs for k in np.flatnonzero(rotated)],rand_angles)
+        QuantumState.depolarize_batch([photons[k].qs for k in np.flatnonzero(depolarized)],self.depol_prob)
+        
+        for p,p_twidth_qch in zip(photons,p_twidth_qch_net):
+            p.twidth += p_twidth_qch
+        
+        return coupled,transmitted,transmission_time_net
+        
+    def entry_times(self,photons):
+        
+        """
+        Instance method to find the times at which photons enter the quantum channel
+        
+        Arguments:
+            photons (list[photon]) = Photons emitted by the Source (None excluded)
+            
+        Returned Value:
+            entry_time_net (numpy.array[float]) = Timestamps of the (timestamped) Photons or the current Times of the Simpy Environments relied on
+        """
+        
+        return np.array([p.time if p.time is not None else (p.env.now if self.set_adaptive_env else self.env.now) for p in photons],dtype = float)
+        
+    def propagate_batch(self,photons,coupled,transmission_time_net):
+        
+        """
+        Instance method to account for the time taken by the coupled photons of a batch to cross the length of the quantum channel simultaneously (see 'propagate')
+        
+        Arguments:
+            photons (list[photon]) = Photons emitted by the Source (None excluded)
+            coupled (numpy.array[bool]) = Booleans indicating whether the Photons have been coupled into the Quantum Channel
+            transmission_time_net (numpy.array[float]) = Actual Times taken by the Photons to cross the Length of the Quantum Channel
+        """
+        
+        env_advance = {}
+        for k in np.flatnonzero(coupled):
+            p = photons[k]
+            if p.time is not None:
+                p.time += transmission_time_net[k]
+                if self.set_adaptive_env:
+                    continue
+            if self.set_adaptive_env:
+                self.set_environment(p.env)
+            env = self.env
+            env_advance[env] = max(env_advance.get(env,0),transmission_time_net[k])
         
-        self.receiver.receive(p_net)
\ No newline at end of file
+        for env,transmission_time in env_advance.items():
+            env.timeout(transmission_time)
+            env.run()
@@ -6,6 +6,9 @@ import warnings
 from ..utils.photon_enc import encoding
 warnings.filterwarnings('ignore')
 
+# Cache of the basis maps of the quantum states (see 'QuantumState.basis_maps')
+_BASIS_MAPS = {}
+
 class QuantumState():
     
     """
@@ -222,6 +225,139 @@ class QuantumState():
         self.coeffs = self.density_mat_to_ket(depol_dm)
         self.convert_back_to_coeffs_in_original_basis()
 
+    @staticmethod
+    def basis_maps(coeffs_size,basis):
+        
+        """
+        Static method to find the polarization basis of a quantum state and the (linear) maps applied by 'convert_to_coeffs_in_computational_basis' and 'convert_back_to_coeffs_in_original_basis' to its coefficients
+        
+        Details:
+            The maps are found by converting the unit vectors and are cached for every basis
+        
+        Arguments:
+            coeffs_size (int) = Number of Coefficients (2 or 4)
+            basis (numpy.array(list[list[complex]])) = Basis
+            
+        Returned Value:
+            basis_idx (int) = Index of the Polarization Basis (see 'photon_enc.py') [-1 if it is not a Polarization Basis]
+            M_to (numpy.array[complex]) = Map to the Coefficients in the Computational Basis
+            M_back (numpy.array[complex]) = Map back to the Coefficients in the Original Basis
+        """
+        
+        basis = np.asarray(basis)
+        key = (coeffs_size,basis.shape,basis.tobytes())
+        
+        if key not in _BASIS_MAPS:
+            
+            basis_idx = -1
+            for k,b in enumerate(encoding['Polarization']):
+                if coeffs_size == 4:
+                    b = np.array([np.kron(b[0],b[0]),np.kron(b[0],b[1]),np.kron(b[1],b[0]),np.kron(b[1],b[1])])
+                if np.allclose(basis,b) and basis.shape == b.shape:
+                    basis_idx = k
+                    break
+            
+            M_to = np.empty((coeffs_size,coeffs_size),dtype = complex)
+            M_back = np.empty((coeffs_size,coeffs_size),dtype = complex)
+            for k,e in enumerate(np.eye(coeffs_size,dtype = complex)):
+                probe = QuantumState(e,basis)
+                probe.convert_to_coeffs_in_computational_basis()
+                M_to[:,k] = np.ravel(probe.coeffs)
+                probe = QuantumState(e,basis)
+                probe.convert_back_to_coeffs_in_original_basis()
+                M_back[:,k] = np.ravel(probe.coeffs)
+            
+            _BASIS_MAPS[key] = (basis_idx,M_to,M_back)
+            
+        return _BASIS_MAPS[key]
+    
+    @staticmethod
+    def group_by_basis(qs_net):
+        
+        """
+        Static method to group quantum states by their number of coefficients and basis
+        
+        Arguments:
+            qs_net (list[QuantumState]) = Quantum States
+            
+        Returned Value:
+            groups (dict) = Indices of the Quantum States (in qs_net) keyed by their Number of Coefficients and Basis
+        """
+        
+        groups = {}
+        for i,qs in enumerate(qs_net):
+            basis = np.asarray(qs.basis)
+            groups.setdefault((qs.coeffs.size,basis.shape,basis.tobytes()),[]).append(i)
+        return groups
+    
+    @staticmethod
+    def rotate_polarization_batch(qs_net,rand_angles = None):
+        
+        """
+        Static method to rotate the polarization-based quantum states of a batch of photons (see 'rotate_polarization') with one vectorized matrix product per basis
+        
+        Arguments:
+            qs_net (list[QuantumState]) = Quantum States
+            rand_angles (numpy.array[float]) = Angles of Rotation (Default: None, i.e., drawn uniformly from [0,2*pi) as in 'rotate_polarization')
+        """
+        
+        if len(qs_net) == 0:
+            return
+        
+        if rand_angles is None:
+            rand_angles = np.random.rand(len(qs_net))*2*np.pi
+        
+        for idx in QuantumState.group_by_basis(qs_net).values():
+            
+            coeffs_size = qs_net[idx[0]].coeffs.size
+            basis_idx,M_to,M_back = QuantumState.basis_maps(coeffs_size,qs_net[idx[0]].basis)
+            assert basis_idx != -1,'The polarization of a quantum state can only be rotated in a polarization basis!'
+            
+            half_angles = 0.5*np.asarray(rand_angles)[idx]
+            cos = np.cos(half_angles).astype(complex)
+            sin = np.sin(half_angles).astype(complex)
+            zero = np.zeros(len(idx),dtype = complex)
+            if basis_idx == 0:
+                R = np.array([[np.exp(-1j*half_angles),zero],[zero,np.exp(1j*half_angles)]])
+            elif basis_idx == 1:
+                R = np.array([[cos,-1j*sin],[-1j*sin,cos]])
+            else:
+                R = np.array([[cos,-1*sin],[sin,cos]])
+            R = np.moveaxis(R,2,0)
+            if coeffs_size == 4:
+                R = np.einsum('nij,nkl->nikjl',R,R).reshape(len(idx),4,4)
+            
+            coeffs_net = np.stack([qs_net[i].coeffs for i in idx]).astype(complex)
+            coeffs_net = np.matmul(M_back,np.matmul(R,np.matmul(M_to,coeffs_net)))
+            for i,coeffs in zip(idx,coeffs_net):
+                qs_net[i].coeffs = coeffs
+    
+    @staticmethod
+    def depolarize_batch(qs_net,prob):
+        
+        """
+        Static method to add depolarization (non-dissipative) noise to the quantum states of a batch of photons (see 'depolarize') with one vectorized eigendecomposition per basis
+        
+        Arguments:
+            qs_net (list[QuantumState]) = Quantum States
+            prob (float) = Probability of suffering Depolarization
+        """
+        
+        for idx in QuantumState.group_by_basis(qs_net).values():
+            
+            coeffs_size = qs_net[idx[0]].coeffs.size
+            basis_idx,M_to,M_back = QuantumState.basis_maps(coeffs_size,qs_net[idx[0]].basis)
+            
+            kets = np.matmul(M_to,np.stack([qs_net[i].coeffs for i in idx]).astype(complex))
+            dmat_net = np.matmul(kets,np.conj(np.swapaxes(kets,1,2)))
+            depol_dm_net = (prob/coeffs_size)*np.eye(coeffs_size) + (1 - prob)*dmat_net
+            
+            egval_net,egvec_net = np.linalg.eig(depol_dm_net)
+            egvec_with_max_egval_net = np.take_along_axis(egvec_net,np.argmax(egval_net,axis = 1)[:,None,None],axis = 2)
+            coeffs_net = np.matmul(M_back,egvec_with_max_egval_net)
+            for i,coeffs in zip(idx,coeffs_net):
+                qs_net[i].coeffs = coeffs
+
     def dampen_amplitude(self,gamma):
 
         """
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+import os
+import numpy as np
+
+"""
+File Format (Little Endian, without any Header):
+    A Sequence of packed 10 Byte Records, one per Time Tag, in non-decreasing Order of the Timestamps (Tags with equal Timestamps in the Order in which they have been emitted)
+    time (int64) = Timestamp of the Click (in ps)
+    channel (uint16) = Channel of the Detector which has clicked
+"""
+
+TAG_DTYPE = np.dtype([('time','<i8'),('channel','<u2')])
+
+class TimeTagger():
+
+    """
+    Collects the Clicks of Detectors as compact Time Tags (int64 Timestamp in ps, uint16 Channel) in a shared Buffer, which is flushed to a Memory-Mapped Binary File (see the File Format above)
+
+    Attributes:
+        filename (str) = Path of the Binary File (None if the Tags are only kept in Memory)
+        buffer (numpy.array[TAG_DTYPE]) = Buffer of the Tags which have not been flushed yet
+        num_of_buffered_tags (int) = Number of Tags in the Buffer
+        num_of_tags (int) = Total Number of Tags (flushed or buffered)
+        num_of_flushed_tags (int) = Number of Tags flushed to the File
+        capacity (int) = Current Size of the (preallocated) File (in Tags)
+        tags (numpy.memmap[TAG_DTYPE]) = Memory-Mapped File (None until the first Flush)
+        ordered (bool) = True if the flushed Tags are in non-decreasing Order of the Timestamps; False otherwise
+    """
+
+    def __init__(self,filename = None,buffer_size = 1 << 16):
+
+        """
+        Constructor for the TimeTagger class
+
+        Details:
+            With a file, the buffer is flushed whenever it is full, and the file is preallocated, memory-mapped and doubled in size whenever the flushed tags do not fit into it (the unused tail is truncated on closing the time tagger)
+            The tags need not be emitted in the order of their timestamps (e.g., by several detectors sharing the time tagger), since the buffer is sorted before every flush and the file is sorted (once) when its tags are read or the time tagger is closed, if a flushed buffer started before the end of the previous one
+            Without a file, the buffer is doubled in size whenever it is full
+
+        Arguments:
+            filename (str) = Path of the Binary File (Default: None, i.e., the Tags are only kept in Memory)
+            buffer_size (int) = Size of the Buffer (in Tags)
+        """
+
+        assert buffer_size > 0,"The size of the buffer of the time tagger must be positive"
+
+        self.filename = filename
+        self.buffer = np.empty(buffer_size,dtype = TAG_DTYPE)
+        self.num_of_buffered_tags = 0
+        self.num_of_flushed_tags = 0
+        self.capacity = 0
+        self.tags = None
+        self.ordered = True
+
+        if filename is not None:
+            open(filename,'wb').close()
+
+    @property
+    def num_of_tags(self):
+
+        """
+        Total Number of Tags (flushed or buffered)
+        """
+
+        return self.num_of_flushed_tags + self.num_of_buffered_tags
+
+    @staticmethod
+    def to_picoseconds(t):
+
+        """
+        Static method to convert (simulated) times to integer timestamps
+
+        Arguments:
+            t (float or numpy.array[float]) = Time(s) (in s)
+
+        Returned Value:
+            t_ps (numpy.array[numpy.int64]) = Timestamp(s) (in ps)
+        """
+
+        return np.rint(np.asarray(t,dtype = float)*1e12).astype(np.int64)
+
+    def tag(self,t,channel):
+
+        """
+        Instance method to record a click
+
+        Arguments:
+            t (float) = Time of the Click (in s)
+            channel (int) = Channel of the Detector
+        """
+
+        if self.num_of_buffered_tags == len(self.buffer):
+            self.make_room(1)
+
+        self.buffer[self.num_of_buffered_tags] = (int(round(t*1e12)),channel)
+        self.num_of_buffered_tags += 1
+
+    def tag_batch(self,t_net,channel):
+
+        """
+        Instance method to record clicks in vectorized form
+
+        Arguments:
+            t_net (numpy.array[float]) = Times of the Clicks (in s)
+            channel (int or numpy.array[int]) = Channel(s) of the Detector(s)
+        """
+
+        t_ps = np.atleast_1d(self.to_picoseconds(t_net))
+        channels = np.broadcast_to(np.asarray(channel,dtype = np.uint16),t_ps.shape)
+
+        start = 0
+        while start < len(t_ps):
+            if self.num_of_buffered_tags == len(self.buffer):
+                self.make_room(len(t_ps) - start)
+            n = min(len(t_ps) - start,len(self.buffer) - self.num_of_buffered_tags)
+            block = self.buffer[self.num_of_buffered_tags:self.num_of_buffered_tags + n]
+            block['time'] = t_ps[start:start + n]
+            block['channel'] = channels[start:start + n]
+            self.num_of_buffered_tags += n
+            start += n
+
+    def make_room(self,num_of_tags):
+
+        """
+        Instance method to make room in a full buffer, i.e., to flush it to the file (or to double its size, if the tags are only kept in memory)
+
+        Arguments:
+            num_of_tags (int) = Number of Tags to be recorded
+        """
+
+        if self.filename is not None:
+            self.flush()
+        else:
+            buffer = np.empty(max(2*len(self.buffer),self.num_of_buffered_tags + num_of_tags),dtype = TAG_DTYPE)
+            buffer[:self.num_of_buffered_tags] = self.buffer[:self.num_of_buffered_tags]
+            self.buffer = buffer
+
+    @staticmethod
+    def sort_tags(tags):
+
+        """
+        Static method to sort time tags (in place) by their timestamps, retaining the order of the tags with equal timestamps
+
+        Arguments:
+            tags (numpy.array[TAG_DTYPE]) = Time Tags
+        """
+
+        times = tags['time']
+        if len(times) > 1 and np.any(times[1:] < times[:-1]):
+            tags[:] = tags[np.argsort(times,kind = 'stable')]
+
+    def flush(self):
+
+        """
+        Instance method to sort the buffered tags and flush them to the memory-mapped file
+        """
+
+        if self.filename is None or self.num_of_buffered_tags == 0:
+            return
+
+        self.sort_tags(self.buffer[:self.num_of_buffered_tags])
+        if self.num_of_flushed_tags != 0 and self.buffer['time'][0] < self.tags['time'][self.num_of_flushed_tags - 1]:
+            self.ordered = False
+
+        needed = self.num_of_flushed_tags + self.num_of_buffered_tags
+        if needed > self.capacity:
+            self.capacity = max(2*self.capacity,needed,len(self.buffer))
+            with open(self.filename,'r+b') as f:
+                f.truncate(self.capacity*TAG_DTYPE.itemsize)
+            self.tags = np.memmap(self.filename,dtype = TAG_DTYPE,mode = 'r+',shape = (self.capacity,))
+
+        self.tags[self.num_of_flushed_tags:needed] = self.buffer[:self.num_of_buffered_tags]
+        self.tags.flush()
+        self.num_of_flushed_tags = needed
+        self.num_of_buffered_tags = 0
+
+    def get_tags(self):
+
+        """
+        Instance method to get all the recorded tags
+
+        Returned Value:
+            tags (numpy.array[TAG_DTYPE]) = Time Tags in non-decreasing Order of the Timestamps (a View of the Buffer, or of the File once the Buffer has been flushed)
+        """
+
+        if self.filename is None:
+            self.sort_tags(self.buffer[:self.num_of_buffered_tags])
+            return self.buffer[:self.num_of_buffered_tags]
+
+        self.flush()
+        if self.tags is None:
+            return np.empty(0,dtype = TAG_DTYPE)
+        if not self.ordered:
+            self.sort_file()
+
+        return self.tags[:self.num_of_flushed_tags]
+
+    def sort_file(self):
+
+        """
+        Instance method to sort the flushed tags (in place) by their timestamps
+
+        Details:
+            Sorting the file loads its tags into memory, which is only needed if they have been emitted out of order across flushes
+        """
+
+        self.sort_tags(self.tags[:self.num_of_flushed_tags])
+        self.tags.flush()
+        self.ordered = True
+
+    def close(self):
+
+        """
+        Instance method to flush and close the time tagger (truncating the unused tail of the file)
+        """
+
+        if self.filename is None:
+            return
+
+        self.flush()
+        if not self.ordered:
+            self.sort_file()
+        self.tags = None
+        with open(self.filename,'r+b') as f:
+            f.truncate(self.num_of_flushed_tags*TAG_DTYPE.itemsize)
+
+    @staticmethod
+    def load(filename):
+
+        """
+        Static method to read the time tags stored in a file without loading them into memory
+
+        Arguments:
+            filename (str) = Path of the Binary File
+
+        Returned Value:
+            tags (numpy.memmap[TAG_DTYPE]) = Memory-Mapped (Read-Only) Time Tags
+        """
+
+        if os.path.getsize(filename) == 0:
+            return np.empty(0,dtype = TAG_DTYPE)
+
+        return np.memmap(filename,dtype = TAG_DTYPE,mode = 'r')
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+import mmap
+import os
+import struct
+import numpy as np
+from ..components.classical_message import ClassicalMessage
+
+"""
+Frame Layout (Little Endian):
+    frame_len (uint32) = Length of the Frame (in Bytes, including this Field)
+    time (float64) = Time at which the Message has been transmitted
+    kind (uint8) = Type of the Payload (0: 'str', 1: 'bytes', 2: 'array')
+    ndim (uint8) = Number of Dimensions of an Array Payload
+    sender_len, receiver_len, session_len, dtype_len (uint16) = Lengths of the UTF-8 encoded Fields which follow
+    payload_len (uint32) = Length of the Payload (in Bytes)
+    sender, receiver, session, dtype (bytes) = uIDs of the Sender and the Receiver, Session and Data Type (of an Array Payload)
+    shape (uint64 x ndim) = Shape of an Array Payload
+    payload (bytes) = Payload
+"""
+
+FRAME_HEADER = struct.Struct('<IdBBHHHHI')
+KINDS = ['str','bytes','array']
+
+class TrafficRecorder():
+
+    """
+    Records the Classical Messages exchanged over Classical Channels as Length-Prefixed Binary Frames in an Append-Only Memory-Mapped Log File (with an Index File of the Offsets of the Frames)
+
+    Attributes:
+        filename (str) = Path Prefix of the Log ('.log') and Index ('.idx') Files
+        flush_interval (int) = Number of Messages after which the Log and the Index are flushed to the Disk
+        num_of_messages (int) = Number of recorded Messages
+        size (int) = Number of Bytes written to the Log File
+        capacity (int) = Current Size of the (preallocated) Log File
+    """
+
+    def __init__(self,filename,capacity = 1 << 24,flush_interval = 4096):
+
+        """
+        Constructor for the TrafficRecorder class
+
+        Details:
+            The log file is preallocated and memory-mapped, and its size is doubled whenever a frame does not fit into it (the unused tail is truncated on closing the recorder)
+            The offsets of the frames are buffered and appended to the index file at every flush
+
+        Arguments:
+            filename (str) = Path Prefix of the Log ('.log') and Index ('.idx') Files
+            capacity (int) = Initial Size of the Log File (in Bytes)
+            flush_interval (int) = Number of Messages after which the Log and the Index are flushed to the Disk
+        """
+
+        assert capacity > 0 and flush_interval > 0,"The capacity and the flush interval of the recorder must be positive"
+
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.num_of_messages = 0
+        self.size = 0
+        self.capacity = capacity
+        self.pending_offsets = []
+
+        self.log_file = open(filename + '.log','w+b')
+        self.log_file.truncate(self.capacity)
+        self.log = mmap.mmap(self.log_file.fileno(),self.capacity)
+        self.idx_file = open(filename + '.idx','wb')
+
+    def record(self,time,msg):
+
+        """
+        Instance method to append a message to the log
+
+        Arguments:
+            time (float) = Time at which the Message has been transmitted
+            msg (ClassicalMessage) = Message
+        """
+
+        sender = getattr(msg.sender,'uID','').encode('utf-8')
+        receiver = getattr(msg.receiver,'uID','').encode('utf-8')
+        session = ('' if msg.session is None else str(msg.session)).encode('utf-8')
+        dtype = b'' if msg.dtype is None else msg.dtype.str.encode('utf-8')
+        shape = b'' if msg.shape is None else np.array(msg.shape,dtype = '<u8').tobytes()
+        ndim = 0 if msg.shape is None else len(msg.shape)
+
+        frame_len = FRAME_HEADER.size + len(sender) + len(receiver) + len(session) + len(dtype) + len(shape) + msg.nbytes
+
+        if self.size + frame_len > self.capacity:
+            self.grow(self.size + frame_len)
+
+        offset = self.size
+        FRAME_HEADER.pack_into(self.log,offset,frame_len,time,KINDS.index(msg.kind),ndim,len(sender),len(receiver),len(session),len(dtype),msg.nbytes)
+        pos = offset + FRAME_HEADER.size
+        for field in [sender,receiver,session,dtype,shape,msg.payload]:
+            field_len = field.nbytes if isinstance(field,memoryview) else len(field)
+            self.log[pos:pos + field_len] = field
+            pos += field_len
+
+        self.size += frame_len
+        self.num_of_messages += 1
+        self.pending_offsets.append(offset)
+
+        if len(self.pending_offsets) >= self.flush_interval:
+            self.flush()
+
+    def grow(self,min_capacity):
+
+        """
+        Instance method to (at least) double the size of the log file and remap it
+
+        Arguments:
+            min_capacity (int) = Minimum required Size of the Log File (in Bytes)
+        """
+
+        self.log.flush()
+        self.log.close()
+        while self.capacity < min_capacity:
+            self.capacity *= 2
+        self.log_file.truncate(self.capacity)
+        self.log = mmap.mmap(self.log_file.fileno(),self.capacity)
+
+    def flush(self):
+
+        """
+        Instance method to flush the log and append the buffered offsets to the index file
+        """
+
+        self.log.flush()
+        if len(self.pending_offsets) != 0:
+            self.idx_file.write(np.array(self.pending_offsets,dtype = '<i8').tobytes())
+            self.pending_offsets = []
+        self.idx_file.flush()
+
+    def close(self):
+
+        """
+        Instance method to flush and close the recorder (truncating the unused tail of the log file)
+        """
+
+        self.flush()
+        self.log.close()
+        self.log_file.truncate(self.size)
+        self.log_file.close()
+        self.idx_file.close()
+
+class TrafficReader():
+
+    """
+    Reads a Log of Classical Messages written by a TrafficRecorder without loading it into Memory
+
+    Attributes:
+        filename (str) = Path Prefix of the Log ('.log') and Index ('.idx') Files
+        log (mmap.mmap) = Memory-Mapped (Read-Only) Log
+        offsets (numpy.memmap) = Memory-Mapped Index, i.e., Offsets of the Frames in the Log
+    """
+
+    def __init__(self,filename):
+
+        """
+        Constructor for the TrafficReader class
+
+        Arguments:
+            filename (str) = Path Prefix of the Log ('.log') and Index ('.idx') Files
+        """
+
+        self.filename = filename
+        self.log_file = open(filename + '.log','rb')
+        size = os.fstat(self.log_file.fileno()).st_size
+        self.log = mmap.mmap(self.log_file.fileno(),size,access = mmap.ACCESS_READ) if size > 0 else b''
+        idx_size = os.path.getsize(filename + '.idx')
+        self.offsets = np.memmap(filename + '.idx',dtype = '<i8',mode = 'r') if idx_size > 0 else np.array([],dtype = '<i8')
+
+    def __len__(self):
+
+        """
+        Instance method to get the number of (indexed) messages in the log
+        """
+
+        return len(self.offsets)
+
+    def __getitem__(self,k):
+
+        """
+        Instance method for random access to a message by its number (via the index)
+
+        Arguments:
+            k (int) = Message Number
+
+        Returned Value:
+            record (tuple) = Time of Transmission (float), Sender uID (str), Receiver uID (str) and Message (ClassicalMessage)
+        """
+
+        return self.read_frame(int(self.offsets[k]))[0]
+
+    def __iter__(self):
+
+        """
+        Generator method for iterating over the messages in the order of their recording (by scanning the frames, i.e., without the index)
+
+        Yielded Value:
+            record (tuple) = Time of Transmission (float), Sender uID (str), Receiver uID (str) and Message (ClassicalMessage)
+        """
+
+        offset = 0
+        while offset + FRAME_HEADER.size <= len(self.log):
+            record,frame_len = self.read_frame(offset)
+            if frame_len == 0:
+                return
+            yield record
+            offset += frame_len
+
+    def read_frame(self,offset):
+
+        """
+        Instance method to decode the frame at an offset of the log
+
+        Details:
+            The payload of an array message is a (zero-copy) view of the memory-mapped log
+
+        Arguments:
+            offset (int) = Offset of the Frame
+
+        Returned Value:
+            record (tuple) = Time of Transmission (float), Sender uID (str), Receiver uID (str) and Message (ClassicalMessage)
+            frame_len (int) = Length of the Frame (0 at the End of the Log)
+        """
+
+        frame_len,time,kind,ndim,sender_len,receiver_len,session_len,dtype_len,payload_len = FRAME_HEADER.unpack_from(self.log,offset)
+        if frame_len == 0:
+            return None,0
+
+        view = memoryview(self.log)
+        pos = offset + FRAME_HEADER.size
+        fields = []
+        for field_len in [sender_len,receiver_len,session_len,dtype_len]:
+            fields.append(str(view[pos:pos + field_len],'utf-8'))
+            pos += field_len
+        sender,receiver,session,dtype = fields
+        shape = tuple(int(n) for n in np.frombuffer(view[pos:pos + 8*ndim],dtype = '<u8'))
+        pos += 8*ndim
+        payload = view[pos:pos + payload_len]
+
+        if KINDS[kind] == 'str':
+            info = str(payload,'utf-8')
+        elif KINDS[kind] == 'bytes':
+            info = payload.tobytes()
+        else:
+            info = np.frombuffer(payload,dtype = np.dtype(dtype)).reshape(shape)
+
+        return (time,sender,receiver,ClassicalMessage(info,session if session != '' else None)),frame_len
+
+    def close(self):
+
+        """
+        Instance method to close the reader
+
+        Details:
+            If (array) messages read from the log are still alive, the memory map is closed once the last of them has been released
+        """
+
+        if isinstance(self.log,mmap.mmap):
+            try:
+                self.log.close()
+            except BufferError:
+                pass
+        self.log_file.close()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from ..components.quantum_channel import QuantumChannel
+
+class WDMQuantumChannel(QuantumChannel):
+
+    """
+    Models a Wavelength-Division Multiplexed (WDM) Quantum Channel (Fiber carrying several Wavelength Channels, each demultiplexed to its own Receiver)
+
+    Attributes:
+        uID (str) = Unique ID
+        env (simpy.Environment) = Simpy Environment for Simulation
+        gen (numpy.random.Generator) = Random Number Generator
+        length (float) = Length (in m)
+        wl_channels (numpy.array[float]) = Centre Wavelengths of the Wavelength Channels (in ascending order)
+        alpha (numpy.array[float]) = Attenuation Coefficients of the Wavelength Channels (in dB/m)
+        n_core (float) = Refractive Index of the Core
+        pol_fidelity (float) = Polarization Fidelity (Probability of not undergoing Depolarization)
+        chr_dispersion (numpy.array[float]) = Chromatic Dispersions of the Wavelength Channels (in s/m-m)
+        depol_prob (float) = Probability of suffering Depolarization
+        crosstalk (numpy.array[list[float]]) = Crosstalk Coefficients, i.e., Probability of a transmitted Photon of a Wavelength Channel (Row) leaking into another Wavelength Channel (Column)
+        sender (Laser or Weaklaser or EntangledPhotonsSourceSPDC or list) = Sender(s) of Photons encoded with Quantum Information
+        receivers (list[NonPolarizingBeamSplitter or PolarizingBeamSplitter or Mirror or WavePlate or Detector]) = Receivers of the transmitted Photons (one per Wavelength Channel)
+        receiver (None) = Placeholder for the single Receiver of a Quantum Channel (the Photons are handed over to the Receivers instead)
+        coupling_eff (float) = Coupling Efficiency of the Source(s) with the Quantum Channel
+        set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+        mean_transmission_time (float) = Mean Time taken by a Photon to cross the Length of the Quantum Channel
+        trnmt (numpy.array[float]) = Transmittances of the Wavelength Channels
+        band_edges (numpy.array[float]) = Boundaries of the Passbands of the Wavelength Channels used for Demultiplexing (the outer Boundaries lie half a Channel Spacing beyond the outermost Centre Wavelengths)
+        channel_counts (numpy.array[int]) = Number of Photons handed over to each of the Receivers
+    """
+
+    def __init__(self,uID,env,length,wl_channels,alpha,n_core,pol_fidelity,chr_dispersion,depol_prob,crosstalk = None,set_adaptive_env = False):
+
+        """
+        Constructor for the WDMQuantumChannel class
+
+        Arguments:
+            uID (str) = Unique ID
+            env (simpy.Environment) = Simpy Environment for Simulation
+            length (float) = Length (in m)
+            wl_channels (list[float]) = Centre Wavelengths of the Wavelength Channels (in ascending order)
+            alpha (float or list[float]) = Attenuation Coefficient(s) (in dB/m), common to or specific to each of the Wavelength Channels
+            n_core (float) = Refractive Index of the Core
+            pol_fidelity (float) = Polarization Fidelity (Probability of not undergoing Depolarization)
+            chr_dispersion (float or list[float]) = Chromatic Dispersion(s) (in s/m-m), common to or specific to each of the Wavelength Channels
+            depol_prob (float) = Probability of suffering Depolarization
+            crosstalk (list[list[float]]) = Crosstalk Coefficients (Default: None, i.e., no Crosstalk); the Diagonal is ignored
+            set_adaptive_env (bool) = Boolean to control the Adaptive Environment Setting
+        """
+
+        wl_channels = np.asarray(wl_channels,dtype = float)
+        num_of_channels = len(wl_channels)
+
+        assert num_of_channels >= 1,"At least 1 wavelength channel is required"
+        assert np.all(np.diff(wl_channels) > 0),"The centre wavelengths of the wavelength channels must be in ascending order"
+
+        QuantumChannel.__init__(self,uID,env,length,np.broadcast_to(np.asarray(alpha,dtype = float),(num_of_channels,)).copy(),n_core,pol_fidelity,np.broadcast_to(np.asarray(chr_dispersion,dtype = float),(num_of_channels,)).copy(),depol_prob,set_adaptive_env)
+
+        self.wl_channels = wl_channels
+        if num_of_channels == 1:
+            # A single wavelength channel has no channel spacing, hence its passband is unbounded
+            self.band_edges = np.array([-np.inf,np.inf])
+        else:
+            inner_edges = (wl_channels[:-1] + wl_channels[1:])/2
+            self.band_edges = np.concatenate(([2*wl_channels[0] - inner_edges[0]],inner_edges,[2*wl_channels[-1] - inner_edges[-1]]))
+
+        crosstalk = np.zeros((num_of_channels,num_of_channels)) if crosstalk is None else np.array(crosstalk,dtype = float)
+        assert crosstalk.shape == (num_of_channels,num_of_channels),"The crosstalk coefficients must form a square matrix with a row (and column) per wavelength channel"
+        np.fill_diagonal(crosstalk,0)
+        assert np.all(crosstalk >= 0) and np.all(crosstalk.sum(axis = 1) <= 1),"The crosstalk coefficients of a wavelength channel must be probabilities adding up to at most 1"
+        self.crosstalk = crosstalk
+
+        # Cumulative probabilities of a photon of a wavelength channel (row) ending up in each of the wavelength channels (column)
+        routing = crosstalk + np.diag(1 - crosstalk.sum(axis = 1))
+        self.cum_routing = np.cumsum(routing,axis = 1)
+
+        self.receiver = None
+        self.receivers = []
+        self.channel_counts = np.zeros(num_of_channels,dtype = int)
+
+    def connect(self,sender,receivers):
+
+        """
+        Instance method to connect a WDM quantum channel with its source(s) and destinations
+
+        Arguments:
+            sender (Laser or Weaklaser or EntangledPhotonsSourceSPDC or list) = Sender(s) of Photons encoded with Quantum Information
+            receivers (list[NonPolarizingBeamSplitter or PolarizingBeamSplitter or Mirror or WavePlate or Detector]) = Receivers of the transmitted Photons (one per Wavelength Channel, in the order of the Centre Wavelengths)
+        """
+
+        assert len(receivers) == len(self.wl_channels),"A WDM quantum channel requires one receiver per wavelength channel"
+
+        self.sender = sender
+        self.receivers = list(receivers)
+
+    def calc_p_twidth(self,lwidth):
+
+        """
+        Instance method to compute the temporal widths of the photons passing through the wavelength channels
+
+        Arguments:
+            lwidth (float or list[float]) = Linewidth(s) of the Source(s) (common to or specific to each of the Wavelength Channels)
+        """
+
+        self.main_source_lwidth = np.asarray(lwidth,dtype = float)
+        self.p_twidth = self.chr_dispersion*self.main_source_lwidth*self.length
+
+    def demultiplex(self,wl_net):
+
+        """
+        Instance method to bin photons into the wavelength channels by their wavelengths (in one vectorized step)
+
+        Arguments:
+            wl_net (list[float] or numpy.array[float]) = Wavelengths of the Photons
+
+        Returned Value:
+            channels (numpy.array[int]) = Wavelength Channels of the Photons (the Photons are assigned to the Channel with the nearest Centre Wavelength, and the Photons outside every Passband to -1)
+        """
+
+        wl_net = np.asarray(wl_net,dtype = float)
+        channels = np.searchsorted(self.band_edges[1:-1],wl_net)
+        channels[(wl_net < self.band_edges[0]) | (wl_net > self.band_edges[-1])] = -1
+
+        return channels
+
+    def receive(self,p_net):
+
+        """
+        Instance method to receive a batch of photons, transmit them through their wavelength channels with vectorized decisions and hand them over to the receivers of their (output) wavelength channels
+
+        Details:
+            The attenuation and the dispersion (chr_dispersion*source_lwidth*length) of every photon are those of its wavelength channel, and the remaining decisions are drawn as in 'QuantumChannel.receive_batch'
+            A transmitted photon leaks into another wavelength channel (retaining its wavelength) with the probability given by the crosstalk coefficients
+            A photon outside every passband is dropped, i.e., it is not handed over to any receiver
+            Every receiver receives (as one input) the photons of its wavelength channel in their order of emission, with a lost photon handed over as None, whereas an empty input (None) is handed over to every receiver
+
+        Arguments:
+            p_net (list[photon]) = Photons emitted by the Source(s)
+        """
+
+        idx_net = [idx for idx,p in enumerate(p_net) if p is not None]
+        photons = [p_net[idx] for idx in idx_net]
+        n = len(photons)
+
+        channels = self.demultiplex([p.wl for p in photons])
+        dropped = channels == -1
+        # The out-of-band photons are assigned to the 1st wavelength channel only to index the arrays below
+        channels[dropped] = 0
+
+        p_twidth_qch_net = self.chr_dispersion[channels]*np.array([p.source_lwidth for p in photons],dtype = float)*self.length
+
+        coupled,transmitted,transmission_time_net = self.decide_batch(photons,p_twidth_qch_net,self.trnmt[channels])
+        self.propagate_batch(photons,coupled,transmission_time_net)
+        transmitted &= ~dropped
+
+        # Crosstalk (only the transmitted photons can leak into other wavelength channels)
+        out_channels = channels.copy()
+        if n != 0 and np.any(self.crosstalk):
+            leak_draw = self.gen.random(n)
+            out_channels = np.minimum((leak_draw[:,None] >= self.cum_routing[channels]).sum(axis = 1),len(self.wl_channels) - 1)
+            out_channels = np.where(transmitted,out_channels,channels)
+
+        out_p_net = [[] for _ in self.receivers]
+        k = 0
+        for p in p_net:
+            if p is None:
+                for out_p in out_p_net:
+                    out_p.append(None)
+            else:
+                if not dropped[k]:
+                    out_p_net[out_channels[k]].append(p if transmitted[k] else None)
+                k += 1
+
+        self.channel_counts += np.bincount(out_channels[transmitted],minlength = len(self.wl_channels))
+
+        for receiver,out_p in zip(self.receivers,out_p_net):
+            if len(out_p) != 0:
+                receiver.receive(out_p)
+
+    def receive_batch(self,p_net):
+
+        """
+        Instance method to receive a batch of photons (see 'receive', which is vectorized already)
+
+        Arguments:
+            p_net (list[photon]) = Photons emitted by the Source(s)
+        """
+
+        self.receive(p_net)
@@ -4,8 +4,11 @@ import math
 import numpy as np
 import simpy
 import itertools as it
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import norm
 from iteration_utilities import deepflatten
 from ..utils.photon_enc import encoding
+from ..components import component
 from ..components.laser import Laser
 from ..components.variable_ND_filter import NDFilter
 
@@ -31,9 +34,12 @@ class Weaklaser(Laser,NDFilter):
         max_OD (float) = Maximum Value of the Optical Density (OD) that the ND Filter can be set to
         max_num_of_ND_filters (int) = Maximum Number of ND Filters which can be used for attentuation of the Laser's Output
         ND_filter_stack (list[float]) = OD(s) of the ND Filter(s) to be used for attentuating the Laser's Output to Single Photon Levels
+        mu_photons_after_attenuation (float) = Estimated Mean Number of Photons emitted by the Weak Laser
+        mu_photons_after_attenuation_std_err (float) = Standard Error of the Estimated Mean Number of Photons emitted by the Weak Laser
+        n_calibration_trials (int) = Number of Trials used for estimating the Mean Number of Photons emitted by the Weak Laser
     """
 
-    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters,calc_mu_photons_after_attenuation = True):
+    def __init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters,calc_mu_photons_after_attenuation = True,calibration_tol = None,calibration_workers = 1):
         
         """
         Constructor for the Weaklaser class
@@ -54,6 +60,8 @@ class Weaklaser(Laser,NDFilter):
             max_OD (float) = Maximum Value of the Optical Density (OD) that the ND Filter can be set to
             max_num_of_ND_filters (int) = Maximum Number of ND Filters which can be used for attentuation of the Laser's Output
             calc_mu_photons_after_attenuation (bool) = Boolean to determine whether to compute the Mean Number of Photons emitted by the Weak Laser or Not
+            calibration_tol (float) = Half Width of the Confidence Interval on the Mean Number of Photons emitted by the Weak Laser at which the Calibration stops (Default: None, i.e., a fixed Number of Trials is used)
+            calibration_workers (int) = Number of Worker Processes used for the Calibration (Default: 1, i.e., the Calibration runs in the current Process)
         """
         
         Laser.__init__(self,uID,env,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda)
@@ -68,7 +76,7 @@ class Weaklaser(Laser,NDFilter):
         if calc_mu_photons_after_attenuation:
             temp_env = simpy.Environment()
             self.set_environment(temp_env)
-            self.find_mu_photons_after_attenuation()
+            self.find_mu_photons_after_attenuation(tol = calibration_tol,n_workers = calibration_workers)
         self.set_environment(act_env)
 
     def connect(self,receiver):
@@ -104,13 +112,26 @@ class Weaklaser(Laser,NDFilter):
             The stack of ND Filters (if required) is preferably chosen in such a manner that the OD of each ND Filter is the same and the sum of the ODs equals the required OD upto a pre-specified level of tolerance 
         """
         
-        self.ND_Filter_Stack = []
+        self.ND_Filter_Stack = self.find_ND_Filter_stack(1/self.mu_photons)
+        
+    def find_ND_Filter_stack(self,avg_transmittance_reqd):
+        
+        """
+        Instance method which determines the number of ND Filters and their corresponding ODs required for attenuating the output of the laser by a given transmittance (see 'set_ND_Filter_stack')
+        
+        Arguments:
+            avg_transmittance_reqd (float) = Required Transmittance of the Stack of ND Filter(s)
+            
+        Returned Value:
+            ND_Filter_Stack (list[float]) = OD(s) of the ND Filter(s) (empty if the required OD cannot be achieved)
+        """
+        
+        ND_Filter_Stack = []
 
-        avg_transmittance_reqd = 1/self.mu_photons
         avg_OD_reqd = np.round(np.log10(1/avg_transmittance_reqd),decimals = 1)
 
         if (avg_OD_reqd >= self.min_OD) and (avg_OD_reqd <= self.max_OD):
-            self.ND_Filter_Stack.append(avg_OD_reqd)
+            ND_Filter_Stack.append(avg_OD_reqd)
         
         elif avg_OD_reqd > self.max_OD:
 
@@ -132,7 +153,7 @@ class Weaklaser(Laser,NDFilter):
                 OD_base = min(searched_OD_stack,key = searched_OD_stack.get)
                 OD_multiplier = searched_OD_stack[OD_base]
                 for l in range(1,OD_multiplier+1,1):
-                    self.ND_Filter_Stack.append(OD_base)
+                    ND_Filter_Stack.append(OD_base)
 
         
             if search_flag != 1:
@@ -151,26 +172,27 @@ class Weaklaser(Laser,NDFilter):
                         if round(abs(round(sumv,1) - avg_OD_reqd),1) < 0.1:
                             tol_flag = 1
                             idx_reqd = np.min(np.where(summed_net_ODs == sumv))
-                            self.ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
+                            ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
                             break
                     if tol_flag == 0:
                         for sumv in summed_net_ODs:
                             if round(abs(round(sumv,1) - avg_OD_reqd),1) < 0.2:
                                 tol_flag = 2
                                 idx_reqd = np.min(np.where(summed_net_ODs == sumv))
-                                self.ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
+                                ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
                                 break
                     if tol_flag == 0:
                         for sumv in summed_net_ODs:
                             if round(abs(round(sumv,1) - avg_OD_reqd),1) < 0.3:
                                 tol_flag = 3
                                 idx_reqd = np.min(np.where(summed_net_ODs == sumv))
-                                self.ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
+                                ND_Filter_Stack = list(net_OD_combinations_list[idx_reqd])
                                 break
 
                 else:         
                     print(f'ERROR: NOT possible to attenuate to ~ single photon levels...use more than {self.max_num_of_ND_filters} ND Filters!') 
 
+        return ND_Filter_Stack
 
     def emit_and_attenuate(self,qs_list,basis,PER):
         
@@ -215,33 +237,192 @@ class Weaklaser(Laser,NDFilter):
                     self.receiver.receive([p])
             else:
                 self.receiver.receive([None])
-                
-    def find_mu_photons_after_attenuation(self):
+
+    def emit_and_attenuate_pulse(self,i,qs,basis,PER):
+
+        """
+        Instance method for generating the photons of a single pulse of the laser and attenuating them to ~ single photon levels using the ND Filter(s) (without advancing the simulation time)
+
+        Arguments:
+            i (int) = Index of the Pulse
+            qs (list[complex]) = Set of Quantum State Coefficients of the Photons emitted by the Laser
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+
+        Returned Value:
+            NDfilter_photons_net (list[photon]) = List of the Photons emitted by the Weak Laser in the Pulse
+            pulse_duration (float) = Time Period taken up by the Pulse
+        """
+
+        laser_photons_net,pulse_duration = Laser.emit_pulse(self,i,qs,basis,PER)
+        NDfilter_photons_net = laser_photons_net
+        for OD_val in self.ND_Filter_Stack:
+            NDFilter.set_OD(self,OD_val)
+            NDfilter_photons_net = NDFilter.attenuate(self,NDfilter_photons_net)
+
+        for p in NDfilter_photons_net:
+            p.set_environment(self.env)
+
+        return NDfilter_photons_net,pulse_duration
+
+    def emit_and_attenuate_process(self,qs_list,basis,PER):
+
+        """
+        Instance method for emitting attenuated pulses as a Simpy process in the event-driven operation (see 'Laser.emission_process')
+
+        Arguments:
+            qs_list (list[list[complex]]) = List of the Sets of Quantum State Coefficients of the Photons emitted by the Laser (one per Pulse)
+            basis (numpy.array(list[list[complex]])) = Basis of the Quantum States of the Photons emitted by the Laser
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+
+        Returned Value:
+            process (simpy.Process) = Simpy Process emitting the Pulses
+        """
+
+        return self.env.process(self.emission_process(self.emit_and_attenuate_pulse,qs_list,basis,PER,self.deliver_pulse))
+
+    def deliver_pulse(self,photons):
+
+        """
+        Instance method for timestamping the (attenuated) photons of a pulse and handing them over to the receiver one by one (None if the pulse is empty)
+
+        Arguments:
+            photons (list[Photon]) = Photons of the Pulse
+        """
+
+        if len(photons) == 0:
+            self.receiver.receive([None])
+
+        for p in photons:
+            p.set_emission_time(self.env.now)
+            self.receiver.receive([p])
+
+    def emit_stream(self,states,bases,PER,chunk_size = 1024):
+
+        """
+        Generator method for emitting a (possibly very long) train of attenuated pulses chunk by chunk (see 'Laser.emit_stream')
+
+        Arguments:
+            states (iterable[list[complex]]) = Sets of Quantum State Coefficients of the Photons emitted by the Laser (one per Pulse)
+            bases (iterable[numpy.array(list[list[complex]])] or numpy.array(list[list[complex]])) = Bases of the Quantum States of the Photons emitted by the Laser (one per Pulse or a single Basis for all the Pulses)
+            PER (float) = Polarization Extinction Ratio, i.e., Transmission Ratio of the Wanted to the Unwanted Component(s) of Polarization
+            chunk_size (int) = Number of Pulses per Chunk
+
+        Yielded Value:
+            NDfilter_photons_chunk (list[list[Photon]]) = List of the Photons emitted by the Weak Laser (one List per Pulse; empty if no Photon survives the Attenuation)
+            timestamps (numpy.array[float]) = Emission Times of the Pulses
+        """
+
+        return self._stream(self.emit_and_attenuate_pulse,states,bases,PER,chunk_size)
+
+    def find_mu_photons_after_attenuation(self,n_trials = 1000,tol = None,confidence = 0.95,n_workers = 1,batch_size = 100):
         
         """
         Instance method to find the mean number of photons emitted by the weak laser, i.e., the mean number of photons emitted by the laser after attenuation via the usage of the ND Filter(s)
-        """
         
-        class TestReceiver():
-            
-            def __init__(self):
-                pass
+        Details:
+            The trials are run in batches, each of which is driven by its own independent random number stream spawned from the global seed, so that the estimate does not depend on the number of worker processes
+            If a tolerance is specified, batches are run (n_workers batches at a time) until the half width of the confidence interval on the mean drops below the tolerance or n_trials trials have been run; otherwise, exactly n_trials trials are run
+        
+        Arguments:
+            n_trials (int) = Maximum Number of Trials (Default: 1000)
+            tol (float) = Half Width of the Confidence Interval on the Mean at which the Calibration stops (Default: None)
+            confidence (float) = Confidence Level of the Confidence Interval (Default: 0.95)
+            n_workers (int) = Number of Worker Processes (Default: 1)
+            batch_size (int) = Number of Trials per Batch (Default: 100)
             
-            def receive(self,p):
-                self.photon = p[0]
-
-        R = TestReceiver()
-        self.connect(R)
+        Returned Value:
+            mu_photons_after_attenuation (float) = Estimated Mean Number of Photons emitted by the Weak Laser
+            mu_photons_after_attenuation_std_err (float) = Standard Error of the Estimate
+        """
         
-        n_photons_total = []
-        for i in range(1000):
-            self.emit_and_attenuate([[complex(1),complex(0)]],encoding['Polarization'][0],1e6)
-            if R.photon is None:
-                WL_photon = 0
-            else:
-                WL_photon = 1
-            n_photons_total.append(WL_photon)
+        params = (self.uID,self.PRR,self.wl,self.lwidth,self.twidth,self.mu_photons,self.enc_type,self.noise_level,self.gamma,self.lmda,self.min_OD,self.max_OD,self.max_num_of_ND_filters)
+        
+        batch_sizes = [batch_size]*(n_trials//batch_size)
+        if n_trials%batch_size != 0:
+            batch_sizes.append(n_trials%batch_size)
+        seed_seqs = np.random.SeedSequence(component.SEED).spawn(len(batch_sizes))
+        
+        z = norm.ppf(0.5 + 0.5*confidence)
+        n_tot = 0
+        s1_tot = 0
+        s2_tot = 0
+        
+        executor = ProcessPoolExecutor(max_workers = n_workers) if n_workers > 1 else None
+        
+        try:
+            for b in range(0,len(batch_sizes),n_workers):
+                round_args = [(params,seed_seqs[k],batch_sizes[k]) for k in range(b,min(b + n_workers,len(batch_sizes)))]
+                if executor is not None:
+                    round_results = list(executor.map(_run_calibration_batch,*zip(*round_args)))
+                else:
+                    round_results = [_run_calibration_batch(*args) for args in round_args]
+                for n,s1,s2 in round_results:
+                    n_tot += n
+                    s1_tot += s1
+                    s2_tot += s2
+                if (tol is not None) and (n_tot > 1):
+                    std_err = np.sqrt(max(s2_tot - (s1_tot**2)/n_tot,0)/((n_tot - 1)*n_tot))
+                    # A zero standard error after very few trials is not a converged estimate (e.g., all trials yielding no photon)
+                    if (std_err > 0) and (z*std_err < tol):
+                        break
+        finally:
+            if executor is not None:
+                executor.shutdown()
        
-        self.mu_photons_after_attenuation = sum(n_photons_total)/len(n_photons_total)
+        self.n_calibration_trials = n_tot
+        self.mu_photons_after_attenuation = s1_tot/n_tot
+        if n_tot > 1:
+            self.mu_photons_after_attenuation_std_err = np.sqrt(max(s2_tot - (s1_tot**2)/n_tot,0)/((n_tot - 1)*n_tot))
+        else:
+            self.mu_photons_after_attenuation_std_err = np.inf
+        
+        return self.mu_photons_after_attenuation,self.mu_photons_after_attenuation_std_err
+
+
+class _CalibrationReceiver():
+    
+    """
+    Counts the photons emitted by a weak laser during its calibration
+    """
+    
+    def __init__(self):
+        self.n_photons = 0
+    
+    def receive(self,p_net):
+        for p in p_net:
+            if p is not None:
+                self.n_photons += 1
+
+
+def _run_calibration_batch(params,seed_seq,n_trials):
+    
+    """
+    Runs a batch of calibration trials for a weak laser (executed in a worker process when the calibration is parallelized)
+    
+    Arguments:
+        params (tuple) = Constructor Arguments (except the Simpy Environment) of the Weak Laser to be calibrated
+        seed_seq (numpy.random.SeedSequence) = Seed Sequence for the Random Number Stream of the Batch
+        n_trials (int) = Number of Trials
+        
+    Returned Value:
+        n_trials (int) = Number of Trials
+        s1 (int) = Sum of the Numbers of Photons emitted by the Weak Laser over all the Trials
+        s2 (int) = Sum of the Squares of the Numbers of Photons emitted by the Weak Laser over all the Trials
+    """
+    
+    uID,PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters = params
+    WL = Weaklaser(uID,simpy.Environment(),PRR,wl,lwidth,twidth,mu_photons,enc_type,noise_level,gamma,lmda,min_OD,max_OD,max_num_of_ND_filters,calc_mu_photons_after_attenuation = False)
+    WL.gen = np.random.default_rng(seed_seq)
+    R = _CalibrationReceiver()
+    WL.connect(R)
+    
+    s1 = 0
+    s2 = 0
+    for i in range(n_trials):
+        R.n_photons = 0
+        WL.emit_and_attenuate([[complex(1),complex(0)]],encoding['Polarization'][0],1e6)
+        s1 += R.n_photons
+        s2 += R.n_photons**2
         
-        self.connect(None)
+    return n_trials,s1,s2
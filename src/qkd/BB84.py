@@ -12,7 +12,9 @@ from ..components.polarizing_beam_splitter import PolarizingBeamSplitter
 from ..components.waveplate import WavePlate
 from ..utils.photon_enc import encoding
 from ..components.detector import Detector
+from ..components.protocol_runtime import ProtocolRuntime
 from ..utils.classical_info_list import classical_info_list
+from ..qkd.sifting import sifting_sender,sifting_receiver
 from ..qkd.cascade import Cascade
 from ..qkd.toeplitz_matrix import privacy_amplification
 
@@ -130,91 +132,51 @@ Bob_basis_list = np.array(Bob_basis_list)
 assert len(Alice_coeffs_list) == len(Bob_coeffs_list)
 assert len(Alice_basis_list) == len(Bob_basis_list)
 
-Alice.send_classical_information('CC',classical_info_list[2],Bob)
-assert Bob.classical_info == classical_info_list[2]
-Bob.send_classical_information('CC',classical_info_list[3],Alice)
-assert Alice.classical_info == classical_info_list[3]
-
 nz_count = 0
 
 for i in range(len(Bob_basis_list)):
     if Bob_basis_list[i] != -1:
         nz_count += 1
 
-raw_kgr = nz_count/env.now
-print(f'The raw key generation rate is {raw_kgr} bits/s')
-
-# SIFTING 
-Alice.send_classical_information('CC',str(Alice_basis_list),Bob)
-assert Bob.classical_info == str(Alice_basis_list)
-
-same_basis_indices = []
-for i in range(len(Alice_basis_list)):
-    if Alice_basis_list[i] == Bob_basis_list[i]:
-        same_basis_indices.append(i)
-same_basis_indices_str = ' '.join(str(idx) for idx in same_basis_indices)
-Bob.send_classical_information('CC',same_basis_indices_str,Alice)
-assert Alice.classical_info == same_basis_indices_str
-        
-Alice.send_classical_information('CC',classical_info_list[4],Bob)
-assert Bob.classical_info == classical_info_list[4]
-        
-same_coeffs_indices = []
-for i in range(len(Alice_coeffs_list)):
-    if Alice_coeffs_list[i] == Bob_coeffs_list[i]:
-        same_coeffs_indices.append(i)
-        
-Alice_key_init = []
-Bob_key_init = []
-
-for i in range(len(Alice_coeffs_list)):
-    for j in range(len(same_basis_indices)):
-        if i == same_basis_indices[j]:
-            Alice_key_init.append(Alice_coeffs_list[i])
-            Bob_key_init.append(Bob_coeffs_list[i])
-            
-sifted_kgr = len(Bob_key_init)/env.now
-print(f'The sifted key generation rate is {sifted_kgr} bits/s')
-            
-same_coeffs_at_same_basis_list = []
-for i in range(len(Alice_key_init)):
-    if Alice_key_init[i] == Bob_key_init[i]:
-        same_coeffs_at_same_basis_list.append(Alice_key_init[i])
-
-# INFORMATION RECONCILIATION        
-Alice_key_init = np.array(Alice_key_init)
-Bob_key_init = np.array(Bob_key_init)
-
-key_idx_order = [*range(len(Alice_key_init))]
-gen = np.random.default_rng(seed = SEED)
-gen.shuffle(key_idx_order)
-mid = int(0.5*(len(key_idx_order) - 1))
-k1 = key_idx_order[0:mid+1]
-k2 = key_idx_order[mid+1:len(key_idx_order)]
-k2_str = ' '.join(str(idx) for idx in k2)
-Alice.send_classical_information('CC',k2_str,Bob)
-assert Bob.classical_info == k2_str
-
-Alice.send_classical_information('CC',str(Alice_key_init[k2]),Bob)
-assert Bob.classical_info == str(Alice_key_init[k2])
-Bob.send_classical_information('CC',str(Bob_key_init[k2]),Alice)
-assert Alice.classical_info == str(Bob_key_init[k2])
-
-# QBER ESTIMATION
-err = 0
-for idx_k2 in k2:
-    if Alice_key_init[idx_k2] != Bob_key_init[idx_k2]:
-        err += 1
-        
-Alice.send_classical_information('CC',classical_info_list[5],Bob)
-assert Bob.classical_info == classical_info_list[5]
-
-err /= len(k2)
+# POST-PROCESSING (the classical phases run as protocol coroutines, one per party, see 'ProtocolRuntime')
+runtime = ProtocolRuntime(env)
+
+async def Alice_post_processing(party):
+    party.listen('CC')
+    await party.send('CC',classical_info_list[2],Bob)
+    assert (await party.recv('CC')).decode() == classical_info_list[3]
+    
+    # SIFTING AND QBER ESTIMATION
+    key,qber = await sifting_sender(party,'CC',Bob,Alice_basis_list,Alice_coeffs_list,0.5,SEED)
+    await party.send_batch('CC',classical_info_list[4:6],Bob)
+    
+    return key,qber
+
+async def Bob_post_processing(party):
+    party.listen('CC')
+    assert (await party.recv('CC')).decode() == classical_info_list[2]
+    await party.send('CC',classical_info_list[3],Alice)
+    
+    raw_kgr = nz_count/party.now
+    print(f'The raw key generation rate is {raw_kgr} bits/s')
+    
+    # SIFTING AND QBER ESTIMATION
+    key,qber = await sifting_receiver(party,'CC',Alice,Bob_basis_list,Bob_coeffs_list)
+    for info in classical_info_list[4:6]:
+        assert (await party.recv('CC')).decode() == info
+    
+    sifted_kgr = np.count_nonzero(Alice_basis_list == Bob_basis_list)/party.now
+    print(f'The sifted key generation rate is {sifted_kgr} bits/s')
+    
+    return key,qber
+
+# The classical channel is switched back to the synchronous operation (used by Cascade and privacy amplification) once the coroutines have completed
+(Alice_key_init,err),(Bob_key_init,Bob_err) = runtime.run(Alice_post_processing(runtime.party(Alice)),Bob_post_processing(runtime.party(Bob)))
+
+assert err == Bob_err
 print(f'The estimated QBER is {err}')
 
 if (err < 0.15):
-    Alice_key_init = Alice_key_init[k1]
-    Bob_key_init = Bob_key_init[k1]
     Alice_key_init = "".join(map(str, Alice_key_init))
     Bob_key_init = "".join(map(str, Bob_key_init))
     Alice.set_key(Alice_key_init)
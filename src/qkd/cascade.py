@@ -76,29 +76,56 @@ class Cascade():
         Static Method for implementing the Binary Primitive (Algorithm 2 of the referenced Paper)
         """
         
-        beg = 0
-        end = len(self.chk_blk_idx_list) - 1
-        while beg < end:
-            mid = int(0.5*(beg+end))
-            chk_list1 = self.chk_blk_idx_list[beg:mid+1]
-            chk_list2 = self.chk_blk_idx_list[mid+1:end+1]
-            self.B.send_classical_information(self.cch_UID,str(chk_list1),self.A)
-            assert self.A.classical_info == str(chk_list1)
-            A_parity = self.parity(self.A.key_int,self.A.key_len,[chk_list1])
-            self.A.send_classical_information(self.cch_UID,str(A_parity),self.B)
-            assert self.B.classical_info == str(A_parity)
-            B_parity = self.parity(self.B.key_int,self.B.key_len,[chk_list1])
-            if B_parity != A_parity:
-                end = mid
-                self.net_blk_idx_lists[self.pass_num].append(chk_list2)
-            else:
-                beg = mid + 1
-                self.net_blk_idx_lists[self.pass_num].append(chk_list1)
-        idx_for_bit_flip = self.chk_blk_idx_list[beg]
-
-        self.B.key_int ^= int('0'*idx_for_bit_flip+'1'+'0'*(self.B.key_len - idx_for_bit_flip - 1),2)
+        return self.binary_batch([self.chk_blk_idx_list])[0]
+    
+    def binary_batch(self,chk_blk_idx_lists):
+        
+        """
+        Instance Method for implementing the Binary Primitive on several (disjoint) blocks with an odd error parity in parallel
+        
+        Details:
+            The bisection steps of all the blocks are pipelined, i.e., every step takes a single round trip (one batch of messages in each direction) irrespective of the number of blocks
+            Since the blocks are disjoint, the result is identical to that of applying the Binary Primitive to the blocks one after the other
+        
+        Arguments:
+            chk_blk_idx_lists (list[list[int]]) = Blocks (Lists of Indices) with an Odd Error Parity
+            
+        Returned Value:
+            idx_for_bit_flip_net (list[int]) = Indices of the Bits flipped in B's Key (one per Block)
+        """
+        
+        beg = [0]*len(chk_blk_idx_lists)
+        end = [len(chk_blk_idx_list) - 1 for chk_blk_idx_list in chk_blk_idx_lists]
+        new_blk_idx_lists = [[] for _ in chk_blk_idx_lists]
+        active = [j for j in range(len(chk_blk_idx_lists)) if beg[j] < end[j]]
+        
+        while len(active) != 0:
+            mid = {j:int(0.5*(beg[j]+end[j])) for j in active}
+            chk_list1_net = [chk_blk_idx_lists[j][beg[j]:mid[j]+1] for j in active]
+            self.B.send_classical_information_batch(self.cch_UID,[np.array(chk_list1,dtype = int) for chk_list1 in chk_list1_net],self.A)
+            assert all(np.array_equal(info,chk_list1) for info,chk_list1 in zip(self.A.classical_info_net,chk_list1_net))
+            A_parity_net = [self.parity(self.A.key_int,self.A.key_len,[chk_list1]) for chk_list1 in chk_list1_net]
+            self.A.send_classical_information_batch(self.cch_UID,A_parity_net,self.B)
+            assert np.array_equal(self.B.classical_info_net,A_parity_net)
+            for j,chk_list1,A_parity in zip(active,chk_list1_net,A_parity_net):
+                chk_list2 = chk_blk_idx_lists[j][mid[j]+1:end[j]+1]
+                B_parity = self.parity(self.B.key_int,self.B.key_len,[chk_list1])
+                if B_parity != A_parity:
+                    end[j] = mid[j]
+                    new_blk_idx_lists[j].append(chk_list2)
+                else:
+                    beg[j] = mid[j] + 1
+                    new_blk_idx_lists[j].append(chk_list1)
+            active = [j for j in active if beg[j] < end[j]]
+        
+        idx_for_bit_flip_net = []
+        for j,chk_blk_idx_list in enumerate(chk_blk_idx_lists):
+            self.net_blk_idx_lists[self.pass_num] += new_blk_idx_lists[j]
+            idx_for_bit_flip = chk_blk_idx_list[beg[j]]
+            self.B.key_int ^= int('0'*idx_for_bit_flip+'1'+'0'*(self.B.key_len - idx_for_bit_flip - 1),2)
+            idx_for_bit_flip_net.append(idx_for_bit_flip)
 
-        return idx_for_bit_flip
+        return idx_for_bit_flip_net
         
     def run(self):
         
@@ -118,25 +145,22 @@ class Cascade():
             for l in range(1,math.ceil(self.A.key_len/self.k)+1):
                 blk_idx_lists.append(key_idx_order[(l-1)*self.k:min(l*self.k,self.A.key_len)])
             
-            self.B.send_classical_information(self.cch_UID,str(blk_idx_lists),self.A)
-            assert self.A.classical_info == str(blk_idx_lists)
+            # The blocks are consecutive runs of (at most) k indices of the shuffled key, i.e., sending the shuffled order suffices
+            self.B.send_classical_information(self.cch_UID,np.array(key_idx_order,dtype = int),self.A)
+            assert np.array_equal(self.A.classical_info,key_idx_order)
             A_parity_list = self.parity(self.A.key_int,self.A.key_len,blk_idx_lists)
-            self.A.send_classical_information(self.cch_UID,str(A_parity_list),self.B)
-            assert self.B.classical_info == str(A_parity_list)
+            self.A.send_classical_information(self.cch_UID,A_parity_list,self.B)
+            assert np.array_equal(self.B.classical_info,A_parity_list)
             B_parity_list = self.parity(self.B.key_int,self.B.key_len,blk_idx_lists)
             odd_error_parity_blk_idx_list = np.where(A_parity_list != B_parity_list)[0]
             even_error_parity_blk_idx_list = np.where(A_parity_list == B_parity_list)[0]
             
             for j in even_error_parity_blk_idx_list:
                 self.net_blk_idx_lists[i].append(blk_idx_lists[j])
-            net_idx_for_bit_flip = []
-            complete_idx_set_for_bit_flip = []
             
-            for chk_blk_idx in odd_error_parity_blk_idx_list:
-                self.chk_blk_idx_list = blk_idx_lists[chk_blk_idx]
-                bit_flip_index = self.binary()
-                net_idx_for_bit_flip.append(bit_flip_index)
-                complete_idx_set_for_bit_flip.append(bit_flip_index)
+            # The blocks of a pass are disjoint and hence, all the blocks with an odd error parity are bisected in parallel
+            net_idx_for_bit_flip = self.binary_batch([blk_idx_lists[chk_blk_idx] for chk_blk_idx in odd_error_parity_blk_idx_list])
+            complete_idx_set_for_bit_flip = list(net_idx_for_bit_flip)
                 
             if i > 1:
                 chk_blk_idx_lists = []
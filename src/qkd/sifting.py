@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+"""
+This file defines the (classical) sifting and parameter estimation steps of BB84 as protocol coroutines, one per party (see 'ProtocolRuntime')
+"""
+
+async def sifting_sender(party,cch_uid,peer,basis_list,bit_list,sample_frac = 0.5,seed = 0,session = None):
+    
+    """
+    Performs Sifting and QBER Estimation for the Sender (Alice)
+    
+    Arguments:
+        party (Party) = Party of the Sender Node
+        cch_uid (str) = uID of the Classical Channel connecting the Sender and Receiver Nodes
+        peer (Node) = Receiver Node
+        basis_list (numpy.array[int]) = Bases in which the Bits have been encoded
+        bit_list (numpy.array[int]) = Encoded Bits
+        sample_frac (float) = Fraction of the Sifted Key disclosed for QBER Estimation
+        seed (int) = Seed for the Random Selection of the disclosed Bits
+        session (str) = Session (Default: None)
+        
+    Returned Value:
+        key (numpy.array[int]) = Remaining (undisclosed) Sifted Key
+        qber (float) = Estimated QBER
+    """
+    
+    party.listen(cch_uid,session)
+    
+    # SIFTING
+    party.send(cch_uid,np.asarray(basis_list),peer,session)
+    same_basis_indices = (await party.recv(cch_uid,session)).decode()
+    sifted_key = np.asarray(bit_list)[same_basis_indices]
+    
+    # QBER ESTIMATION
+    key_idx_order = np.random.default_rng(seed = seed).permutation(len(sifted_key))
+    num_of_samples = int(sample_frac*len(sifted_key))
+    sample_indices = np.sort(key_idx_order[:num_of_samples])
+    party.send_batch(cch_uid,[sample_indices,sifted_key[sample_indices]],peer,session)
+    peer_sample = (await party.recv(cch_uid,session)).decode()
+    qber = float(np.mean(peer_sample != sifted_key[sample_indices])) if num_of_samples != 0 else 0.0
+    
+    return np.delete(sifted_key,sample_indices),qber
+
+async def sifting_receiver(party,cch_uid,peer,basis_list,bit_list,session = None):
+    
+    """
+    Performs Sifting and QBER Estimation for the Receiver (Bob)
+    
+    Arguments:
+        party (Party) = Party of the Receiver Node
+        cch_uid (str) = uID of the Classical Channel connecting the Sender and Receiver Nodes
+        peer (Node) = Sender Node
+        basis_list (numpy.array[int]) = Bases in which the Bits have been measured (-1 if no Bit has been detected)
+        bit_list (numpy.array[int]) = Measured Bits
+        session (str) = Session (Default: None)
+        
+    Returned Value:
+        key (numpy.array[int]) = Remaining (undisclosed) Sifted Key
+        qber (float) = Estimated QBER
+    """
+    
+    party.listen(cch_uid,session)
+    
+    # SIFTING
+    peer_basis_list = (await party.recv(cch_uid,session)).decode()
+    same_basis_indices = np.flatnonzero(peer_basis_list == np.asarray(basis_list))
+    party.send(cch_uid,same_basis_indices,peer,session)
+    sifted_key = np.asarray(bit_list)[same_basis_indices]
+    
+    # QBER ESTIMATION
+    sample_indices = (await party.recv(cch_uid,session)).decode()
+    peer_sample = (await party.recv(cch_uid,session)).decode()
+    party.send(cch_uid,sifted_key[sample_indices],peer,session)
+    qber = float(np.mean(peer_sample != sifted_key[sample_indices])) if len(sample_indices) != 0 else 0.0
+    
+    return np.delete(sifted_key,sample_indices),qber
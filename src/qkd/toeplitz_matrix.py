@@ -45,8 +45,8 @@ def privacy_amplification(NodeA,NodeB,final_key_len,cch_uID):
     y = toeplitz_gen.integers(0,2,size = NodeA.key_len + final_key_len - 1)
     
     # Alice needs to send y to Bob via CC
-    NodeA.send_classical_information(cch_uID,str(y),NodeB)
-    assert NodeB.classical_info == str(y)
+    NodeA.send_classical_information(cch_uID,y,NodeB)
+    assert np.array_equal(NodeB.classical_info,y)
     
     T = toeplitz(y,NodeA.key_len,final_key_len)
     
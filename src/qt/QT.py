@@ -22,8 +22,6 @@ X = np.array([[complex(0),complex(1)],[complex(1),complex(0)]])
 Z = np.array([[complex(1),complex(0)],[complex(0),complex(-1)]])
 
 env = simpy.Environment()
-env1 = simpy.Environment()
-env2 = simpy.Environment()
 env3 = simpy.Environment()
         
 Alice = Node('A',env)
@@ -40,7 +38,7 @@ QC_WL = QuantumChannel('QC_WL',env3,100,0.2e-3,1.47,0.90,17e-6,0.3)
 WeakLaser = Weaklaser('WL',env3,76e6,1550e-9,0.01e-9,200e-15,1e5,'Polarization',0.01,0.3,0.45,0,4,5)
 print(f'The mean number of photons emitted by the weaklaser are: {WeakLaser.mu_photons_after_attenuation}')
 
-EPS = EntangledPhotonsSourceSPDC('EPS',env,76e6,775e-9,0.01e-9,200e-15,1e6,'Polarization',0.01,0.3,0.45,2,[env1,env2],1e-6)
+EPS = EntangledPhotonsSourceSPDC('EPS',env,76e6,775e-9,0.01e-9,200e-15,1e6,'Polarization',0.01,0.3,0.45,2,1e-6,pair_sampling = 'direct')
 EPS_coeffs_type = EPS.bell_like_state
 
 NPBS = NonPolarizingBeamSplitter('NPBS',env,0.50)
@@ -130,19 +128,21 @@ for i in range(2500):
     start_time = env3.now
     
     Alice.all_components['WL'].emit_and_attenuate([WL_coeffs],encoding['Polarization'][0],1e6)
-    Alice.all_components['EPS'].emit_pp([[complex(1),complex(0)]],encoding['Polarization'][0],1e6)
+    ephotons_net = Alice.all_components['EPS'].emit_pp([[complex(1),complex(0)]],encoding['Polarization'][0],1e6)
     
-    setup_end_time_Bob_side = env2.now
+    # The photons of the entangled pairs carry their own (arrival) times
+    setup_end_time_Alice_side = max([env.now] + [epp[0].time for epp in ephotons_net])
+    setup_end_time_Bob_side = max([env.now] + [epp[1].time for epp in ephotons_net])
     
     num_net = []
     end_pt_net = []
 
     end_pt_net,num_net = Alice.bell_state_detection_analysis(total_net_min_transmission_time_BSM,total_net_max_transmission_time_BSM,start_time)
 
-    if env1.now > env3.now:
-        Alice.all_components['CC'].set_environment(env1)
-    else:
-        Alice.all_components['CC'].set_environment(env3)
+    if setup_end_time_Alice_side > env3.now:
+        env3.timeout(setup_end_time_Alice_side - env3.now)
+        env3.run()
+    Alice.all_components['CC'].set_environment(env3)
     
     if num_net[0] != -1 and num_net[1] != -1:
         
@@ -190,21 +190,11 @@ for i in range(2500):
                 ket1_count += 1
         
         
-    if (env2.now > env1.now) and (env2.now > env3.now):
-        env1.timeout(env2.now - env1.now)
-        env1.run()
-        env3.timeout(env2.now - env3.now)
-        env3.run()
-    elif (env1.now > env2.now) and (env1.now > env3.now):
-        env2.timeout(env1.now - env2.now)
-        env2.run()
-        env3.timeout(env1.now - env3.now)
-        env3.run()
-    elif (env3.now > env1.now) and (env3.now > env2.now):
-        env1.timeout(env3.now - env1.now)
-        env1.run()
-        env2.timeout(env3.now - env2.now)
-        env2.run()
+    end_time = max(env.now,env3.now,setup_end_time_Bob_side)
+    env.timeout(end_time - env.now)
+    env.run()
+    env3.timeout(end_time - env3.now)
+    env3.run()
     
     classical_info_sent = 0
 
@@ -12,9 +12,6 @@ psi_plus = np.array([[complex(0)],[complex(1/np.sqrt(2))],[complex(1/np.sqrt(2))
 psi_minus = np.array([[complex(0)],[complex(1/np.sqrt(2))],[complex(-1/np.sqrt(2))],[complex(0)]])
 
 ENV = simpy.Environment()
-ENV1 = simpy.Environment()
-ENV2 = simpy.Environment()
-ENV_LIST = [ENV1,ENV2]
 UID = 'EPS1'
 PRR = 8e7
 WL = 775e-9
@@ -44,7 +41,7 @@ class FakeReceiver():
         self.p_net.append(p)
 
 def test_init():
-    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,ENV_LIST,EFF)
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
     assert EPS1.uID == UID
     assert EPS1.SPDC_type == SPDC_TYPE
     assert EPS1.chi == CHI
@@ -57,13 +54,13 @@ def test_connect():
     R1 = FakeReceiver()
     R2 = FakeReceiver()
     R_net = [R1,R2]
-    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,ENV_LIST,EFF)
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
     EPS1.connect(R_net)
     assert EPS1.receivers[0] == R1
     assert EPS1.receivers[1] == R2
     
 def test_eff_and_coeff_values():
-    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,ENV_LIST,EFF)
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
     R1 = FakeReceiver()
     R2 = FakeReceiver()
     R_net = [R1,R2]
@@ -77,7 +74,7 @@ def test_noise_level():
     NOISE_LEVEL = 0.54
     MU_PHOTONS = 1e2
     EFF = 1e-2
-    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,ENV_LIST,EFF)
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
     R1 = FakeReceiver()
     R2 = FakeReceiver()
     R_net = [R1,R2]
@@ -91,12 +88,47 @@ def test_noise_level():
         R2.p_net = []
     assert abs(((corrupted_qs_count/10000) - NOISE_LEVEL)) < 5e-2
     
+def test_max_number_of_photon_pairs():
+    NOISE_LEVEL = 0
+    MU_PHOTONS = 1e3
+    EFF = 1e-2
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
+    num_pp_net = []
+    for i in range(200):
+        EPS1.gen = np.random.default_rng(seed = i)
+        laser_photons_net = EPS1.emit_pulse(i,COEFFS[0],BASIS,PER)[0]
+        ephotons_net = EPS1.generate_pairs(laser_photons_net)
+        assert len(ephotons_net) <= int(round(EFF*len(laser_photons_net)))
+        num_pp_net.append(len(ephotons_net))
+    assert abs(np.mean(num_pp_net) - EFF*MU_PHOTONS) < 0.5
+    
+def test_direct_pair_sampling():
+    NOISE_LEVEL = 0
+    MU_PHOTONS = 1e3
+    EFF = 1e-2
+    N_PULSES = 300
+    EPS_PUMP = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
+    EPS_DIRECT = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,pair_sampling = 'direct')
+    assert abs(EPS_DIRECT.p_down_conversion - 0.1554) < 1e-4
+    num_pp_pump = []
+    num_pp_direct = []
+    pulse_duration_net = []
+    for i in range(N_PULSES):
+        num_pp_pump.append(len(EPS_PUMP.emit_pp_pulse(i,COEFFS[0],BASIS,PER)[0]))
+        ephotons_net,pulse_duration = EPS_DIRECT.emit_pp_pulse(i,COEFFS[0],BASIS,PER)
+        num_pp_direct.append(len(ephotons_net))
+        pulse_duration_net.append(pulse_duration)
+        for epp in ephotons_net:
+            assert np.allclose(epp[0].qs.coeffs,psi_plus) and np.allclose(epp[1].qs.coeffs,psi_plus)
+            assert epp[0].wl == epp[1].wl
+    assert abs(np.mean(num_pp_pump) - np.mean(num_pp_direct)) < 0.5
+    assert abs(np.std(num_pp_pump) - np.std(num_pp_direct)) < 0.5
+    #The maximum of 1000 standard normal variates lies between 2 and 5 with overwhelming probability
+    assert np.all(np.array(pulse_duration_net) > 1/PRR + 2*TWIDTH) and np.all(np.array(pulse_duration_net) < 1/PRR + 5*TWIDTH)
+    
 def test_env_times_post_emission():
     ENV = simpy.Environment()
-    ENV1 = simpy.Environment()
-    ENV2 = simpy.Environment()
-    ENV_LIST = [ENV1,ENV2]
-    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,ENV_LIST,EFF)
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
     R1 = FakeReceiver()
     R2 = FakeReceiver()
     R_net = [R1,R2]
@@ -104,5 +136,49 @@ def test_env_times_post_emission():
     EPS1.emit_pp(COEFFS,BASIS,PER)
     min_env_time = (1/PRR) - 5*TWIDTH
     max_env_time = (1/PRR) + 5*TWIDTH
-    assert (ENV1.now >= min_env_time) and (ENV1.now <= max_env_time)
-    assert (ENV2.now >= min_env_time) and (ENV2.now <= max_env_time)
\ No newline at end of file
+    assert (ENV.now >= min_env_time) and (ENV.now <= max_env_time)
+    for p_net in R1.p_net + R2.p_net:
+        assert p_net[0].emission_time == ENV.now
+        assert p_net[0].time == ENV.now
+    # The source's clock is shared across emissions (and no longer reset after every emission)
+    EPS1.emit_pp(COEFFS,BASIS,PER)
+    assert (ENV.now >= 2*min_env_time) and (ENV.now <= 2*max_env_time)
+    assert R1.p_net[-1][0].emission_time == ENV.now
+    
+def test_emit_stream():
+    ENV = simpy.Environment()
+    MU_PHOTONS = 1e2
+    EFF = 1e-2
+    N_PULSES = 20
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF)
+    n_pulses = 0
+    for ephotons_chunk,timestamps in EPS1.emit_stream(COEFFS*N_PULSES,BASIS,PER,chunk_size = 8):
+        assert len(ephotons_chunk) == len(timestamps)
+        for epp_net in ephotons_chunk:
+            for epp in epp_net:
+                assert len(epp) == 2
+                assert np.allclose(epp[0].qs.coeffs,psi_plus) and np.allclose(epp[1].qs.coeffs,psi_plus)
+        n_pulses += len(ephotons_chunk)
+    assert n_pulses == N_PULSES
+    assert EPS1.env.now == timestamps[-1]
+
+    
+def test_emit_pp_process():
+    ENV = simpy.Environment()
+    MU_PHOTONS = 1e2
+    EFF = 1e-2
+    N_PULSES = 40
+    EPS1 = EntangledPhotonsSourceSPDC('EPS1',ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,pair_sampling = 'direct')
+    R1 = FakeReceiver()
+    R2 = FakeReceiver()
+    EPS1.connect([R1,R2])
+    P = EPS1.emit_pp_process(COEFFS*N_PULSES,BASIS,PER)
+    #The emission can be paused and resumed
+    ENV.run(until = (N_PULSES/2 - 0.5)/PRR)
+    assert 0 < len(R1.p_net) < 2*N_PULSES
+    assert all(p_net[0].emission_time <= ENV.now for p_net in R1.p_net)
+    ENV.run(until = P)
+    assert len(R1.p_net) == len(R2.p_net)
+    emission_times = [p_net[0].emission_time for p_net in R1.p_net]
+    assert np.all(np.diff(emission_times) >= 0)
+    assert abs(ENV.now - N_PULSES/PRR) < 5*N_PULSES*TWIDTH
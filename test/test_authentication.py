@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.components.authentication import gf64_mul, KeyPool, WegmanCarterAuthenticator
+from ..src.components.classical_channel import ClassicalChannel
+from ..src.components.classical_message import ClassicalMessage
+
+UID = 'CC1'
+LENGTH = 1000
+N_CORE = 1.50
+SEED = 11
+
+class FakeNode():
+
+    def __init__(self,uID):
+        self.uID = uID
+        self.key_pool = KeyPool()
+
+    def receive_classical_information(self,uID,info):
+        self.c_info = info
+
+    def receive_classical_information_batch(self,uID,info_net):
+        self.c_info_net = info_net
+
+def gf64_mul_ref(a,b):
+    r = 0
+    for j in range(64):
+        if (b >> j) & 1:
+            r ^= a << j
+    for j in range(127,63,-1):
+        if (r >> j) & 1:
+            r ^= ((1 << 64) | 0b11011) << (j - 64)
+    return r
+
+def authenticated_channel(num_of_bytes = 1024):
+    gen = np.random.default_rng(SEED)
+    E1 = FakeNode('E1')
+    E2 = FakeNode('E2')
+    KeyPool.preshare(E1,E2,num_of_bytes,gen)
+    CC1 = ClassicalChannel(UID,simpy.Environment(),LENGTH,N_CORE)
+    CC1.connect(E1,E2)
+    CC1.set_sender_and_receiver(E1,E2)
+    CC1.enable_authentication()
+    return CC1,E1,E2
+
+def test_gf64_mul():
+    gen = np.random.default_rng(SEED)
+    a = gen.integers(0,2**63,size = 50,dtype = np.uint64)*np.uint64(2) + gen.integers(0,2,size = 50,dtype = np.uint64)
+    b = gen.integers(0,2**63,size = 50,dtype = np.uint64)*np.uint64(2) + gen.integers(0,2,size = 50,dtype = np.uint64)
+    r = gf64_mul(a,b)
+    assert [int(x) for x in r] == [gf64_mul_ref(int(x),int(y)) for x,y in zip(a,b)]
+
+def test_key_pool():
+    KP = KeyPool()
+    KP.add_key_material(('E1','E2'),bytes(range(16)))
+    assert KP.available(('E1','E2')) == 16
+    assert KP.consume(('E1','E2'),8) == (0,bytes(range(8)))
+    assert KP.available(('E1','E2')) == 8
+    assert KP.fetch(('E1','E2'),0,8) == bytes(range(8))
+    with pytest.raises(AssertionError):
+        KP.fetch(('E1','E2'),0,8)
+    with pytest.raises(AssertionError):
+        KP.consume(('E1','E2'),9)
+
+def test_authenticated_transmit():
+    CC1,E1,E2 = authenticated_channel()
+    CC1.transmit('START_QKD')
+    assert E2.c_info.decode() == 'START_QKD'
+    CC1.transmit(np.arange(100))
+    assert np.array_equal(E2.c_info.decode(),np.arange(100))
+
+    counters = CC1.get_counters()
+    # One hash key for the session and one one-time pad per tag
+    assert counters['auth_key_bytes'] == 8 + 2*8
+    assert counters['auth_cpu_time'] >= 0
+
+def test_batch_consumes_one_tag():
+    CC1,E1,E2 = authenticated_channel()
+    CC1.transmit_batch([np.arange(k + 1) for k in range(20)])
+    assert len(E2.c_info_net) == 20
+    assert CC1.get_counters()['auth_key_bytes'] == 8 + 8
+
+    CC1.reset_counters()
+    assert CC1.get_counters()['auth_key_bytes'] == 0
+    CC1.transmit('NEXT')
+    # A new session draws a new hash key
+    assert CC1.get_counters()['auth_key_bytes'] == 8 + 8
+
+def test_tampering_is_detected():
+    CC1,E1,E2 = authenticated_channel()
+    auth = CC1.authenticator
+    msg_net = [ClassicalMessage(np.arange(10))]
+    for msg in msg_net:
+        msg.sender = E1
+        msg.receiver = E2
+    auth.tag(msg_net,E1,E2)
+    forged = [ClassicalMessage(np.arange(1,11))]
+    forged[0].sender = E1
+    forged[0].auth = msg_net[0].auth
+    assert not auth.verify(forged,E2)
+    auth.tag(msg_net,E1,E2)
+    assert auth.verify(msg_net,E2)
+    # A replayed tag (i.e., a reused one-time pad) is rejected
+    assert not auth.verify(msg_net,E2)
+
+def test_unauthenticated_message_is_rejected():
+    CC1,E1,E2 = authenticated_channel()
+    msg = ClassicalMessage('START_QKD')
+    msg.sender = E1
+    msg.receiver = E2
+    CC1.hand_over([msg],E2.receive_classical_information,msg)
+    assert not hasattr(E2,'c_info')
+    assert CC1.get_counters()['rejected'] == 1
+    
+def test_forged_tag_is_dropped():
+    CC1,E1,E2 = authenticated_channel()
+    CC1.transmit('START_QKD')
+    # An adversary substitutes the payload but keeps the tag of a genuine message
+    genuine_tag = E2.c_info.auth
+    original_tag = CC1.authenticator.tag
+    def forge(msg_net,sender,receiver):
+        original_tag(msg_net,sender,receiver)
+        for msg in msg_net:
+            msg.auth = (genuine_tag[0],msg.auth[1],genuine_tag[2])
+    CC1.authenticator.tag = forge
+    CC1.transmit('ABORT_QKD')
+    assert E2.c_info.decode() == 'START_QKD'
+    assert CC1.get_counters()['rejected'] == 1
+    cpu_time = CC1.get_counters()['auth_cpu_time']
+    assert not CC1.authenticator.verify([ClassicalMessage('ABORT_QKD')],E2)
+    assert CC1.get_counters()['auth_cpu_time'] >= cpu_time
+
+def test_key_exhaustion():
+    CC1,E1,E2 = authenticated_channel(num_of_bytes = 16)
+    CC1.transmit('START_QKD')
+    with pytest.raises(AssertionError):
+        CC1.transmit('START_QKD')
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
 import simpy
 from ..src.components.classical_channel import ClassicalChannel
 
@@ -18,6 +19,9 @@ class FakeNode():
     
     def receive_classical_information(self,uID,info):
         self.c_info = info
+        
+    def receive_classical_information_batch(self,uID,info_net):
+        self.c_info_net = info_net
 
 def test_init():
     CC1 = ClassicalChannel(UID,ENV,LENGTH,N_CORE)
@@ -58,5 +62,110 @@ def test_transmit():
     CC1.transmit(INFO)
     t_f = ENV.now
     c = 3e8
-    assert E1.c_info == INFO
-    assert abs((t_f - t_i) - (LENGTH/(c/N_CORE))) < 1e-7
\ No newline at end of file
+    assert E1.c_info.decode() == INFO
+    assert E1.c_info.nbytes == len(INFO)
+    assert abs((t_f - t_i) - (LENGTH/(c/N_CORE))) < 1e-7
+
+    
+def test_transmit_event_driven():
+    ENV = simpy.Environment()
+    CC1 = ClassicalChannel(UID,ENV,LENGTH,N_CORE)
+    CC1.enable_event_driven()
+    E1 = FakeNode()
+    E2 = FakeNode()
+    CC1.connect(E1,E2)
+    CC1.set_sender_and_receiver(E2,E1)
+    c = 3e8
+    #Several messages may be in flight at once
+    P1 = CC1.transmit(INFO)
+    ENV.run(until = 0.5*(LENGTH/(c/N_CORE)))
+    P2 = CC1.transmit('STOP_QKD')
+    assert not hasattr(E1,'c_info')
+    ENV.run(until = P1)
+    assert E1.c_info.decode() == INFO
+    ENV.run(until = P2)
+    assert E1.c_info.decode() == 'STOP_QKD'
+    assert abs(ENV.now - 1.5*(LENGTH/(c/N_CORE))) < 1e-7
+    
+def test_transmit_batch_and_counters():
+    ENV = simpy.Environment()
+    CC1 = ClassicalChannel(UID,ENV,LENGTH,N_CORE)
+    E1 = FakeNode()
+    E2 = FakeNode()
+    CC1.connect(E1,E2)
+    CC1.set_sender_and_receiver(E1,E2)
+    c = 3e8
+    #The messages of a batch take a single propagation delay
+    CC1.transmit_batch([INFO,b'\x01\x02',np.arange(10,dtype = np.int32)])
+    assert abs(ENV.now - LENGTH/(c/N_CORE)) < 1e-12
+    assert [msg.nbytes for msg in E2.c_info_net] == [len(INFO),2,40]
+    assert np.array_equal(E2.c_info_net[2].decode(),np.arange(10))
+    CC1.transmit(INFO)
+    CC1.set_sender_and_receiver(E2,E1)
+    CC1.transmit(INFO)
+    counters = CC1.get_counters()
+    assert counters['messages'] == 5
+    assert counters['bytes'] == len(INFO) + 2 + 40 + 2*len(INFO)
+    assert counters['rounds'] == 3
+    assert counters['round_trips'] == 1
+    assert abs(counters['propagation_time'] - ENV.now) < 1e-12
+    #A->B->A->B completes only 1 round trip, and the next return to the initiator completes another one
+    CC1.reset_counters()
+    assert CC1.get_counters()['messages'] == 0
+    for sender,receiver in [(E1,E2),(E2,E1),(E1,E2)]:
+        CC1.set_sender_and_receiver(sender,receiver)
+        CC1.transmit(INFO)
+    assert CC1.get_counters()['round_trips'] == 1
+    CC1.set_sender_and_receiver(E2,E1)
+    CC1.transmit(INFO)
+    assert CC1.get_counters()['round_trips'] == 2
+    
+def test_bandwidth():
+    ENV = simpy.Environment()
+    BANDWIDTH = 1e6
+    OVERHEAD = 40
+    CC1 = ClassicalChannel(UID,ENV,LENGTH,N_CORE,bandwidth = BANDWIDTH,overhead = OVERHEAD)
+    E1 = FakeNode()
+    E2 = FakeNode()
+    CC1.connect(E1,E2)
+    CC1.set_sender_and_receiver(E1,E2)
+    c = 3e8
+    PROP = LENGTH/(c/N_CORE)
+    INFO_ARR = np.zeros(12500,dtype = np.uint8)
+    #A message of 12500 bytes takes 0.1 s to be serialized at 1 Mbit/s (plus the overhead)
+    CC1.transmit(INFO_ARR)
+    assert abs(ENV.now - (8*(12500 + OVERHEAD)/BANDWIDTH + PROP)) < 1e-12
+    #The messages of a batch are serialized back to back
+    t_i = ENV.now
+    CC1.transmit_batch([INFO_ARR,INFO_ARR])
+    assert abs(ENV.now - t_i - (2*8*(12500 + OVERHEAD)/BANDWIDTH + PROP)) < 1e-12
+    counters = CC1.get_counters()
+    assert abs(counters['busy_time'] - 3*8*(12500 + OVERHEAD)/BANDWIDTH) < 1e-12
+    assert counters['queueing_time'] == 0
+    assert abs(counters['utilization'] - counters['busy_time']/(2*ENV.now)) < 1e-12
+    
+def test_queue_discipline_event_driven():
+    c = 3e8
+    PROP = LENGTH/(c/N_CORE)
+    BANDWIDTH = 8e3
+    for queue_discipline,order in [('FIFO',['L1','L2','S']),('SJF',['L1','S','L2'])]:
+        ENV = simpy.Environment()
+        CC1 = ClassicalChannel(UID,ENV,LENGTH,N_CORE,bandwidth = BANDWIDTH,queue_discipline = queue_discipline)
+        CC1.enable_event_driven()
+        arrivals = []
+        class RecordingNode():
+            def receive_classical_information(self,uID,info):
+                arrivals.append((info.decode()[:2].rstrip('_'),ENV.now))
+        E1 = FakeNode()
+        E2 = RecordingNode()
+        CC1.connect(E1,E2)
+        CC1.set_sender_and_receiver(E1,E2)
+        #Concurrently sent messages queue up for the channel (L1 occupies it while L2 and S wait)
+        CC1.transmit('L1' + '_'*998)
+        CC1.transmit('L2' + '_'*998)
+        CC1.transmit('S_')
+        ENV.run()
+        assert [a[0] for a in arrivals] == order
+        assert abs(arrivals[0][1] - (1000/1e3 + PROP)) < 1e-9
+        assert abs(arrivals[-1][1] - (2002/1e3 + PROP)) < 1e-9
+        assert CC1.get_counters()['queueing_time'] > 0
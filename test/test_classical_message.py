@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from ..src.components.classical_message import ClassicalMessage
+
+def test_str():
+    INFO = 'START_QKD'
+    msg = ClassicalMessage(INFO)
+    assert msg.kind == 'str'
+    assert msg.nbytes == len(INFO)
+    assert msg.decode() == INFO
+    
+def test_bytes():
+    INFO = b'\x00\x01\xff'
+    msg = ClassicalMessage(INFO)
+    assert msg.kind == 'bytes'
+    assert msg.nbytes == 3
+    assert msg.decode() == INFO
+    
+def test_array():
+    #Arrays longer than 1000 elements are carried exactly (str() would truncate them)
+    INFO = np.random.default_rng(seed = 0).integers(0,2,size = 5000)
+    msg = ClassicalMessage(INFO)
+    assert msg.kind == 'array'
+    assert msg.nbytes == INFO.nbytes
+    decoded = msg.decode()
+    assert np.array_equal(decoded,INFO) and decoded.dtype == INFO.dtype
+    #The payload is a view of the buffer of the array (zero-copy)
+    assert np.shares_memory(decoded,INFO)
+    assert not decoded.flags.writeable
+    
+def test_array_shapes():
+    INFO = np.arange(12,dtype = np.uint8).reshape(3,4)
+    assert np.array_equal(ClassicalMessage(INFO).decode(),INFO)
+    assert ClassicalMessage(INFO.T).decode().shape == (4,3)
+    assert np.array_equal(ClassicalMessage(INFO.T).decode(),INFO.T)
+    assert ClassicalMessage([0,1,1]).nbytes == 3*np.dtype(int).itemsize
+    with pytest.raises((AssertionError,ValueError)):
+        ClassicalMessage([[0,1],[1]])
+    
+def test_scalar():
+    #A number (e.g., a parity) is carried as a 0-d array and not as a 1-element array
+    for INFO in [np.int64(1),np.array(1,dtype = np.uint8),2.5]:
+        decoded = ClassicalMessage(INFO).decode()
+        assert decoded.shape == () and decoded == INFO
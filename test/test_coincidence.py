@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from ..src.components.coincidence import CoincidenceCounter
+from ..src.components.time_tagger import TimeTagger
+
+SEED = 7
+
+def random_tags(gen,n,duration):
+    return np.sort(gen.integers(0,duration,size = n))
+
+def test_coincidences():
+    gen = np.random.default_rng(SEED)
+    t1 = random_tags(gen,500,10**6)
+    t2 = random_tags(gen,700,10**6)
+    CC = CoincidenceCounter({0:t1,1:t2[::-1]})
+    for window,delay in [(100,0),(250,-300),(1000,500)]:
+        expected = sum(int(np.sum(np.abs(t2 - t - delay) <= window)) for t in t1)
+        assert CC.coincidences(0,1,window,delay) == expected
+        idx1,idx2 = CC.coincidence_pairs(0,1,window,delay)
+        assert len(idx1) == expected
+        assert np.all(np.abs(t2[idx2] - t1[idx1] - delay) <= window)
+
+def test_multi_coincidences():
+    gen = np.random.default_rng(SEED)
+    t = [random_tags(gen,300,10**5) for _ in range(3)]
+    CC = CoincidenceCounter(dict(enumerate(t)))
+    expected = sum(all(np.any(np.abs(t[k] - x) <= 200) for k in [1,2]) for x in t[0])
+    assert CC.multi_coincidences([0,1,2],200) == expected
+
+def test_from_tags():
+    TT = TimeTagger()
+    TT.tag_batch(np.array([3e-9,1e-9,2e-9]),4)
+    TT.tag_batch(np.array([1.5e-9]),9)
+    CC = CoincidenceCounter.from_tags(TT.get_tags())
+    assert sorted(CC.channels) == [4,9]
+    assert list(CC.channels[4]) == [1000,2000,3000]
+    assert CC.coincidences(4,9,500) == 2
+
+def test_histogram_and_g2():
+    gen = np.random.default_rng(SEED)
+    duration = 10**9
+    t1 = random_tags(gen,20000,duration)
+    # Correlated pairs (delayed by 1000 with a jitter) on top of uncorrelated clicks
+    t2 = np.sort(np.concatenate((t1[:5000] + 1000 + gen.integers(-50,50,size = 5000),random_tags(gen,20000,duration))))
+    CC = CoincidenceCounter({0:t1,1:t2},chunk_size = 1000)
+    tau,counts = CC.histogram(0,1,100,5000)
+    diffs = np.concatenate([t2[np.abs(t2 - t) <= 5000] - t for t in t1])
+    assert np.array_equal(counts,np.histogram(diffs,bins = np.arange(-5000,5001,100))[0])
+
+    tau,g2 = CC.g2(0,1,100,20000,duration)
+    peak = np.argmax(g2)
+    assert 900 <= tau[peak] <= 1100
+    assert g2[peak] > 50
+    assert abs(np.median(g2) - 1) < 0.2
@@ -11,4 +11,34 @@ ENV = simpy.Environment()
 def test_init():
     C1 = Component(UID,ENV)
     assert C1.uID == UID
-    assert C1.env == ENV
\ No newline at end of file
+    assert C1.env == ENV
+    
+def test_enable_event_driven():
+    ENV = simpy.Environment()
+    C1 = Component(UID,ENV)
+    assert C1.event_driven == False
+    C1.enable_event_driven()
+    assert C1.event_driven == True
+    P = C1.schedule(2.5,lambda x: 2*x,21)
+    ENV.run(until = 1)
+    assert not P.triggered
+    ENV.run(until = P)
+    assert ENV.now == 2.5 and P.value == 42
+    # A component which does not handle inputs gets no input port
+    assert not hasattr(C1,'input_port')
+    C1.disable_event_driven()
+    assert C1.event_driven == False
+    
+class DelayComponent(Component):
+    
+    def handle(self,item):
+        self.schedule(1,self.items.append,item)
+    
+def test_serve():
+    ENV = simpy.Environment()
+    C1 = DelayComponent(UID,ENV)
+    C1.items = []
+    C1.enable_event_driven()
+    C1.input_port.put('INPUT')
+    ENV.run(until = 2)
+    assert C1.items == ['INPUT']
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import simpy
+import numpy as np
+from ..src.components.decoy_weaklaser import DecoyWeaklaser
+from ..src.utils.photon_enc import encoding
+
+ENV = simpy.Environment()
+
+#LASER
+UID = 'DWL1'
+PRR = 8e7
+WL = 1550e-9
+LWIDTH = 0.01e-9
+TWIDTH = 100e-15
+MU_PHOTONS = 1e5
+ENC_TYPE = 'Polarization'
+NOISE_LEVEL = 0
+GAMMA = 0.4
+LMDA = 0.3
+
+#VARIABLE ND FILTER
+MIN_OD = 0
+MAX_OD = 4
+
+MAX_NUM_OF_ND_FILTERS = 5
+
+#DECOY STATES
+INTENSITIES = [0.5,0.1,0]
+INTENSITY_PROBS = [0.7,0.2,0.1]
+
+PER = 1e6
+COEFFS = [complex(1),complex(0)]
+BASIS = encoding['Polarization'][0]
+
+class FakeReceiver():
+    
+    def __init__(self):
+        self.p_net_rcd = []
+    
+    def receive(self,p_net):
+        self.p_net_rcd.append(p_net[0])
+
+def test_init():
+    DWL = DecoyWeaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,INTENSITIES,INTENSITY_PROBS)
+    assert DWL.uID == UID
+    assert np.isclose(sum(DWL.ND_Filter_Stack_net[0]),5.3)
+    assert np.isclose(sum(DWL.ND_Filter_Stack_net[1]),6.0)
+    assert DWL.ND_Filter_Stack_net[2] is None
+    assert np.allclose(DWL.mu_photons_net,INTENSITIES,rtol = 0.1)
+    assert np.isclose(DWL.mu_photons_after_attenuation,np.dot(INTENSITY_PROBS,DWL.mu_photons_net))
+    
+def test_draw_intensity_classes():
+    DWL = DecoyWeaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,INTENSITIES,INTENSITY_PROBS)
+    intensity_classes = DWL.draw_intensity_classes(100000)
+    assert np.allclose(np.bincount(intensity_classes,minlength = 3)/100000,INTENSITY_PROBS,atol = 1e-2)
+
+def test_mean_number_of_photons_per_class():
+    ENV = simpy.Environment()
+    DWL = DecoyWeaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,INTENSITIES,INTENSITY_PROBS)
+    R = FakeReceiver()
+    DWL.connect(R)
+    N_PULSES = 20000
+    intensity_classes = DWL.emit_and_attenuate([COEFFS]*N_PULSES,BASIS,PER)
+    assert len(intensity_classes) == N_PULSES
+    assert np.array_equal(DWL.intensity_classes,intensity_classes)
+    photons_net,pulse_durations = DWL.emit_decoy_pulses([COEFFS]*N_PULSES,BASIS,PER,intensity_classes)
+    n_photons = np.array([len(photons) for photons in photons_net])
+    for k in range(len(INTENSITIES)):
+        assert abs(np.mean(n_photons[intensity_classes == k]) - DWL.mu_photons_net[k]) < 5e-2
+    assert np.all(n_photons[intensity_classes == 2] == 0)
+    assert abs(ENV.now - N_PULSES/PRR) < 1e-9
+    
+def test_emit_stream():
+    ENV = simpy.Environment()
+    DWL = DecoyWeaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,INTENSITIES,INTENSITY_PROBS)
+    n_pulses = 0
+    for photons_chunk,timestamps,intensity_classes in DWL.emit_stream([COEFFS]*100,BASIS,PER,chunk_size = 32):
+        assert len(photons_chunk) == len(timestamps) == len(intensity_classes)
+        n_pulses += len(photons_chunk)
+    assert n_pulses == 100
+    assert DWL.env.now == timestamps[-1]
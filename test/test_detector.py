@@ -108,4 +108,79 @@ def test_coupling_efficiency():
         p.set_environment(ENV)
         D1.receive([p])
         D1.clear_measurements()
-    assert abs((D1.photon_count/10000) - D1.coupling_eff) < 5e-2
\ No newline at end of file
+    assert abs((D1.photon_count/10000) - D1.coupling_eff) < 5e-2
+    
+def test_register_dark_counts():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,DARK_COUNT_RATE,JITTER,NUMBER_RETURNED)
+    D1.register_dark_counts(50.0)
+    times = D1.dark_count_time_instants
+    # Every dark count up to (and including) the first one at or after the given time is registered
+    assert times[-1] >= 50.0 and times[-2] < 50.0
+    assert np.all(np.diff(times) > 0)
+    assert D1.next_dark_count_time == times[-1]
+    assert abs(len(times)/50.0 - DARK_COUNT_RATE) < 5*np.sqrt(DARK_COUNT_RATE/50.0)
+    
+def test_dark_count_in_window():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,DARK_COUNT_RATE,JITTER,NUMBER_RETURNED)
+    check_idx = 0
+    for k in range(2000):
+        t_min,t_max = k*1e-3 + 2e-4,k*1e-3 + 8e-4
+        D1.register_dark_counts(t_max)
+        times = list(D1.dark_count_time_instants)
+        # Reference: linear scan over the dark counts which have not been checked before
+        expected = None
+        for i in range(check_idx,len(times)):
+            if times[i] >= t_min and times[i] <= t_max:
+                expected = times[i]
+        check_idx = len(times) - 1
+        assert D1.dark_count_in_window(t_min,t_max) == expected
+    
+def test_dark_count_compaction():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,DARK_COUNT_RATE,JITTER,NUMBER_RETURNED)
+    # Reference detector (same seed) whose buffer is never compacted
+    D2 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,DARK_COUNT_RATE,JITTER,NUMBER_RETURNED)
+    D2.dark_count_buffer = np.empty(1 << 16)
+    for k in range(20000):
+        t_min,t_max = k*5e-3 + 1e-3,k*5e-3 + 4e-3
+        D1.register_dark_counts(t_max)
+        D2.register_dark_counts(t_max)
+        assert D1.dark_count_in_window(t_min,t_max) == D2.dark_count_in_window(t_min,t_max)
+    assert D1.num_of_dark_counts == D2.num_of_dark_counts == len(D2.dark_count_time_instants)
+    assert D1.num_of_discarded_dark_counts > 0
+    assert len(D1.dark_count_buffer) <= 3*D1.dark_count_block_size
+    
+def test_sample_window_dark_counts():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,1000,JITTER,NUMBER_RETURNED,dark_count_mode = 'window')
+    starts = np.arange(100000)*1e-2
+    counts,latest = D1.sample_window_dark_counts(starts,starts + 1e-3)
+    assert abs(counts.mean() - 1) < 0.02
+    assert D1.num_of_dark_counts == counts.sum()
+    assert np.array_equal(np.isnan(latest),counts == 0)
+    offsets = latest[counts == 1] - starts[counts == 1]
+    assert np.all((offsets >= 0) & (offsets <= 1e-3))
+    # A single dark count is uniformly distributed in the window
+    assert abs(offsets.mean() - 5e-4) < 1e-5
+    
+def test_window_dark_count_mode():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,1000,JITTER,NUMBER_RETURNED,dark_count_mode = 'window')
+    D1.register_dark_counts(10.0)
+    assert len(D1.dark_count_time_instants) == 0
+    hits = [D1.dark_count_in_window(k + 0.2,k + 0.2 + 1e-3) for k in range(2000)]
+    assert abs(sum(h is not None for h in hits)/2000 - (1 - np.exp(-1))) < 0.05
+    assert all(k + 0.2 <= h <= k + 0.2 + 1e-3 for k,h in enumerate(hits) if h is not None)
+    with pytest.raises(AssertionError):
+        Detector(UID,ENV,DEAD_TIME,I_DET_EFF,DARK_COUNT_RATE,JITTER,NUMBER_RETURNED,dark_count_mode = 'analytic')
+    
+def test_outside_dark_counts():
+    D1 = Detector(UID,simpy.Environment(),DEAD_TIME,I_DET_EFF,1000,JITTER,NUMBER_RETURNED,dark_count_mode = 'window')
+    starts = np.arange(10000)*1e-2
+    D1.sample_window_dark_counts(starts,starts + 1e-3,positions = False)
+    D1.sample_outside_dark_counts()
+    # The dark counts cover the whole time up to the latest window (as in the 'timeline' mode), i.e., about 1000*100 dark counts
+    T = starts[-1] + 1e-3
+    assert abs(D1.num_of_dark_counts - 1000*T) < 5*np.sqrt(1000*T)
+    assert np.isclose(D1.dark_count_window_time + D1.dark_count_outside_time,T)
+    # The time outside the windows is only sampled once
+    num_of_dark_counts = D1.num_of_dark_counts
+    D1.sample_outside_dark_counts()
+    assert D1.num_of_dark_counts == num_of_dark_counts
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.utils.photon_enc import encoding
+from ..src.components.photon import Photon
+from ..src.components.free_space_channel import FreeSpaceChannel
+
+#Free-Space Channel
+UID = 'FSC1'
+POL_FIDELITY = 1
+DEPOL_PROB = 0.7
+TRACE_TIMES = np.array([0.0,1.0,2.0])
+TRACE_LOSS = np.array([0.0,10.0,3.0])
+TRACE_DELAY = np.array([2e-3,1e-3,3e-3])
+
+#Photon
+UID_P = 'p'
+WL = 1550e-9
+TWIDTH = 0.0
+ENC_TYPE = 'Polarization'
+COEFFS = np.array([[complex(1/2)],[complex(np.sqrt(3)/2)]])
+BASIS = encoding['Polarization'][0]
+
+class FakeReceiver():
+    
+    def __init__(self):
+        self.p_net_rcd = []
+    
+    def receive(self,p_net):
+        self.p_net_rcd += p_net
+
+def gen_photons(emission_times,env):
+    p_net = []
+    for i,t in enumerate(emission_times):
+        p = Photon(UID_P + str(i),WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+        p.set_source_linewidth(0)
+        p.set_environment(env)
+        p.set_emission_time(t)
+        p_net.append(p)
+    return p_net
+
+def test_interpolate():
+    ENV = simpy.Environment()
+    fsc1 = FreeSpaceChannel(UID,ENV,TRACE_TIMES,TRACE_LOSS,TRACE_DELAY,POL_FIDELITY,DEPOL_PROB)
+    assert np.isclose(fsc1.length,2e-3*3e8)
+    trnmt,delay = fsc1.interpolate([-1,0,0.5,1.5,2,5])
+    assert np.allclose(-10*np.log10(trnmt),[0,0,5,6.5,3,3])
+    assert np.allclose(delay,[2e-3,2e-3,1.5e-3,2e-3,3e-3,3e-3])
+    
+def test_receive():
+    ENV = simpy.Environment()
+    fsc1 = FreeSpaceChannel(UID,ENV,TRACE_TIMES,TRACE_LOSS,TRACE_DELAY,POL_FIDELITY,DEPOL_PROB)
+    fsc1.set_coupling_efficiency(1)
+    R = FakeReceiver()
+    fsc1.connect(None,R)
+    NUM = 20000
+    for receive in [fsc1.receive,fsc1.receive_batch]:
+        #Photons entering at the loss maximum (10 dB) and at the start of the trace (0 dB)
+        p_net = gen_photons([1.0]*NUM + [0.0]*NUM,ENV)
+        R.p_net_rcd = []
+        receive(p_net)
+        assert abs(sum(p is not None for p in R.p_net_rcd[:NUM])/NUM - 0.1) < 1e-2
+        assert all(p is not None for p in R.p_net_rcd[NUM:])
+        assert np.isclose(R.p_net_rcd[-1].time,0.0 + 2e-3)
+        
+def test_memmap(tmp_path):
+    ENV = simpy.Environment()
+    FILENAME = str(tmp_path/'pass')
+    N = 2000000
+    times = np.linspace(0,600,N)
+    np.save(FILENAME + '_times.npy',times)
+    np.save(FILENAME + '_loss.npy',30 + 10*np.cos(times/100))
+    np.save(FILENAME + '_delay.npy',(1000e3 + 500e3*np.cos(times/100))/3e8)
+    fsc1 = FreeSpaceChannel.load(UID,ENV,FILENAME,POL_FIDELITY,DEPOL_PROB)
+    assert isinstance(fsc1.trace_loss,np.memmap)
+    t = np.random.default_rng(seed = 0).uniform(0,600,1000)
+    trnmt,delay = fsc1.interpolate(t)
+    assert np.allclose(-10*np.log10(trnmt),30 + 10*np.cos(t/100),atol = 1e-6)
+    assert np.allclose(delay,(1000e3 + 500e3*np.cos(t/100))/3e8)
@@ -82,4 +82,21 @@ def test_env_time_post_emission():
     twidth_net = []
     for p in L1_photons_net:
         twidth_net.append(p.twidth)
-    assert abs(L1.env.now - max(twidth_net) - 1/PRR) < 1e-12
\ No newline at end of file
+    assert abs(L1.env.now - max(twidth_net) - 1/PRR) < 1e-12
+    
+def test_emit_stream():
+    ENV_test = simpy.Environment()
+    MU_PHOTONS = 2
+    N_PULSES = 10
+    CHUNK_SIZE = 4
+    L1 = Laser(UID,ENV_test,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA)
+    chunk_lens = []
+    timestamps_net = []
+    for photons_chunk,timestamps in L1.emit_stream(COEFFS*N_PULSES,BASIS,PER,CHUNK_SIZE):
+        assert len(photons_chunk) == len(timestamps)
+        assert L1.env.now == timestamps[-1]
+        chunk_lens.append(len(photons_chunk))
+        timestamps_net.extend(timestamps)
+    assert chunk_lens == [4,4,2]
+    assert np.all(np.diff(timestamps_net) > 1/PRR - 5*TWIDTH)
+    assert abs(L1.env.now - N_PULSES/PRR) < 10*TWIDTH
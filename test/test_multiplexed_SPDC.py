@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from scipy.stats import poisson
+from ..src.utils.photon_enc import encoding
+from ..src.components.multiplexed_SPDC import MultiplexedEntangledPhotonsSourceSPDC
+
+psi_plus = np.array([[complex(0)],[complex(1/np.sqrt(2))],[complex(1/np.sqrt(2))],[complex(0)]])
+
+ENV = simpy.Environment()
+UID = 'MEPS1'
+PRR = 8e7
+WL = 775e-9
+LWIDTH = 0.01e-9
+TWIDTH = 100e-15
+MU_PHOTONS = 40
+ENC_TYPE = 'Polarization'
+NOISE_LEVEL = 0
+GAMMA = 0.51
+LAMBDA = 0.47
+SPDC_TYPE = 2
+EFF = 1e-2
+NUM_OF_MODES = 10
+SWITCH_LOSS = 0
+
+PER = 1e8
+
+COEFFS = [[complex(1/2),complex(np.sqrt(3)/2)]]
+BASIS = encoding['Polarization'][0]
+
+class FakeReceiver():
+    
+    def __init__(self):
+        self.p_net = []
+    
+    def receive(self,p):
+        self.p_net.append(p)
+
+def test_init():
+    MEPS = MultiplexedEntangledPhotonsSourceSPDC(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,NUM_OF_MODES,3)
+    assert MEPS.uID == UID
+    assert MEPS.num_of_modes == NUM_OF_MODES
+    assert MEPS.pair_sampling == 'direct'
+    assert abs(MEPS.switch_trnmt - 0.5012) < 1e-4
+    
+def test_heralding_probability():
+    N_PULSES = 4000
+    #A mode fires if the (rounded) maximum number of pairs is at least 1, i.e., if more than 50 pump photons are emitted (0.5 is rounded to 0) (the binomial thinning is then practically never 0)
+    p_fire = poisson.sf(50,MU_PHOTONS)
+    for num_of_modes in [1,NUM_OF_MODES]:
+        MEPS = MultiplexedEntangledPhotonsSourceSPDC(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,num_of_modes,SWITCH_LOSS)
+        modes = np.array([MEPS.herald()[0] for i in range(N_PULSES)])
+        assert abs(np.mean(modes != -1) - (1 - (1 - p_fire)**num_of_modes)) < 3e-2
+        assert np.all(modes < num_of_modes)
+        
+def test_emit_pp():
+    ENV = simpy.Environment()
+    N_PULSES = 500
+    MEPS = MultiplexedEntangledPhotonsSourceSPDC(UID,ENV,PRR,WL,LWIDTH,TWIDTH,1e2,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,NUM_OF_MODES,SWITCH_LOSS)
+    R1 = FakeReceiver()
+    R2 = FakeReceiver()
+    MEPS.connect([R1,R2])
+    ephotons_net = MEPS.emit_pp(COEFFS*N_PULSES,BASIS,PER)
+    assert len(MEPS.heralded_modes) == N_PULSES
+    #Only the pairs of the heralded mode are emitted
+    assert len(ephotons_net) == np.sum(MEPS.heralded_modes != -1)
+    assert len(R1.p_net) == len(R2.p_net) == len(ephotons_net)
+    for epp in ephotons_net:
+        assert np.allclose(epp[0].qs.coeffs,psi_plus) and np.allclose(epp[1].qs.coeffs,psi_plus)
+        assert epp[0].emission_time == epp[1].emission_time <= ENV.now
+    assert abs(ENV.now - N_PULSES/PRR) < 1e-9
+    
+def test_switch_loss():
+    N_PULSES = 2000
+    SWITCH_LOSS = 3
+    MEPS = MultiplexedEntangledPhotonsSourceSPDC(UID,ENV,PRR,WL,LWIDTH,TWIDTH,1e2,ENC_TYPE,NOISE_LEVEL,GAMMA,LAMBDA,SPDC_TYPE,EFF,NUM_OF_MODES,SWITCH_LOSS)
+    num_of_photons = 0
+    num_of_surviving_photons = 0
+    for i in range(N_PULSES):
+        ephotons_net = MEPS.emit_pp_pulse(i,COEFFS[0],BASIS,PER)[0]
+        for epp in ephotons_net:
+            num_of_photons += len(epp)
+            num_of_surviving_photons += sum(ep is not None for ep in epp)
+    assert abs(num_of_surviving_photons/num_of_photons - MEPS.switch_trnmt) < 3e-2
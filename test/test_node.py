@@ -7,10 +7,12 @@ import simpy
 from ..src.components.node import Node
 from ..src.components.detector import Detector
 from ..src.components.quantum_channel import QuantumChannel
+from ..src.components.fused_quantum_channel import FusedQuantumChannel
 from ..src.components.weaklaser import Weaklaser
 from ..src.components.non_polarizing_beam_splitter import NonPolarizingBeamSplitter
 from ..src.components.polarizing_beam_splitter import PolarizingBeamSplitter
 from ..src.components.classical_channel import ClassicalChannel
+from ..src.components.classical_message import ClassicalMessage
 from ..src.components.SPDC import EntangledPhotonsSourceSPDC
 from ..src.utils.classical_info_list import classical_info_list
 
@@ -80,9 +82,7 @@ def test_connect_classical_channels():
     
 def test_connect_one_way_components():
     Node1 = Node(UID,ENV)
-    ENV1 = simpy.Environment()
-    ENV2 = simpy.Environment()
-    EPhS = EntangledPhotonsSourceSPDC('EPS',ENV,76e6,775e-9,0.01e-9,200e-15,1e6,'Polarization',0.01,0.3,0.45,2,[ENV1,ENV2],1e-6)
+    EPhS = EntangledPhotonsSourceSPDC('EPS',ENV,76e6,775e-9,0.01e-9,200e-15,1e6,'Polarization',0.01,0.3,0.45,2,1e-6)
     WeakLaser = Weaklaser('WL',ENV,76e6,1550e-9,0.01e-9,200e-15,1e5,'Polarization',0.01,0.3,0.45,0,4,5,calc_mu_photons_after_attenuation = False)
     QCh_EPS1 = QuantumChannel('QC_EPS1',ENV,100,0.2e-3,1.47,0.90,17e-6,0.3)
     QCh_EPS2 = QuantumChannel('QC_EPS2',ENV,1000,0.2e-3,1.47,0.90,17e-6,0.3) 
@@ -141,6 +141,69 @@ def test_send_classical_information():
     Node1.send_classical_information('CC',classical_info_list[0],Node2)
     assert Node2.classical_info == classical_info_list[0]
     
+def test_send_classical_information_batch():
+    ENV = simpy.Environment()
+    Node1 = Node(UID,ENV)
+    Node2 = Node('N2',ENV)
+    CCh = ClassicalChannel('CC',ENV,1000,1.47)
+    Node1.add_components([CCh])
+    Node2.add_components([CCh])
+    Node1.connect_classical_channels({'CC':Node2})
+    INFO_NET = [classical_info_list[0],np.arange(2000)]
+    Node1.send_classical_information_batch('CC',INFO_NET,Node2)
+    assert Node2.classical_info_net[0] == classical_info_list[0]
+    assert np.array_equal(Node2.classical_info_net[1],INFO_NET[1])
+    assert np.array_equal(Node2.classical_info,INFO_NET[1])
+    assert CCh.num_of_rounds == 1 and CCh.num_of_messages == 2
+    
+def test_inboxes():
+    ENV = simpy.Environment()
+    Node1 = Node(UID,ENV)
+    Node2 = Node('N2',ENV)
+    CCh = ClassicalChannel('CC',ENV,1000,1.47)
+    CCh.enable_event_driven()
+    Node1.add_components([CCh])
+    Node2.add_components([CCh])
+    Node1.connect_classical_channels({'CC':Node2})
+    #Two sessions (each a request-response exchange) run concurrently over the same classical channel
+    replies = {}
+    def responder(session):
+        while True:
+            msg = yield Node2.recv('CC',session)
+            Node2.send_classical_information('CC',np.asarray(msg.decode())*2,Node1,session)
+    def requester(session,values):
+        replies[session] = []
+        for v in values:
+            Node1.send_classical_information('CC',np.array([v]),Node2,session)
+            msg = yield Node1.recv('CC',session)
+            assert msg.session == session and msg.sender is Node2
+            replies[session].append(int(msg.decode()[0]))
+    for session in ['S1','S2']:
+        Node1.open_inbox('CC',session)
+        ENV.process(responder(session))
+    P1 = ENV.process(requester('S1',[1,2,3]))
+    P2 = ENV.process(requester('S2',[10,20,30]))
+    ENV.run(until = P1 & P2)
+    assert replies == {'S1':[2,4,6],'S2':[20,40,60]}
+    #The exchanges overlap, i.e., they take as long as one session alone
+    assert abs(ENV.now - 6*1000/(3e8/1.47)) < 1e-12
+    #Non-blocking receive
+    assert Node1.recv_nowait('CC') is None
+    Node2.open_inbox('CC')
+    Node1.send_classical_information('CC','A',Node2)
+    Node1.send_classical_information('CC','B',Node2)
+    ENV.run()
+    assert [Node2.recv_nowait('CC').decode() for _ in range(2)] == ['A','B']
+    assert Node2.recv_nowait('CC') is None
+    
+def test_make_message():
+    MSG = ClassicalMessage('A','S1')
+    assert Node.make_message(MSG) is MSG and Node.make_message(MSG,'S1') is MSG
+    #A message forwarded under another session is copied instead of being modified
+    msg = Node.make_message(MSG,'S2')
+    assert msg is not MSG and msg.session == 'S2' and msg.decode() == 'A'
+    assert MSG.session == 'S1'
+    
 def test_set_key():
     Node1 = Node(UID,ENV)
     KEY = '01011'
@@ -159,4 +222,31 @@ def test_identify_detectors():
     Node1.add_components([QuCh,Det1,NPBS,PBS,Det2])
     Node1.identify_detectors()
     assert Node1.detectors['D1'] == Det1
-    assert Node1.detectors['D2'] == Det2
\ No newline at end of file
+    assert Node1.detectors['D2'] == Det2
+
+def test_compile_links():
+    Node1 = Node(UID,ENV)
+    WeakLaser = Weaklaser('WL',ENV,76e6,1550e-9,0.01e-9,200e-15,1e5,'Polarization',0.01,0.3,0.45,0,4,5,calc_mu_photons_after_attenuation = False)
+    QCh1 = QuantumChannel('QC1',ENV,1000,0.2e-3,1.47,0.90,17e-6,0.3)
+    QCh2 = QuantumChannel('QC2',ENV,0.5,0.2e-3,1.47,0.80,17e-6,0.3)
+    QCh3 = QuantumChannel('QC3',ENV,0.15,0.2e-3,1.47,0.95,17e-6,0.2)
+    Det = Detector('D',ENV,1e-8,0.90,100e6,55e-12,0)
+    Node1.add_components([WeakLaser,QCh1,QCh2,QCh3,Det])
+    Node1.set_coupling_efficiencies({'QC1':0.85,'QC2':0.85,'QC3':0.85,'D':0.90})
+    Node1.connect_one_way_components({'WL':'QC1','D':'QC3'})
+    Node1.connect_two_way_intranode_components({'QC1':['WL','QC2'],'QC2':['QC1','QC3'],'QC3':['QC2','D']})
+    fused_qc_net = Node1.compile_links()
+    assert len(fused_qc_net) == 1
+    FQC = fused_qc_net[0]
+    assert isinstance(FQC,FusedQuantumChannel) and FQC.uID == 'QC1+QC2+QC3'
+    assert Node1.all_components['QC1+QC2+QC3'] == FQC
+    assert WeakLaser.receiver == FQC and Det.sender == FQC
+    assert FQC.sender == WeakLaser and FQC.receiver == Det
+    assert np.isclose(FQC.coupling_eff,0.85**3)
+    assert np.isclose(FQC.trnmt,QCh1.trnmt*QCh2.trnmt*QCh3.trnmt)
+    assert np.isclose(FQC.mean_transmission_time,QCh1.mean_transmission_time + QCh2.mean_transmission_time + QCh3.mean_transmission_time)
+    assert np.isclose(FQC.chr_dispersion*FQC.length,17e-6*1000.65)
+    assert np.isclose(FQC.pol_fidelity,0.90*0.80*0.95)
+    assert np.isclose(FQC.depol_prob,1 - 0.7*0.7*0.8)
+    #The links are compiled only once
+    assert Node1.compile_links() == []
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.utils.photon_enc import encoding
+from ..src.components.photon import Photon
+from ..src.components.quantum_state import QuantumState
+from ..src.components.quantum_channel import QuantumChannel
+from ..src.components.polarization_drift import PolarizationDrift
+
+DURATION = 10
+TIME_STEP = 1e-3
+DRIFT_RATE = 0.2
+
+#Quantum Channel
+UID = 'QC1'
+LENGTH = 1000
+ALPHA = 0
+N_CORE = 1.50
+CHR_DISPERSION = 17e-6
+DEPOL_PROB = 0.7
+
+#Photon
+UID_P = 'p1'
+WL = 2e-9
+TWIDTH = 0.0
+ENC_TYPE = 'Polarization'
+COEFFS = np.array([[complex(1/2)],[complex(np.sqrt(3)/2)]])
+BASIS = encoding['Polarization'][1]
+
+class FakeReceiver():
+    
+    def __init__(self):
+        self.p_net_rcd = []
+    
+    def receive(self,p_net):
+        self.p_net_rcd += p_net
+
+def test_random_walk():
+    PD = PolarizationDrift(DURATION,TIME_STEP,DRIFT_RATE,np.random.default_rng(seed = 0),initial_angle = 1.0,block_size = 1000)
+    assert len(PD.times) == len(PD.angles) == int(DURATION/TIME_STEP)
+    assert PD.angles[0] == 1.0
+    assert np.allclose(np.diff(PD.times),TIME_STEP)
+    #The increments of a random walk over a lag have a variance proportional to the lag
+    for lag in [1,100]:
+        assert abs(np.std(PD.angles[lag:] - PD.angles[:-lag])/(DRIFT_RATE*np.sqrt(lag*TIME_STEP)) - 1) < 0.1
+    
+def test_angles_at():
+    PD = PolarizationDrift(DURATION,TIME_STEP,DRIFT_RATE,np.random.default_rng(seed = 0))
+    t = np.array([0,0.5*TIME_STEP,TIME_STEP,2.5*TIME_STEP,DURATION + 2.5*TIME_STEP])
+    assert np.array_equal(PD.angles_at(t),PD.angles[[0,0,1,2,2]])
+    
+def test_memmap(tmp_path):
+    FILENAME = str(tmp_path/'drift')
+    PD = PolarizationDrift(DURATION,TIME_STEP,DRIFT_RATE,np.random.default_rng(seed = 0),filename = FILENAME,block_size = 1000)
+    PD_IN_MEMORY = PolarizationDrift(DURATION,TIME_STEP,DRIFT_RATE,np.random.default_rng(seed = 0),block_size = 1000)
+    assert isinstance(PD.angles,np.memmap)
+    assert np.array_equal(PD.angles,PD_IN_MEMORY.angles)
+    PD_LOADED = PolarizationDrift.load(FILENAME)
+    assert np.array_equal(PD_LOADED.angles,PD.angles)
+    assert np.isclose(PD_LOADED.time_step,TIME_STEP) and np.isclose(PD_LOADED.duration,PD.duration)
+    t = np.linspace(0,DURATION,1000)
+    assert np.array_equal(PD_LOADED.angles_at(t),PD.angles_at(t))
+    
+def make_photons(ENV,n,interval):
+    p_net = []
+    for i in range(n):
+        p = Photon(UID_P+str(i),WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+        p.set_source_linewidth(0)
+        p.set_environment(ENV)
+        p.set_emission_time(i*interval)
+        p_net.append(p)
+    return p_net
+    
+def test_quantum_channel_drift():
+    ENV = simpy.Environment()
+    POL_FIDELITY = 1
+    PD = PolarizationDrift(DURATION,TIME_STEP,DRIFT_RATE,np.random.default_rng(seed = 0))
+    qc1 = QuantumChannel(UID,ENV,LENGTH,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    qc1.set_coupling_efficiency(1)
+    qc1.set_polarization_drift(PD)
+    R = FakeReceiver()
+    qc1.connect(None,R)
+    for receive in [qc1.receive,qc1.receive_batch]:
+        receive(make_photons(ENV,2000,1e-4))
+        #Every photon is rotated by the angle of the drift trace at its arrival time
+        num_rotated = 0
+        for i,p in enumerate(R.p_net_rcd):
+            qs = QuantumState(COEFFS,BASIS)
+            QuantumState.rotate_polarization_batch([qs],PD.angles_at([i*1e-4 + qc1.mean_transmission_time]))
+            if np.allclose(p.qs.coeffs,qs.coeffs):
+                num_rotated += 1
+        assert num_rotated == 2000
+        R.p_net_rcd = []
+    
+def test_drift_errors_are_correlated_in_time():
+    ENV = simpy.Environment()
+    R = FakeReceiver()
+    PD = PolarizationDrift(DURATION,TIME_STEP,1,np.random.default_rng(seed = 0))
+    correlations = []
+    for pol_drift in [PD,None]:
+        qc1 = QuantumChannel(UID,ENV,LENGTH,ALPHA,N_CORE,0.5,CHR_DISPERSION,0.1)
+        qc1.set_coupling_efficiency(1)
+        qc1.set_polarization_drift(pol_drift)
+        qc1.connect(None,R)
+        R.p_net_rcd = []
+        qc1.receive_batch(make_photons(ENV,5000,1e-3))
+        #Probability of an error (i.e., of the photon NOT being found in its original state)
+        p_err = np.array([1 - abs(np.vdot(COEFFS,p.qs.coeffs))**2 for p in R.p_net_rcd])
+        correlations.append(np.corrcoef(p_err[1:],p_err[:-1])[0,1])
+    #The errors of consecutive photons are strongly correlated with a drift, and (nearly) uncorrelated without it
+    assert correlations[0] > 0.8
+    assert abs(correlations[1]) < 0.1
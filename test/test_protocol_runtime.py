@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.utils.photon_enc import encoding
+from ..src.components.photon import Photon
+from ..src.components.node import Node
+from ..src.components.classical_channel import ClassicalChannel
+from ..src.components.quantum_channel import QuantumChannel
+from ..src.components.protocol_runtime import ProtocolRuntime,PhotonPort
+from ..src.qkd.sifting import sifting_sender,sifting_receiver
+
+LENGTH = 1000
+N_CORE = 1.47
+c = 3e8
+
+def make_nodes(env,uIDs):
+    nodes = [Node(uID,env) for uID in uIDs]
+    CCh = ClassicalChannel('CC',env,LENGTH,N_CORE)
+    for node in nodes:
+        node.add_components([CCh])
+    nodes[0].connect_classical_channels({'CC':nodes[1]})
+    return nodes
+
+def test_coroutines():
+    ENV = simpy.Environment()
+    Alice,Bob = make_nodes(ENV,['Alice','Bob'])
+    RT = ProtocolRuntime(ENV)
+    A = RT.party(Alice)
+    B = RT.party(Bob)
+    assert Alice.all_components['CC'].event_driven
+    async def ping(party,peer,n):
+        party.listen('CC')
+        for i in range(n):
+            await party.send('CC',np.array([i]),peer)
+            reply = await party.recv('CC')
+            assert reply.decode()[0] == i + 1
+        await party.sleep(1.0)
+        return party.now
+    async def pong(party,peer,n):
+        party.listen('CC')
+        for _ in range(n):
+            msg = await party.recv('CC')
+            party.send('CC',msg.decode() + 1,peer)
+        return 'done'
+    t_end,status = RT.run(ping(A,Bob,3),pong(B,Alice,3))
+    assert status == 'done'
+    assert abs(t_end - (6*LENGTH/(c/N_CORE) + 1.0)) < 1e-9
+    
+def test_concurrent_sessions():
+    ENV = simpy.Environment()
+    Alice,Bob = make_nodes(ENV,['Alice','Bob'])
+    RT = ProtocolRuntime(ENV)
+    A = RT.party(Alice)
+    B = RT.party(Bob)
+    gen = np.random.default_rng(seed = 0)
+    coros = []
+    expected = {}
+    for s in range(4):
+        N = 8000
+        a_basis = gen.integers(2,size = N)
+        a_bits = gen.integers(2,size = N)
+        b_basis = gen.integers(2,size = N)
+        b_bits = a_bits.copy()
+        b_bits[gen.random(N) < 0.05*s] ^= 1
+        b_basis[gen.random(N) < 0.1] = -1
+        coros += [sifting_sender(A,'CC',Bob,a_basis,a_bits,seed = s,session = s),sifting_receiver(B,'CC',Alice,b_basis,b_bits,session = s)]
+        expected[s] = 0.05*s
+    results = RT.run(*coros)
+    for s in range(4):
+        (a_key,a_qber),(b_key,b_qber) = results[2*s],results[2*s + 1]
+        assert len(a_key) == len(b_key) > 0
+        assert a_qber == b_qber
+        assert abs(a_qber - expected[s]) < 0.03
+        if s == 0:
+            assert np.array_equal(a_key,b_key)
+    #The sessions run concurrently, i.e., they take as long as a single session (4 propagation delays)
+    assert abs(ENV.now - 4*LENGTH/(c/N_CORE)) < 1e-9
+    
+def test_gather_and_photons():
+    ENV = simpy.Environment()
+    Alice,Bob = make_nodes(ENV,['Alice','Bob'])
+    RT = ProtocolRuntime(ENV)
+    A = RT.party(Alice)
+    QC = QuantumChannel('QC',ENV,LENGTH,0,N_CORE,1,0,0)
+    QC.set_coupling_efficiency(1)
+    QC.enable_event_driven()
+    PORT = PhotonPort('PORT',ENV)
+    QC.connect(None,PORT)
+    async def collect(party,n):
+        p_net = []
+        for _ in range(n):
+            p_net += await party.recv_photons(PORT)
+        return [p.uID for p in p_net]
+    async def main(party):
+        p_net = []
+        for i in range(3):
+            p = Photon('p' + str(i),1550e-9,0,'Polarization',np.array([[complex(1)],[complex(0)]]),encoding['Polarization'][0])
+            p.set_source_linewidth(0)
+            p_net.append(p)
+        QC.receive(p_net)
+        return await RT.gather(collect(party,3),party.sleep(0.5))
+    uIDs,_ = RT.run(main(A))[0]
+    assert uIDs == ['p0','p1','p2']
+    assert ENV.now == 0.5
+    
+def test_exceptions():
+    ENV = simpy.Environment()
+    RT = ProtocolRuntime(ENV)
+    async def failing():
+        raise ValueError('failed')
+    async def catching():
+        try:
+            await RT.gather(failing())
+        except ValueError as e:
+            return str(e)
+    assert RT.run(catching()) == ['failed']
+    
+def test_release():
+    ENV = simpy.Environment()
+    Alice,Bob = make_nodes(ENV,['Alice','Bob'])
+    CCh2 = ClassicalChannel('CC2',ENV,LENGTH,N_CORE)
+    CCh2.enable_event_driven()
+    Alice.add_components([CCh2])
+    RT = ProtocolRuntime(ENV)
+    A = RT.party(Alice)
+    async def send(party,peer,info):
+        await party.send('CC',info,peer)
+    for info in ['A','B']:
+        RT.run(send(A,Bob,info))
+        assert Bob.classical_info == info
+        #The channels are switched back to their previous operation once the coroutines have completed
+        assert not Alice.all_components['CC'].event_driven and CCh2.event_driven
+        #A synchronous protocol can use the channel again (the information has been received on returning)
+        Alice.send_classical_information('CC',info*2,Bob)
+        assert Bob.classical_info == info*2
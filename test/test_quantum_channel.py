@@ -174,4 +174,85 @@ def test_adaptive_env_setting():
     qc1.receive([p1,p2])
     assert ENV.now == 0
     assert ENV1.now == 1.25e-8 + LENGTH/(c/N_CORE)
-    assert ENV2.now == 3.75e-8 + LENGTH/(c/N_CORE)
\ No newline at end of file
+    assert ENV2.now == 3.75e-8 + LENGTH/(c/N_CORE)
+    
+def test_timestamped_photons():
+    ENV = simpy.Environment()
+    SET_ADAPTIVE_ENV = True
+    SOURCE_LINEWIDTH = 0
+    TWIDTH = 0
+    ALPHA = 0
+    qc1 = QuantumChannel(UID,ENV,LENGTH,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB,SET_ADAPTIVE_ENV)
+    COUPLING_EFF = 1
+    qc1.set_coupling_efficiency(COUPLING_EFF)
+    S = FakeSource()
+    R = FakeReceiver()
+    qc1.connect(S,R)
+    p1 = Photon(UID_P,WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+    p1.set_source_linewidth(SOURCE_LINEWIDTH)
+    p1.set_environment(ENV)
+    p1.set_emission_time(1.25e-8)
+    UID_P2 = 'p2'
+    p2 = Photon(UID_P2,WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+    p2.set_source_linewidth(SOURCE_LINEWIDTH)
+    p2.set_environment(ENV)
+    p2.set_emission_time(3.75e-8)
+    qc1.receive([p1,p2])
+    #The timestamps are advanced instead of the (shared) Simpy Environment
+    assert ENV.now == 0
+    assert p1.emission_time == 1.25e-8 and p1.time == 1.25e-8 + LENGTH/(c/N_CORE)
+    assert p2.emission_time == 3.75e-8 and p2.time == 3.75e-8 + LENGTH/(c/N_CORE)
+    
+def test_receive_batch():
+    ENV = simpy.Environment()
+    POL_FIDELITY = 0.78
+    qc1 = QuantumChannel(UID,ENV,LENGTH,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    TRANSMITTANCE = 10**((-ALPHA*LENGTH)/10)
+    COUPLING_EFF = 0.67
+    qc1.set_coupling_efficiency(COUPLING_EFF)
+    S = FakeSource()
+    SOURCE_LINEWIDTH = 0.01e-9
+    R = FakeReceiver()
+    qc1.connect(S,R)
+    p_net = []
+    for i in range(10000):
+        p = Photon(UID_P+str(i),WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+        p.set_source_linewidth(SOURCE_LINEWIDTH)
+        p.set_environment(ENV)
+        p_net.append(p)
+    qc1.receive_batch(p_net + [None])
+    assert len(R.p_net_rcd) == 10001 and R.p_net_rcd[-1] is None
+    p_net_tr = [p for p in R.p_net_rcd if p is not None]
+    assert abs((len(p_net_tr)/10000) - COUPLING_EFF*TRANSMITTANCE) < 5e-2
+    p_net_uncorrupted = [p for p in p_net_tr if p.qs.coeffs[0][0] == COEFFS[0][0] and p.qs.coeffs[1][0] == COEFFS[1][0]]
+    assert abs((len(p_net_uncorrupted)/len(p_net_tr)) - POL_FIDELITY) < 5e-2
+    #The photons of a batch cross the channel simultaneously, i.e., the environment is advanced only once
+    assert qc1.mean_transmission_time - 5*(CHR_DISPERSION*SOURCE_LINEWIDTH*LENGTH + TWIDTH) <= ENV.now <= qc1.mean_transmission_time + 5*(CHR_DISPERSION*SOURCE_LINEWIDTH*LENGTH + TWIDTH)
+    
+def test_event_driven_propagation():
+    ENV = simpy.Environment()
+    SOURCE_LINEWIDTH = 0
+    TWIDTH = 0
+    ALPHA = 0
+    POL_FIDELITY = 1
+    qc1 = QuantumChannel(UID,ENV,LENGTH,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    qc1.enable_event_driven()
+    COUPLING_EFF = 1
+    qc1.set_coupling_efficiency(COUPLING_EFF)
+    S = FakeSource()
+    R = FakeReceiver()
+    R.arrivals = []
+    R.receive = lambda p_net: R.arrivals.append((ENV.now,p_net[0].uID))
+    qc1.connect(S,R)
+    #Photons sent in at different times are in flight at once
+    for i in range(3):
+        p = Photon(UID_P+str(i),WL,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+        p.set_source_linewidth(SOURCE_LINEWIDTH)
+        p.set_environment(ENV)
+        qc1.schedule(i*1e-6,qc1.receive,[p])
+    ENV.run(until = LENGTH/(c/N_CORE) + 1.5e-6)
+    assert [uID for t,uID in R.arrivals] == [UID_P + '0',UID_P + '1']
+    ENV.run()
+    assert len(R.arrivals) == 3
+    for i,(t,uID) in enumerate(R.arrivals):
+        assert abs(t - (i*1e-6 + LENGTH/(c/N_CORE))) < 1e-15
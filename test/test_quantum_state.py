@@ -121,4 +121,28 @@ def test_measure_multiple_qubit_basis_scheme3():
             if np.allclose(qs1.coeffs,cmp_coeffs) and np.allclose(qs1.basis,basisZZ):
                 ctr0 += 1
         ctr0 /= 10000
-        assert abs(ctr0 - theo_prob) <= 5e-2 
\ No newline at end of file
+        assert abs(ctr0 - theo_prob) <= 5e-2 
+    
+def test_rotate_polarization_and_depolarize_batch():
+    rng = np.random.default_rng(seed = 0)
+    qs_net = []
+    for basis in encoding['Polarization']:
+        for coeffs_size in [2,4]:
+            if coeffs_size == 4:
+                basis = np.array([np.kron(basis[0],basis[0]),np.kron(basis[0],basis[1]),np.kron(basis[1],basis[0]),np.kron(basis[1],basis[1])])
+            for i in range(5):
+                coeffs = rng.normal(size = coeffs_size) + 1j*rng.normal(size = coeffs_size)
+                qs_net.append(QuantumState(list(coeffs/np.linalg.norm(coeffs)),basis))
+    qs_net_batch = [QuantumState(list(np.ravel(qs.coeffs)),qs.basis) for qs in qs_net]
+    np.random.seed(7)
+    for qs in qs_net:
+        qs.rotate_polarization()
+    np.random.seed(7)
+    QuantumState.rotate_polarization_batch(qs_net_batch)
+    for qs,qs_batch in zip(qs_net,qs_net_batch):
+        assert np.allclose(qs.coeffs,qs_batch.coeffs) and qs.coeffs.shape == qs_batch.coeffs.shape
+    for qs in qs_net:
+        qs.depolarize(0.3)
+    QuantumState.depolarize_batch(qs_net_batch,0.3)
+    for qs,qs_batch in zip(qs_net,qs_net_batch):
+        assert np.allclose(qs.coeffs,qs_batch.coeffs) and qs.coeffs.shape == qs_batch.coeffs.shape
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.components.time_tagger import TimeTagger,TAG_DTYPE
+from ..src.components.detector import Detector
+
+def test_tag_in_memory():
+    TT = TimeTagger(buffer_size = 4)
+    for k in range(10):
+        TT.tag(k*1e-9,k%3)
+    TT.tag_batch(np.array([1e-6,2e-6]),7)
+    tags = TT.get_tags()
+    assert TT.num_of_tags == 12
+    assert list(tags['time'][:10]) == [k*1000 for k in range(10)]
+    assert list(tags['channel'][:10]) == [k%3 for k in range(10)]
+    assert list(tags['time'][10:]) == [1000000,2000000] and list(tags['channel'][10:]) == [7,7]
+
+def test_flush_and_load(tmp_path):
+    FILENAME = str(tmp_path/'tags.bin')
+    TT = TimeTagger(FILENAME,buffer_size = 1000)
+    N = 25000
+    t_net = np.cumsum(np.full(N,1e-8))
+    TT.tag_batch(t_net[:N//2],np.arange(N//2)%4)
+    for t in t_net[N//2:N//2 + 10]:
+        TT.tag(t,1)
+    TT.tag_batch(t_net[N//2 + 10:],2)
+    # The tags have been flushed whenever the buffer was full
+    assert TT.num_of_flushed_tags >= N - 1000
+    TT.close()
+
+    # 10 bytes per tag
+    assert (tmp_path/'tags.bin').stat().st_size == 10*N
+    tags = TimeTagger.load(FILENAME)
+    assert tags.dtype == TAG_DTYPE and len(tags) == N
+    assert np.array_equal(tags['time'],TimeTagger.to_picoseconds(t_net))
+    assert np.array_equal(tags['channel'][:N//2],np.arange(N//2)%4)
+    assert np.all(tags['channel'][N//2 + 10:] == 2)
+
+def test_detector_emits_tags():
+    ENV = simpy.Environment()
+    TT = TimeTagger()
+    D1 = Detector('D1',ENV,1e-8,0.85,1000,55e-12,1)
+    D1.set_time_tagger(TT,5)
+    D1.register_dark_counts(1.0)
+    tags = TT.get_tags()
+    #The dark count at or after the given time is only tagged once a later time is reached
+    assert len(tags) == D1.num_of_dark_counts - 1
+    assert np.all(tags['channel'] == 5)
+    assert np.array_equal(tags['time'],TimeTagger.to_picoseconds(D1.dark_count_time_instants[:-1]))
+    assert np.all(D1.dark_count_time_instants[:-1] < 1.0) and D1.dark_count_time_instants[-1] >= 1.0
+    D1.register_dark_counts(2.0)
+    assert np.array_equal(TT.get_tags()['time'],TimeTagger.to_picoseconds(D1.dark_count_time_instants[:-1]))
+    with pytest.raises(AssertionError):
+        D1.set_time_tagger(TT,1 << 16)
+
+def test_tags_are_time_ordered(tmp_path):
+    #Two detectors tag their clicks window by window, i.e., out of order across the detectors and across flushes
+    gen = np.random.default_rng(seed = 0)
+    t_net = [np.sort(gen.random(3000)) for _ in range(2)]
+    TT_FILE = TimeTagger(str(tmp_path/'tags.bin'),buffer_size = 500)
+    TT_MEMORY = TimeTagger(buffer_size = 500)
+    for TT in [TT_FILE,TT_MEMORY]:
+        for start in np.arange(0,1,0.1):
+            for channel,t in enumerate(t_net):
+                TT.tag_batch(t[(t >= start) & (t < start + 0.1)],channel)
+    TT_FILE.close()
+    for tags in [TimeTagger.load(str(tmp_path/'tags.bin')),TT_MEMORY.get_tags()]:
+        assert len(tags) == 6000
+        assert np.all(np.diff(tags['time']) >= 0)
+        for channel,t in enumerate(t_net):
+            assert np.array_equal(tags['time'][tags['channel'] == channel],TimeTagger.to_picoseconds(t))
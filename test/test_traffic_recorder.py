@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.components.node import Node
+from ..src.components.classical_channel import ClassicalChannel
+from ..src.components.classical_message import ClassicalMessage
+from ..src.components.traffic_recorder import TrafficRecorder,TrafficReader
+
+class FakeNode():
+    
+    def __init__(self,uID):
+        self.uID = uID
+
+def test_record_and_read(tmp_path):
+    FILENAME = str(tmp_path/'traffic')
+    TR = TrafficRecorder(FILENAME,capacity = 256,flush_interval = 100)
+    S = FakeNode('Alice')
+    R = FakeNode('Bob')
+    INFO_NET = ['START',b'\x00\x01',np.arange(2000,dtype = np.int32).reshape(40,50),np.float64(0.5)]
+    N = 5000
+    for i in range(N):
+        msg = ClassicalMessage(INFO_NET[i%4],session = 'S' + str(i%3))
+        msg.sender = S
+        msg.receiver = R
+        TR.record(1e-3*i,msg)
+    #The log file has grown beyond its initial capacity
+    assert TR.capacity > 256
+    TR.close()
+    TRD = TrafficReader(FILENAME)
+    assert len(TRD) == N
+    for k in [0,1,2,3,4097,N - 1]:
+        time,sender,receiver,msg = TRD[k]
+        assert time == 1e-3*k and sender == 'Alice' and receiver == 'Bob'
+        assert msg.session == 'S' + str(k%3)
+        assert np.array_equal(msg.decode(),INFO_NET[k%4])
+    #Sequential iteration (without the index)
+    times = [record[0] for record in TRD]
+    assert times == [1e-3*i for i in range(N)]
+    TRD.close()
+    
+def test_classical_channel_recording(tmp_path):
+    FILENAME = str(tmp_path/'traffic')
+    ENV = simpy.Environment()
+    Node1 = Node('N1',ENV)
+    Node2 = Node('N2',ENV)
+    CCh = ClassicalChannel('CC',ENV,1000,1.47)
+    TR = TrafficRecorder(FILENAME)
+    CCh.set_recorder(TR)
+    Node1.add_components([CCh])
+    Node2.add_components([CCh])
+    Node1.connect_classical_channels({'CC':Node2})
+    Node1.send_classical_information('CC','HELLO',Node2)
+    Node2.send_classical_information_batch('CC',[np.arange(3),b'\x07'],Node1,session = 'S1')
+    TR.close()
+    TRD = TrafficReader(FILENAME)
+    records = list(TRD)
+    assert len(records) == 3
+    assert records[0][1:3] == ('N1','N2') and records[0][3].decode() == 'HELLO' and records[0][0] == 0
+    assert records[1][1:3] == ('N2','N1') and records[1][3].session == 'S1' and records[1][0] > 0
+    assert np.array_equal(records[1][3].decode(),np.arange(3))
+    assert records[2][3].decode() == b'\x07'
+    TRD.close()
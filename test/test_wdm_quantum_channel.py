@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import simpy
+from ..src.utils.photon_enc import encoding
+from ..src.components.photon import Photon
+from ..src.components.wdm_quantum_channel import WDMQuantumChannel
+
+#WDM Quantum Channel
+UID = 'WDM1'
+LENGTH = 10000
+WL_CHANNELS = [1530e-9,1550e-9,1570e-9]
+ALPHA = [0.3e-4,1e-4,0.2e-4]
+N_CORE = 1.50
+POL_FIDELITY = 1
+CHR_DISPERSION = [15e-6,17e-6,19e-6]
+DEPOL_PROB = 0.7
+
+#Photon
+UID_P = 'p'
+TWIDTH = 0.0
+ENC_TYPE = 'Polarization'
+COEFFS = np.array([[complex(1/2)],[complex(np.sqrt(3)/2)]])
+BASIS = encoding['Polarization'][0]
+LWIDTHS = [0.01e-9,0.02e-9,0.03e-9]
+
+class FakeReceiver():
+    
+    def __init__(self):
+        self.p_net_rcd = []
+    
+    def receive(self,p_net):
+        self.p_net_rcd += p_net
+
+def gen_photons(num_per_channel,env):
+    p_net = []
+    for i in range(num_per_channel):
+        for wl,lwidth in zip(WL_CHANNELS,LWIDTHS):
+            p = Photon(UID_P + str(i),wl + 1e-10,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+            p.set_source_linewidth(lwidth)
+            p.set_environment(env)
+            p_net.append(p)
+    return p_net
+
+def test_init():
+    ENV = simpy.Environment()
+    wdm1 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    assert np.allclose(wdm1.trnmt,10**((-np.array(ALPHA)*LENGTH)/10))
+    assert np.allclose(wdm1.band_edges,[1520e-9,1540e-9,1560e-9,1580e-9])
+    assert np.all(wdm1.crosstalk == 0)
+    wdm1.calc_p_twidth(LWIDTHS)
+    assert np.allclose(wdm1.p_twidth,np.array(CHR_DISPERSION)*np.array(LWIDTHS)*LENGTH)
+    #A common attenuation coefficient is broadcast to all the wavelength channels
+    wdm2 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,0.2e-4,N_CORE,POL_FIDELITY,17e-6,DEPOL_PROB)
+    assert wdm2.alpha.shape == (3,) and np.all(wdm2.chr_dispersion == 17e-6)
+    with pytest.raises(AssertionError):
+        WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS[::-1],ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    with pytest.raises(AssertionError):
+        WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB,crosstalk = [[0,0.8,0.4],[0,0,0],[0,0,0]])
+    
+def test_demultiplex():
+    ENV = simpy.Environment()
+    wdm1 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    assert np.array_equal(wdm1.demultiplex([1525e-9,1545e-9,1551e-9,1569e-9,1575e-9]),[0,1,1,2,2])
+    #The wavelengths outside every passband are rejected
+    assert np.array_equal(wdm1.demultiplex([1500e-9,1519e-9,1581e-9,1600e-9]),[-1,-1,-1,-1])
+    #A single wavelength channel has an unbounded passband
+    wdm2 = WDMQuantumChannel(UID,ENV,LENGTH,[1550e-9],0,N_CORE,POL_FIDELITY,17e-6,DEPOL_PROB)
+    assert np.array_equal(wdm2.demultiplex([1500e-9,1600e-9]),[0,0])
+    
+def test_receive():
+    ENV = simpy.Environment()
+    wdm1 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,ALPHA,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    wdm1.set_coupling_efficiency(1)
+    R = [FakeReceiver() for _ in WL_CHANNELS]
+    wdm1.connect(None,R)
+    NUM = 10000
+    p_net = gen_photons(NUM,ENV)
+    wdm1.receive(p_net + [None])
+    for k,r in enumerate(R):
+        #Every receiver gets the photons of its own wavelength channel (and the empty input)
+        assert len(r.p_net_rcd) == NUM + 1 and r.p_net_rcd[-1] is None
+        rcd = [p for p in r.p_net_rcd if p is not None]
+        assert all(abs(p.wl - WL_CHANNELS[k]) < 1e-9 for p in rcd)
+        assert abs(len(rcd)/NUM - wdm1.trnmt[k]) < 2e-2
+        assert np.isclose(rcd[0].twidth,CHR_DISPERSION[k]*LWIDTHS[k]*LENGTH)
+    assert np.array_equal(wdm1.channel_counts,[len([p for p in r.p_net_rcd if p is not None]) for r in R])
+    assert ENV.now > 0
+    
+def test_crosstalk():
+    ENV = simpy.Environment()
+    CROSSTALK = [[0,0.2,0],[0.1,0,0.1],[0,0,0]]
+    wdm1 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,0,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB,crosstalk = CROSSTALK)
+    wdm1.set_coupling_efficiency(1)
+    R = [FakeReceiver() for _ in WL_CHANNELS]
+    wdm1.connect(None,R)
+    NUM = 10000
+    wdm1.receive(gen_photons(NUM,ENV))
+    for k,r in enumerate(R):
+        wl_rcd = np.array([p.wl for p in r.p_net_rcd])
+        for j in range(len(WL_CHANNELS)):
+            frac = np.sum(np.abs(wl_rcd - WL_CHANNELS[j]) < 1e-9)/NUM
+            expected = CROSSTALK[j][k] if j != k else 1 - sum(CROSSTALK[j])
+            assert abs(frac - expected) < 2e-2
+    
+def test_receive_out_of_band():
+    ENV = simpy.Environment()
+    wdm1 = WDMQuantumChannel(UID,ENV,LENGTH,WL_CHANNELS,0,N_CORE,POL_FIDELITY,CHR_DISPERSION,DEPOL_PROB)
+    wdm1.set_coupling_efficiency(1)
+    R = [FakeReceiver() for _ in WL_CHANNELS]
+    wdm1.connect(None,R)
+    p_net = []
+    for i,wl in enumerate([1500e-9,1550e-9,1600e-9]):
+        p = Photon(UID_P + str(i),wl,TWIDTH,ENC_TYPE,COEFFS,BASIS)
+        p.set_source_linewidth(LWIDTHS[0])
+        p.set_environment(ENV)
+        p_net.append(p)
+    wdm1.receive(p_net)
+    #The photons outside every passband are dropped instead of being handed over to the outermost wavelength channels
+    assert R[0].p_net_rcd == [] and R[2].p_net_rcd == []
+    assert R[1].p_net_rcd == [p_net[1]]
+    assert np.array_equal(wdm1.channel_counts,[0,1,0])
@@ -5,6 +5,7 @@ import pytest
 import simpy
 import numpy as np
 from ..src.components.weaklaser import Weaklaser
+from ..src.utils.photon_enc import encoding
 
 ENV = simpy.Environment()
 
@@ -27,6 +28,8 @@ MAX_OD = 4
 
 MAX_NUM_OF_ND_FILTERS = 5
 
+BASIS = encoding['Polarization'][0]
+
 class FakeReceiver():
     
     def __init__(self):
@@ -48,4 +51,36 @@ def test_connect():
     R = FakeReceiver()
     WeakLaser = Weaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,calc_mu_photons_after_attenuation = False)
     WeakLaser.connect(R)
-    assert WeakLaser.receiver == R
\ No newline at end of file
+    assert WeakLaser.receiver == R
+    
+def test_calibration_is_independent_of_the_number_of_workers():
+    MU_PHOTONS = 1e2
+    WeakLaser = Weaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,calc_mu_photons_after_attenuation = False)
+    mu_serial,std_err_serial = WeakLaser.find_mu_photons_after_attenuation(n_trials = 300,n_workers = 1)
+    mu_parallel,std_err_parallel = WeakLaser.find_mu_photons_after_attenuation(n_trials = 300,n_workers = 2)
+    assert WeakLaser.n_calibration_trials == 300
+    assert mu_serial == mu_parallel
+    assert std_err_serial == std_err_parallel
+    assert WeakLaser.mu_photons_after_attenuation_std_err > 0
+    
+def test_calibration_sequential_stopping():
+    MU_PHOTONS = 1e2
+    TOL = 0.1
+    WeakLaser = Weaklaser(UID,ENV,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,calibration_tol = TOL)
+    assert WeakLaser.n_calibration_trials < 1000
+    assert 1.96*WeakLaser.mu_photons_after_attenuation_std_err < TOL
+    assert WeakLaser.env == ENV
+
+def test_emit_stream():
+    ENV_test = simpy.Environment()
+    MU_PHOTONS = 1e2
+    N_PULSES = 50
+    WeakLaser = Weaklaser(UID,ENV_test,PRR,WL,LWIDTH,TWIDTH,MU_PHOTONS,ENC_TYPE,NOISE_LEVEL,GAMMA,LMDA,MIN_OD,MAX_OD,MAX_NUM_OF_ND_FILTERS,calc_mu_photons_after_attenuation = False)
+    n_pulses = 0
+    for photons_chunk,timestamps in WeakLaser.emit_stream([[complex(1),complex(0)]]*N_PULSES,[BASIS]*N_PULSES,1e6,chunk_size = 16):
+        assert len(photons_chunk) == len(timestamps) <= 16
+        for pulse in photons_chunk:
+            assert len(pulse) < MU_PHOTONS
+        n_pulses += len(photons_chunk)
+    assert n_pulses == N_PULSES
+    assert WeakLaser.env.now == timestamps[-1]